@@ -0,0 +1,112 @@
+# Benchmark of the page text extraction backends of the pdf() object.
+#
+# Extracts every page of a sample corpus of pdfs with each backend in
+# pdf_parser.EXTRACTION_BACKENDS and reports the throughput of each backend and
+# how closely its text matches the text of the default "plumber" backend, as
+# the word jaccard and cosine similarity of every page averaged over the corpus.
+# Run from the repository root with a directory of sample pdfs:
+#
+#   python -m benchmarks.bench_backends path/to/pdfs [max_pages_per_pdf]
+import math
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+from pdf_parsing_package.pdf_parser import pdf, EXTRACTION_BACKENDS
+
+
+def extract_corpus(pdf_paths, backend, max_pages=None):
+    '''
+    Extracts the text of every page of every pdf with a backend, without the
+    page text cache, and returns the page strings along with the runtime.
+    '''
+    page_text_lst = []
+
+    start = time.perf_counter()
+
+    for pdf_path in pdf_paths:
+
+        with pdf.open(pdf_path, backend=backend) as pdf_obj:
+
+            num_pages = len(pdf_obj.pdf_plumb.pages)
+            if max_pages is not None:
+                num_pages = min(num_pages, max_pages)
+
+            page_text_lst.extend(
+                pdf_obj.extract_page(page_num, release=True) or '' for page_num in range(num_pages))
+
+    return page_text_lst, time.perf_counter() - start
+
+
+def word_counts(text):
+    '''
+    Splits a page into its lowercased words, ignoring the layout the backends differ in.
+    '''
+    return Counter(re.findall(r'\w+', text.lower()))
+
+
+def page_similarity(text_1, text_2):
+    '''
+    Returns the (jaccard, cosine) similarity of the words of two page strings.
+    Two empty pages are identical.
+    '''
+    counts_1 = word_counts(text_1)
+    counts_2 = word_counts(text_2)
+
+    if not counts_1 and not counts_2:
+        return 1.0, 1.0
+
+    jaccard_sim = len(counts_1.keys() & counts_2.keys()) / len(counts_1.keys() | counts_2.keys())
+
+    dot_product = sum(count * counts_2[word] for word, count in counts_1.items())
+    norm_product = (math.sqrt(sum(count ** 2 for count in counts_1.values())) *
+        math.sqrt(sum(count ** 2 for count in counts_2.values())))
+
+    cosine_sim = dot_product / norm_product if norm_product else 0.0
+
+    return jaccard_sim, cosine_sim
+
+
+if __name__ == '__main__':
+
+    if len(sys.argv) < 2:
+        sys.exit('usage: python -m benchmarks.bench_backends path/to/pdfs [max_pages_per_pdf]')
+
+    corpus_dir = sys.argv[1]
+    max_pages = int(sys.argv[2]) if len(sys.argv) > 2 else None
+
+    pdf_paths = sorted(
+        os.path.join(corpus_dir, file_name) for file_name in os.listdir(corpus_dir)
+        if file_name.lower().endswith('.pdf'))
+
+    if len(pdf_paths) == 0:
+        sys.exit(f'No pdfs found in {corpus_dir}')
+
+    # The text of the reference backend every other backend is compared to:
+    reference_text_lst, reference_time = extract_corpus(pdf_paths, 'plumber', max_pages)
+
+    num_pages = len(reference_text_lst)
+
+    print(f'corpus: {len(pdf_paths)} pdfs, {num_pages} pages')
+    print(f"{'backend':>10} {'seconds':>10} {'pages/sec':>10} {'speedup':>10} {'empty':>8} {'jaccard':>10} {'cosine':>10}")
+
+    for backend in EXTRACTION_BACKENDS:
+
+        if backend == 'plumber':
+            page_text_lst, backend_time = reference_text_lst, reference_time
+
+        else:
+            page_text_lst, backend_time = extract_corpus(pdf_paths, backend, max_pages)
+
+        similarity_lst = [
+            page_similarity(reference_text, page_text)
+            for reference_text, page_text in zip(reference_text_lst, page_text_lst)]
+
+        jaccard_sim = sum(similarity[0] for similarity in similarity_lst) / num_pages
+        cosine_sim = sum(similarity[1] for similarity in similarity_lst) / num_pages
+        empty_pages = sum(1 for page_text in page_text_lst if not page_text.strip())
+
+        print(f'{backend:>10} {backend_time:>10.2f} {num_pages/backend_time:>10.1f} '
+            f'{reference_time/backend_time:>9.1f}x {empty_pages:>8} {jaccard_sim:>10.3f} {cosine_sim:>10.3f}')
@@ -0,0 +1,95 @@
+# Benchmark of the outline page-range-detection algorithm used by pdf.build_toc().
+#
+# Compares the single pass stack algorithm in pdf_parser.build_page_ranges() with
+# the original nested-level algorithm on synthetic outlines and checks that both
+# produce identical page ranges. Run from the repository root:
+#
+#   python -m benchmarks.bench_build_toc
+import copy
+import random
+import time
+
+from pdf_parsing_package.pdf_parser import build_page_ranges
+
+
+def build_synthetic_outline(num_dests, max_nest_lvl=5, seed=0):
+    '''
+    Builds a flattened outline list in the format produced by
+    pdf.pop_destination_lst() with random nesting and increasing start pages.
+    '''
+    rand = random.Random(seed)
+
+    destination_lst = []
+    nest_lvl = 1
+    start_page = 0
+
+    for i in range(num_dests):
+
+        # A destination can be at most one level deeper than the previous one:
+        nest_lvl = rand.randint(1, min(nest_lvl + 1, max_nest_lvl))
+        start_page += rand.randint(0, 2)
+
+        destination_lst.append(
+            {'Nested_level': nest_lvl, 'Title': f'Section {i}', 'Start_Page': start_page})
+
+    return destination_lst, start_page + 1
+
+
+def legacy_page_ranges(destination_lst, num_pages):
+    '''
+    The original page-range-detection algorithm from pdf.build_toc(), kept
+    here as a reference for timing and output comparison.
+    '''
+    destination_lst = copy.deepcopy(destination_lst)
+
+    unique_nest_vals = list(set(dict['Nested_level'] for dict in destination_lst))
+
+    for nest_lvl in reversed(unique_nest_vals):
+
+        for dict in destination_lst:
+
+            dict_index = destination_lst.index(dict)
+
+            if dict['Nested_level'] == nest_lvl:
+
+                for next_dict in destination_lst[dict_index+1:]:
+
+                    if destination_lst.index(next_dict) == destination_lst.index(destination_lst[-1]):
+                        dict['Page_Range'] = (dict['Start_Page'], num_pages)
+
+                    elif next_dict['Nested_level'] <= nest_lvl:
+                        dict['Page_Range'] = (dict['Start_Page'], next_dict['Start_Page'])
+                        break
+
+    return [dict.get('Page_Range', (dict['Start_Page'], num_pages)) for dict in destination_lst]
+
+
+def time_function(func, *args):
+
+    start = time.perf_counter()
+    result = func(*args)
+
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+
+    print(f"{'destinations':>12} {'legacy (s)':>12} {'stack (s)':>12} {'speedup':>10}")
+
+    for num_dests in [500, 1000, 2000, 10000, 50000, 100000]:
+
+        destination_lst, num_pages = build_synthetic_outline(num_dests)
+
+        stack_ranges, stack_time = time_function(build_page_ranges, destination_lst, num_pages)
+
+        # The legacy algorithm is only timed on outlines where it finishes in reasonable time:
+        if num_dests <= 10000:
+
+            legacy_ranges, legacy_time = time_function(legacy_page_ranges, destination_lst, num_pages)
+
+            assert legacy_ranges == stack_ranges, 'Page ranges differ from the legacy algorithm'
+
+            print(f'{num_dests:>12} {legacy_time:>12.4f} {stack_time:>12.4f} {legacy_time/stack_time:>9.0f}x')
+
+        else:
+            print(f"{num_dests:>12} {'-':>12} {stack_time:>12.4f} {'-':>10}")
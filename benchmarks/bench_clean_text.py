@@ -0,0 +1,63 @@
+# Micro-benchmark of pdf_db.clean_text().
+#
+# Compares the translation table implementation of pdf_db.clean_text() with the
+# original per-character list comprehension on a synthetic ~2 MB filing and checks
+# that both produce identical output. Run from the repository root:
+#
+#   python -m benchmarks.bench_clean_text
+import random
+import string
+import time
+
+from pdf_parsing_package.pdfdb_api import pdf_db
+
+
+def build_synthetic_text(num_chars, seed=0):
+    '''
+    Builds a string resembling raw pdf text: mostly words and spaces with
+    punctuation, numbers, formatting characters and some non-ascii characters.
+    '''
+    rand = random.Random(seed)
+
+    char_pool = (string.ascii_letters * 8 + ' ' * 30 + string.punctuation +
+        string.digits * 2 + '\n\t\r' + '’“”• é')
+
+    return ''.join(rand.choice(char_pool) for i in range(num_chars))
+
+
+def legacy_clean_text(text):
+    '''
+    The original list comprehension implementation of pdf_db.clean_text(),
+    kept here as a reference for timing and output comparison.
+    '''
+    txt_lst = [words for words in text if words not in string.punctuation
+        and words not in string.digits and words if ord(words)<126 and ord(words)>31]
+
+    return ''.join(txt_lst)
+
+
+def best_time(func, arg, repeat=5):
+
+    time_lst = []
+    for i in range(repeat):
+
+        start = time.perf_counter()
+        result = func(arg)
+        time_lst.append(time.perf_counter() - start)
+
+    return result, min(time_lst)
+
+
+if __name__ == '__main__':
+
+    text = build_synthetic_text(2 * 1024 * 1024)
+
+    legacy_result, legacy_time = best_time(legacy_clean_text, text)
+    result, new_time = best_time(pdf_db.clean_text, text)
+
+    assert result == legacy_result, 'clean_text output differs from the legacy implementation'
+
+    print(f'input size:  {len(text):,} chars')
+    print(f'legacy:      {legacy_time*1000:.1f} ms')
+    print(f'clean_text:  {new_time*1000:.1f} ms')
+    print(f'speedup:     {legacy_time/new_time:.0f}x')
@@ -0,0 +1,183 @@
+# Importing native python packages:
+from difflib import SequenceMatcher
+
+
+def build_token_ids(*token_lsts):
+    '''
+    Function that maps every distinct token of one or more lists of tokens to an
+    integer id, so the edit distance algorithm only compares integers.
+
+    Parameters
+    ----------
+    *token_lsts : *arg list
+        The lists of string tokens to be converted.
+
+    Returns
+    -------
+    token_id_lsts : list
+        A list containing one list of integer ids for every input list. Equal
+        tokens are given the same id across all of the lists.
+    '''
+    # Dict of the id of every token that has been seen:
+    token_id_dict = {}
+
+    token_id_lsts = [
+        [token_id_dict.setdefault(token, len(token_id_dict)) for token in token_lst]
+        for token_lst in token_lsts]
+
+    return token_id_lsts
+
+
+def levenshtein_distance(seq_1, seq_2, max_distance=None):
+    '''
+    Function that calculates the minimum number of insertions, deletions and
+    substitutions needed to transform seq_1 into seq_2 using the bit-parallel
+    algorithm of Myers as formulated by Hyyrö. Each column of the dynamic
+    programming matrix is stored as bit vectors in python integers so a whole
+    column is updated with a handful of integer operations, making the runtime
+    O(n * m / 64) instead of the O(n * m) cell by cell algorithm.
+
+    Parameters
+    ----------
+    seq_1 : list
+        The first sequence of hashable elements, ideally the integer ids built
+        by build_token_ids().
+
+    seq_2 : list
+        The second sequence of hashable elements.
+
+    max_distance : int
+        An optional cutoff. As soon as the distance is known to be greater than
+        max_distance the calculation stops and max_distance + 1 is returned. By
+        default max_distance=None and the exact distance is always calculated.
+
+    Returns
+    -------
+    distance : int
+        The minimum edit distance between the sequences, or max_distance + 1 if
+        it is greater than max_distance.
+    '''
+    # Removing the common prefix and suffix which never need to be edited:
+    prefix_len = 0
+    while prefix_len < len(seq_1) and prefix_len < len(seq_2) and seq_1[prefix_len] == seq_2[prefix_len]:
+        prefix_len += 1
+
+    suffix_len = 0
+    while (suffix_len < len(seq_1) - prefix_len and suffix_len < len(seq_2) - prefix_len
+        and seq_1[-1-suffix_len] == seq_2[-1-suffix_len]):
+        suffix_len += 1
+
+    seq_1 = seq_1[prefix_len:len(seq_1)-suffix_len]
+    seq_2 = seq_2[prefix_len:len(seq_2)-suffix_len]
+
+    # Using the shorter sequence as the bit vector pattern:
+    if len(seq_1) > len(seq_2):
+        seq_1, seq_2 = seq_2, seq_1
+
+    pattern_len = len(seq_1)
+    text_len = len(seq_2)
+
+    # The distance can never be smaller than the difference in length:
+    if max_distance is not None and text_len - pattern_len > max_distance:
+        return max_distance + 1
+
+    if pattern_len == 0:
+        return text_len
+
+    # Building the bit mask of the positions of every element in the pattern:
+    peq_dict = {}
+    for i, element in enumerate(seq_1):
+        peq_dict[element] = peq_dict.get(element, 0) | (1 << i)
+
+    mask = (1 << pattern_len) - 1
+    last_bit = 1 << (pattern_len - 1)
+
+    # Vertical positive and negative delta vectors of the current column:
+    vp = mask
+    vn = 0
+    distance = pattern_len
+
+    for j, element in enumerate(seq_2):
+
+        eq = peq_dict.get(element, 0)
+
+        xv = eq | vn
+        xh = ((((eq & vp) + vp) & mask) ^ vp) | eq
+
+        # Horizontal positive and negative delta vectors:
+        ph = vn | (~(xh | vp) & mask)
+        mh = vp & xh
+
+        # Tracking the value in the last row of the column:
+        if ph & last_bit:
+            distance += 1
+
+        elif mh & last_bit:
+            distance -= 1
+
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+
+        vp = mh | (~(xv | ph) & mask)
+        vn = ph & xv
+
+        # Each remaining column can lower the distance by at most one:
+        if max_distance is not None and distance - (text_len - j - 1) > max_distance:
+            return max_distance + 1
+
+    if max_distance is not None and distance > max_distance:
+        return max_distance + 1
+
+    return distance
+
+
+def sequence_matcher_distance(seq_1, seq_2):
+    '''
+    Function that calculates the legacy edit distance between two sequences by
+    counting the edits in the opcodes of difflib's SequenceMatcher(). Because of
+    SequenceMatcher's matching heuristics this is an upper bound on, rather than
+    the true, minimum edit distance. It is kept for compatibility with metrics
+    calculated by earlier versions of the package.
+
+    Parameters
+    ----------
+    seq_1 : list
+        The first sequence to be compared.
+
+    seq_2 : list
+        The second sequence to be compared.
+
+    Returns
+    -------
+    num_edits : int
+        An integer that represents the number of edits required to transform
+        the seq_1 list into the seq_2 list.
+    '''
+    # Initalizing the SequenceMatcher object w strings lists:
+    s = SequenceMatcher(None, seq_1, seq_2)
+
+    # Creating the variable representing the number of edits performed during transformation:
+    num_edits = 0
+
+    # Iterating through SequenceMatcher() transformation tuple list:
+    for tag, i_1, i_2, j_1, j_2 in s.get_opcodes():
+
+        # If a replace action is performed:
+        if tag == 'replace':
+
+            # Increase by the highest value between (i_2 - i_1, j_2 - j_1):
+            num_edits += max(i_2-i_1, j_2-j_1)
+
+        # If a insert action is performed:
+        elif tag == 'insert':
+
+            # Increase by the difference between j_2 and j_1:
+            num_edits += (j_2 - j_1)
+
+        # If a delete action is performed:
+        elif tag == 'delete':
+
+            # Increase by the difference between i_2 and i_1:
+            num_edits += (i_2 - i_1)
+
+    return num_edits
@@ -0,0 +1,175 @@
+# Importing native python packages:
+import hashlib
+import zlib
+
+# Importing data management packages:
+import numpy as np
+
+# The number of hash functions of every signature and the number of LSH bands
+# it is split into. With 32 bands of 4 rows a pair of sections with a jaccard
+# similarity of 0.5 becomes a candidate with a probability of 0.87, 0.6 with 0.98
+# and 0.3 with only 0.23:
+NUM_PERMUTATIONS = 128
+NUM_BANDS = 32
+
+# The number of words in each shingle:
+SHINGLE_SIZE = 3
+
+# The largest prime below 2**32. As shingle hashes are 32 bit crc32 values and
+# the permutation coefficients are below this prime, a * x + b never overflows
+# a 64 bit unsigned integer:
+MERSENNE_PRIME = 4294967291
+
+# The seed of the permutations, fixed so signatures are stable across processes:
+PERMUTATION_SEED = 1
+
+# The number of shingles hashed at a time, limiting the size of the intermediate matrix:
+CHUNK_SIZE = 4096
+
+
+def build_permutations(num_permutations=NUM_PERMUTATIONS, seed=PERMUTATION_SEED):
+    '''
+    Function that builds the coefficients of the universal hash functions
+    h(x) = (a * x + b) mod MERSENNE_PRIME used as the random permutations of
+    the MinHash signatures.
+
+    Parameters
+    ----------
+    num_permutations : int
+        The number of hash functions.
+
+    seed : int
+        The seed of the random number generator.
+
+    Returns
+    -------
+    permutations : tuple
+        A (a, b) tuple of uint64 numpy arrays of the coefficients.
+    '''
+    random_state = np.random.RandomState(seed)
+
+    a = random_state.randint(1, MERSENNE_PRIME, size=num_permutations, dtype=np.uint64)
+    b = random_state.randint(0, MERSENNE_PRIME, size=num_permutations, dtype=np.uint64)
+
+    return (a, b)
+
+
+# The permutations shared by every signature:
+PERMUTATIONS = build_permutations()
+
+
+def build_shingle_hashes(text, shingle_size=SHINGLE_SIZE):
+    '''
+    Function that splits a text into the set of its (lowercased) word shingles,
+    the sequences of shingle_size consecutive words, and hashes each with crc32.
+    A text with fewer words than shingle_size is a single shingle.
+
+    Parameters
+    ----------
+    text : str
+        The string to be shingled.
+
+    shingle_size : int
+        The number of words in each shingle. By default SHINGLE_SIZE.
+
+    Returns
+    -------
+    shingle_hashes : numpy.ndarray
+        The uint64 array of the distinct shingle hashes, empty if the text
+        contains no words.
+    '''
+    word_lst = text.lower().split()
+
+    shingle_set = {
+        ' '.join(word_lst[i:i+shingle_size])
+        for i in range(max(len(word_lst) - shingle_size + 1, 1 if word_lst else 0))}
+
+    shingle_hashes = np.fromiter(
+        (zlib.crc32(shingle.encode('utf-8')) for shingle in shingle_set),
+        dtype=np.uint64, count=len(shingle_set))
+
+    return shingle_hashes
+
+
+def build_signature(shingle_hashes, permutations=PERMUTATIONS):
+    '''
+    Function that calculates the MinHash signature of a set of shingle hashes:
+    the minimum value of every hash function over the set. The fraction of
+    equal values in the signatures of two sets estimates their jaccard
+    similarity.
+
+    Parameters
+    ----------
+    shingle_hashes : numpy.ndarray
+        The uint64 array of shingle hashes built by build_shingle_hashes().
+
+    permutations : tuple
+        The (a, b) coefficients built by build_permutations().
+
+    Returns
+    -------
+    signature : numpy.ndarray
+        The uint32 array of the minimum of each hash function. Every value is
+        MERSENNE_PRIME - 1 for an empty set.
+    '''
+    (a, b) = permutations
+
+    signature = np.full(len(a), MERSENNE_PRIME - 1, dtype=np.uint64)
+
+    for i in range(0, len(shingle_hashes), CHUNK_SIZE):
+
+        chunk = shingle_hashes[i:i+CHUNK_SIZE]
+
+        # Hashing the chunk with every function at once, one row per shingle:
+        hash_matrix = (np.outer(chunk, a) + b) % np.uint64(MERSENNE_PRIME)
+        signature = np.minimum(signature, hash_matrix.min(axis=0))
+
+    return signature.astype(np.uint32)
+
+
+def build_band_hashes(signature, num_bands=NUM_BANDS):
+    '''
+    Function that splits a signature into num_bands bands of consecutive values
+    and hashes each band with blake2b. Two signatures are LSH candidates if any
+    band hash of the same band is equal.
+
+    Parameters
+    ----------
+    signature : numpy.ndarray
+        The uint32 signature built by build_signature().
+
+    num_bands : int
+        The number of bands. Must divide the length of the signature.
+
+    Returns
+    -------
+    band_hash_lst : list
+        The list of the signed 64 bit integer hash of every band, so they can be
+        stored as sqlite INTEGERs.
+    '''
+    band_hash_lst = [
+        int.from_bytes(hashlib.blake2b(band.tobytes(), digest_size=8).digest(), 'big', signed=True)
+        for band in np.split(signature, num_bands)]
+
+    return band_hash_lst
+
+
+def estimate_jaccard(signature_1, signature_2):
+    '''
+    Function that estimates the jaccard similarity of the shingle sets of two
+    signatures as the fraction of their values that are equal.
+
+    Parameters
+    ----------
+    signature_1 : numpy.ndarray
+        The first signature.
+
+    signature_2 : numpy.ndarray
+        The second signature.
+
+    Returns
+    -------
+    jaccard_sim : float
+        The estimated jaccard similarity between 0 and 1.
+    '''
+    return float(np.mean(signature_1 == signature_2))
@@ -0,0 +1,335 @@
+# Importing native python packages:
+import json
+import time
+
+# Importing database libraries:
+import sqlite3
+
+
+class parse_cache(object):
+    """
+    parse_cache() is a persistent on-disk cache of the parsing results of pdf()
+    objects, stored in an sqlite database. For every pdf file it holds the
+    destination_lst built from the outline of the pdf and the extracted text of
+    every page that has been read, so a pdf that is opened again does not need
+    to be parsed again.
+
+    Entries are keyed by the SHA-256 hash of the pdf file and a parser key that
+    identifies the version of the parser used, so a modified file or a new
+    parser never reads outdated results. Once the cache is larger than max_size
+    the least recently used pdfs are evicted.
+
+    Parameters
+    -----------
+    cache_path : str
+        The path to the sqlite database of the cache, created if it does not exist.
+
+    max_size : int
+        The maximum size of the cached text and outlines in bytes. By default
+        max_size=2**30, 1 GiB. If None the cache is never evicted.
+
+    Methods
+    -----------
+    get_destinations : Returns the cached destination_lst of a pdf.
+
+    put_destinations : Writes the destination_lst of a pdf to the cache.
+
+    get_pages : Returns the cached text of a list of pages of a pdf.
+
+    put_pages : Writes the text of pages of a pdf to the cache.
+
+    evict : Removes the least recently used pdfs until the cache fits max_size.
+
+    stats : Returns the hit and miss statistics and the size of the cache.
+
+    close : Closes the connection to the cache database.
+    """
+
+    def __init__(self, cache_path, max_size=2**30):
+
+        self.cache_path = cache_path
+        self.max_size = max_size
+
+        # Waiting on the write lock of other processes using the same cache:
+        self.con = sqlite3.connect(cache_path, timeout=60)
+        self.c = self.con.cursor()
+
+        self.c.execute("PRAGMA journal_mode = WAL")
+        self.c.execute("PRAGMA synchronous = NORMAL")
+
+        # Creating the table of every cached pdf:
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS Cache_Files (
+                    File_hash TEXT NOT NULL,
+                    Parser_key TEXT NOT NULL,
+                    Destination_lst TEXT,
+                    Size INTEGER NOT NULL,
+                    Last_used REAL NOT NULL,
+                    PRIMARY KEY (File_hash, Parser_key))"""
+                    )
+
+        # Creating the table of the text of every cached page:
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS Cache_Pages (
+                    File_hash TEXT NOT NULL,
+                    Parser_key TEXT NOT NULL,
+                    Page_num INTEGER NOT NULL,
+                    Page_text TEXT,
+                    PRIMARY KEY (File_hash, Parser_key, Page_num)) WITHOUT ROWID"""
+                    )
+
+        self.c.execute("CREATE INDEX IF NOT EXISTS Cache_Files_last_used ON Cache_Files (Last_used)")
+
+        self.con.commit()
+
+        # The hit and miss counters of this object:
+        self.hit_stats = {'hits': 0, 'misses': 0, 'page_hits': 0, 'page_misses': 0, 'evictions': 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        '''
+        Method closes the connection to the cache database.
+        '''
+        self.con.close()
+
+    def get_destinations(self, file_hash, parser_key):
+        '''
+        Method returns the cached destination_lst of a pdf and marks the pdf as
+        recently used.
+
+        Parameters
+        ----------
+        file_hash : str
+            The SHA-256 hash of the pdf file.
+
+        parser_key : str
+            The key identifying the parser version.
+
+        Returns
+        -------
+        destination_lst : list
+            The list of destination dicts, each with a 'Page_Range' tuple, or None
+            if the pdf is not in the cache.
+        '''
+        cache_row = self.c.execute(
+            "SELECT Destination_lst FROM Cache_Files WHERE File_hash = ? AND Parser_key = ?",
+            (file_hash, parser_key)).fetchone()
+
+        if cache_row is None or cache_row[0] is None:
+            self.hit_stats['misses'] += 1
+            return None
+
+        self.hit_stats['hits'] += 1
+
+        self.c.execute(
+            "UPDATE Cache_Files SET Last_used = ? WHERE File_hash = ? AND Parser_key = ?",
+            (time.time(), file_hash, parser_key))
+
+        self.con.commit()
+
+        destination_lst = json.loads(cache_row[0])
+
+        # JSON has no tuples, restoring the page range tuples:
+        for dest_dict in destination_lst:
+            dest_dict['Page_Range'] = tuple(dest_dict['Page_Range'])
+
+        return destination_lst
+
+    def put_destinations(self, file_hash, parser_key, destination_lst):
+        '''
+        Method writes the destination_lst of a pdf to the cache, creating the
+        cache entry of the pdf if it does not exist.
+
+        Parameters
+        ----------
+        file_hash : str
+            The SHA-256 hash of the pdf file.
+
+        parser_key : str
+            The key identifying the parser version.
+
+        destination_lst : list
+            The list of destination dicts of the pdf, after pdf.build_toc().
+        '''
+        destination_json = json.dumps(destination_lst)
+
+        self.create_entry(file_hash, parser_key)
+
+        # Replacing the size of a destination_lst written by another process using the same cache:
+        self.c.execute(
+            """UPDATE Cache_Files SET Destination_lst = ?, Size = Size - COALESCE(LENGTH(Destination_lst), 0) + ?
+            WHERE File_hash = ? AND Parser_key = ?""",
+            (destination_json, len(destination_json), file_hash, parser_key))
+
+        self.con.commit()
+
+        self.evict(keep=(file_hash, parser_key))
+
+    def get_pages(self, file_hash, parser_key, page_nums):
+        '''
+        Method returns the cached text of the pages of a pdf.
+
+        Parameters
+        ----------
+        file_hash : str
+            The SHA-256 hash of the pdf file.
+
+        parser_key : str
+            The key identifying the parser version.
+
+        page_nums : list
+            The list of page indexes.
+
+        Returns
+        -------
+        page_text_dict : dict
+            A dictionary of the text of every cached page of page_nums keyed by
+            page index. Pages that are not cached are missing from the dict.
+        '''
+        page_text_dict = {}
+
+        for page_num in page_nums:
+
+            page_row = self.c.execute(
+                """SELECT Page_text FROM Cache_Pages
+                WHERE File_hash = ? AND Parser_key = ? AND Page_num = ?""",
+                (file_hash, parser_key, page_num)).fetchone()
+
+            if page_row is not None:
+                page_text_dict[page_num] = page_row[0]
+
+        self.hit_stats['page_hits'] += len(page_text_dict)
+        self.hit_stats['page_misses'] += len(page_nums) - len(page_text_dict)
+
+        return page_text_dict
+
+    def put_pages(self, file_hash, parser_key, page_text_dict):
+        '''
+        Method writes the text of pages of a pdf to the cache in a single
+        transaction, creating the cache entry of the pdf if it does not exist.
+        Pages already in the cache, for example written by another process
+        using the same cache, are replaced and their size is only counted once.
+
+        Parameters
+        ----------
+        file_hash : str
+            The SHA-256 hash of the pdf file.
+
+        parser_key : str
+            The key identifying the parser version.
+
+        page_text_dict : dict
+            A dictionary of page strings keyed by page index.
+        '''
+        if len(page_text_dict) == 0:
+            return
+
+        # Creating the entry first, which takes the write lock before the replaced pages are read:
+        self.create_entry(file_hash, parser_key)
+
+        # Summing the size of the pages that are replaced, in chunks below the sqlite variable limit:
+        page_nums = list(page_text_dict)
+        replaced_size = 0
+
+        for chunk_start in range(0, len(page_nums), 500):
+
+            page_num_chunk = page_nums[chunk_start:chunk_start + 500]
+
+            replaced_size += self.c.execute(
+                f"""SELECT COALESCE(SUM(LENGTH(CAST(Page_text AS BLOB))), 0) FROM Cache_Pages
+                WHERE File_hash = ? AND Parser_key = ? AND Page_num IN ({', '.join('?' * len(page_num_chunk))})""",
+                (file_hash, parser_key, *page_num_chunk)).fetchone()[0]
+
+        self.c.executemany(
+            "INSERT OR REPLACE INTO Cache_Pages VALUES (?, ?, ?, ?)",
+            ((file_hash, parser_key, page_num, text) for page_num, text in page_text_dict.items()))
+
+        page_size = sum(len(text.encode('utf-8')) for text in page_text_dict.values() if text is not None)
+
+        self.c.execute(
+            "UPDATE Cache_Files SET Size = Size + ? WHERE File_hash = ? AND Parser_key = ?",
+            (page_size - replaced_size, file_hash, parser_key))
+
+        self.con.commit()
+
+        self.evict(keep=(file_hash, parser_key))
+
+    def create_entry(self, file_hash, parser_key):
+        '''
+        Method creates the empty cache entry of a pdf if it does not exist. The
+        method does not commit, this is left to the calling method.
+
+        Parameters
+        ----------
+        file_hash : str
+            The SHA-256 hash of the pdf file.
+
+        parser_key : str
+            The key identifying the parser version.
+        '''
+        self.c.execute(
+            """INSERT OR IGNORE INTO Cache_Files (File_hash, Parser_key, Destination_lst, Size, Last_used)
+            VALUES (?, ?, NULL, 0, ?)""", (file_hash, parser_key, time.time()))
+
+    def evict(self, keep=None):
+        '''
+        Method removes the least recently used pdfs from the cache until the
+        size of the cache is at most max_size.
+
+        Parameters
+        ----------
+        keep : tuple
+            The (file_hash, parser_key) of a pdf that is never evicted, the pdf
+            currently being written. By default keep=None.
+        '''
+        if self.max_size is None:
+            return
+
+        cache_size = self.c.execute("SELECT COALESCE(SUM(Size), 0) FROM Cache_Files").fetchone()[0]
+
+        if cache_size <= self.max_size:
+            return
+
+        for (file_hash, parser_key, size) in self.c.execute(
+            "SELECT File_hash, Parser_key, Size FROM Cache_Files ORDER BY Last_used").fetchall():
+
+            if cache_size <= self.max_size:
+                break
+
+            if (file_hash, parser_key) == keep:
+                continue
+
+            self.c.execute(
+                "DELETE FROM Cache_Pages WHERE File_hash = ? AND Parser_key = ?", (file_hash, parser_key))
+            self.c.execute(
+                "DELETE FROM Cache_Files WHERE File_hash = ? AND Parser_key = ?", (file_hash, parser_key))
+
+            cache_size -= size
+            self.hit_stats['evictions'] += 1
+
+        self.con.commit()
+
+    def stats(self):
+        '''
+        Method returns the hit and miss statistics of this object along with
+        the number of pdfs in the cache and its size.
+
+        Returns
+        -------
+        stats_dict : dict
+            A dictionary containing the 'hits' and 'misses' of destination_lst
+            lookups, the 'page_hits' and 'page_misses' of page lookups, the
+            number of 'evictions', the number of cached pdfs 'entries', the
+            'size_bytes' of the cached text and the 'max_size' of the cache.
+        '''
+        (entries, size_bytes) = self.c.execute(
+            "SELECT COUNT(*), COALESCE(SUM(Size), 0) FROM Cache_Files").fetchone()
+
+        stats_dict = dict(self.hit_stats, entries=entries, size_bytes=size_bytes, max_size=self.max_size)
+
+        return stats_dict
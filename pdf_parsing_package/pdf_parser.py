@@ -3,9 +3,25 @@ import PyPDF2 as p2
 import pdfplumber
 
 # Importing data management packages:
-from collections import Counter
+from collections import OrderedDict
+from collections.abc import Mapping
 # Importing native python package management libs:
-import warnings
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import os
+
+from . import parse_cache as pcache
+
+# psutil is only used to measure memory usage on platforms without /proc:
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# The version of the parsing results of the pdf() object, part of the key of the
+# parse_cache. Must be incremented whenever a change to the parser changes the
+# destination_lst or the extracted page text, so outdated cache entries are ignored:
+PARSER_VERSION = '1'
 
 
 class pdf(p2.PdfFileReader):
@@ -30,6 +46,59 @@ class pdf(p2.PdfFileReader):
         echo determines if print statements describing methods processes are
         output to the console. By deafult echo=False
 
+    lazy : bool
+        lazy determines if the text of each pdf section is extracted when the
+        object is initalized or only when a section is first accessed. If
+        lazy=True the self.indexed_text_dict instance variable is a
+        lazy_text_dict() mapping instead of a dict. By default lazy=False
+
+    page_cache_size : int
+        The maximum number of extracted page strings kept in the page text
+        cache shared by all sections. When the cache is full the least recently
+        used page is evicted. By default page_cache_size=None and the cache
+        is unbounded.
+
+    workers : int
+        The number of processes used to extract page text when the
+        self.indexed_text_dict is built. Each worker process opens the pdf by its
+        file path and extracts a chunk of pages. Only used when lazy=False. By
+        default workers=None and all pages are extracted in the current process.
+
+    flush_pages : bool
+        flush_pages determines if the char and layout objects that pdfplumber
+        caches on each page are released as soon as the text of the page has
+        been extracted, keeping memory usage flat as more pages are read. By
+        default flush_pages=False
+
+    index : bool
+        index determines if the outline of the pdf is parsed into the
+        self.destination_lst and the self.indexed_text_dict is built when the
+        object is initalized. If index=False neither is built and the text is
+        only read through the page_text() and pages_text() methods, which only
+        extract the requested pages. By default index=True, see pdf.open() for
+        the lightweight alternative.
+
+    cache : str or parse_cache
+        A parse_cache() object, or the path of its sqlite database, used to
+        store the destination_lst and the extracted text of every page on disk.
+        When a pdf with the same contents is opened again its outline is not
+        parsed and its pages are not extracted again, they are read from the
+        cache. By default cache=None and nothing is cached.
+
+    backend : str or extraction_backend
+        The engine used to extract the text of each page, either the name of a
+        backend in EXTRACTION_BACKENDS or an extraction_backend() object. "plumber"
+        uses pdfplumber's layout analysis, "pypdf" uses PyPDF2's much faster
+        content stream text extraction at the cost of layout fidelity (eg
+        missing line breaks). Pages are cached separately for every backend.
+        By default backend="plumber".
+
+    The object can be used as a context manager, in which case the underlying
+    pdf files are closed when the block is exited:
+
+        with pdf(file_path, flush_pages=True) as report:
+            report.get_sections('risk factors')
+
     Methods
     -----------
     pop_destination_lst : A recursive method used to parse the .getOutlines()
@@ -40,10 +109,39 @@ class pdf(p2.PdfFileReader):
 
     build_destination_text :
 
+    extract_destination_text : Extracts the list of page strings for a single
+    destination dict.
+
+    iter_sections : A generator yielding the text of one section at a time.
+
+    open : Opens a pdf without building the outline index.
+
+    page_text : Returns the text of a single page via the page text cache.
+
+    pages_text : Returns the text of a range of pages via the page text cache.
+
+    extract_page : Extracts the text of a single page with the extraction backend.
+
+    extract_pages_parallel : Extracts the text of a list of pages across a
+    pool of worker processes.
+
     get_sections :
+
+    memory_stats : Returns the peak resident memory sampled while processing the pdf.
+
+    cache_stats : Returns the hit and miss statistics of the parse cache.
+
+    flush_cache : Writes the pages extracted since the last flush to the parse cache.
+
+    close : Closes the underlying pdf files and clears the page text cache.
     """
 
-    def __init__(self, file_path, echo=False):
+    def __init__(self, file_path, echo=False, lazy=False, page_cache_size=None,
+        workers=None, flush_pages=False, index=True, cache=None, backend='plumber'):
+
+        # Recording the memory of the process before the pdf is opened:
+        self.start_rss = get_current_rss()
+        self.peak_rss = self.start_rss
 
         # Initalizing PdfFileReader child object:
         super().__init__(file_path)
@@ -54,6 +152,18 @@ class pdf(p2.PdfFileReader):
         # File path:
         self.file_path = file_path
 
+        # Number of processes used to build the indexed_text_dict:
+        self.workers = workers
+
+        # Release the pdfplumber layout cache of every page after extraction:
+        self.flush_pages = flush_pages
+
+        # The engine used to extract the text of every page:
+        self.backend = get_backend(backend)
+
+        # Decryption password passed to worker processes, None if not encrypted:
+        self.password = None
+
         # Conditional to decrypt pdf if encrypted:
         if self.isEncrypted == True:
 
@@ -61,6 +171,7 @@ class pdf(p2.PdfFileReader):
             password = input('Pdf is encrypted, please input the decryption password: ')
 
             self.decrypt(password)
+            self.password = password
 
             # Defining pdf file object for pdfplumber with password:
             self.pdf_plumb = pdfplumber.open(file_path, password=password)
@@ -70,19 +181,176 @@ class pdf(p2.PdfFileReader):
             self.pdf_plumb = pdfplumber.open(file_path)
 
 
+        # Declaring the LRU page text cache shared by all destination sections:
+        self.page_cache = OrderedDict()
+        self.page_cache_size = page_cache_size
+
+        # Counter of page extractions avoided by reading from the page cache:
+        self.extractions_saved = 0
+
+        # Opening the persistent parse cache, the file is only hashed if a cache is used:
+        self.close_cache = isinstance(cache, str)
+
+        if self.close_cache is True:
+            cache = pcache.parse_cache(cache)
+
+        self.cache = cache
+        self.file_hash = hash_file(file_path) if cache is not None else None
+        self.cache_key = f'{PARSER_VERSION}:{self.backend.name}'
+
+        # Extracted pages waiting to be written to the parse cache by .flush_cache():
+        self.cache_pending = {}
+
         # Declaring the instance list varialble to be populated by .pop_destination_lst():
         self.destination_lst = []
 
-        # Calling the pop_destination_lst() method to populate the self.pop_destination_lst:
-        self.pop_destination_lst(self.getOutlines(), counter=0)
-        #print(self.destination_lst)
+        # Only the pages that are requested are read if the pdf is not indexed:
+        if index is not True:
+
+            self.indexed_text_dict = {}
+            self.sample_rss()
+
+            return
+
+        # Reading the destination_lst of a previously parsed pdf from the cache:
+        cached_destination_lst = None
+        if self.cache is not None:
+            cached_destination_lst = self.cache.get_destinations(self.file_hash, self.cache_key)
+
+        if cached_destination_lst is not None:
+            self.destination_lst = cached_destination_lst
+
+        else:
+            # Calling the pop_destination_lst() method to populate the self.pop_destination_lst:
+            self.pop_destination_lst(self.getOutlines(), counter=0)
+            #print(self.destination_lst)
 
-        # Calculating the Page ranges for each destiation:
-        self.build_toc()
+            # Calculating the Page ranges for each destiation:
+            self.build_toc()
+
+            if self.cache is not None:
+                self.cache.put_destinations(self.file_hash, self.cache_key, self.destination_lst)
 
         # Using pdf_plumb library to extract tables and text, indexing them by section:
-        self.indexed_text_dict = self.build_destination_text()
+        if lazy is True:
+
+            # Deferring text extraction until a section is accessed:
+            self.indexed_text_dict = lazy_text_dict(self)
+
+        else:
+            self.indexed_text_dict = self.build_destination_text()
+
+        self.sample_rss()
+
+    @classmethod
+    def open(cls, file_path, index=False, **kwargs):
+        '''
+        Method opens a pdf without parsing its outline or extracting any text,
+        for reading known pages with the page_text() and pages_text() methods,
+        eg the Start_Page and End_Page of a section stored in the database.
+
+        Parameters
+        ----------
+        file_path : str
+            The string representing the file path to the pdf.
 
+        index : bool
+            If True the pdf is indexed as when the object is initalized
+            directly. By default index=False.
+
+        **kwargs
+            Additional keyword arguments of the pdf() object, eg page_cache_size.
+
+        Returns
+        -------
+        pdf_obj : pdf
+            The pdf() object.
+        '''
+        return cls(file_path, index=index, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        '''
+        Method closes the pdfplumber pdf object and the PyPDF2 stream of the pdf
+        and clears the page text cache. Text that has already been written to
+        the self.indexed_text_dict remains available. Pages that have not been
+        written to the parse cache yet are written before it is closed.
+        '''
+        self.flush_cache()
+
+        self.pdf_plumb.close()
+        self.stream.close()
+
+        self.page_cache.clear()
+
+        # Only closing the parse cache if it was opened by this object:
+        if self.close_cache is True:
+            self.cache.close()
+
+    def memory_stats(self):
+        '''
+        Method returns the peak resident set size (RSS) of the process sampled
+        after every page extracted by the object, along with the RSS when the
+        pdf was opened. 'peak_rss_increase' is the additional memory this pdf
+        required, which is not affected by larger pdfs processed earlier by the
+        same process. Memory allocated and released between two samples is not
+        measured. All values are None if memory usage cannot be measured.
+
+        Returns
+        -------
+        memory_dict : dict
+            A dictionary containing the 'peak_rss', 'start_rss' and
+            'peak_rss_increase' values in bytes.
+        '''
+        if self.peak_rss is None:
+            return {'peak_rss': None, 'start_rss': None, 'peak_rss_increase': None}
+
+        memory_dict = {'peak_rss': self.peak_rss, 'start_rss': self.start_rss,
+            'peak_rss_increase': self.peak_rss - self.start_rss}
+
+        return memory_dict
+
+    def sample_rss(self):
+        '''
+        Method samples the current RSS of the process and updates the peak RSS
+        of the object if it is higher, see get_current_rss().
+        '''
+        rss = get_current_rss()
+
+        if rss is not None and self.peak_rss is not None:
+            self.peak_rss = max(self.peak_rss, rss)
+
+    def cache_stats(self):
+        '''
+        Method returns the hit and miss statistics of the parse cache used by
+        the object, see parse_cache.stats().
+
+        Returns
+        -------
+        stats_dict : dict
+            The statistics of the parse cache, or None if no cache is used.
+        '''
+        if self.cache is None:
+            return None
+
+        return self.cache.stats()
+
+    def flush_cache(self):
+        '''
+        Method writes the pages extracted since the last flush to the parse
+        cache in a single transaction, rather than committing every page as it
+        is extracted. Called after every section is extracted and when the
+        object is closed.
+        '''
+        if self.cache is not None and len(self.cache_pending) > 0:
+            self.cache.put_pages(self.file_hash, self.cache_key, self.cache_pending)
+
+        self.cache_pending = {}
 
     def pop_destination_lst(self, dest_obj, counter):
         '''
@@ -120,172 +388,336 @@ class pdf(p2.PdfFileReader):
 
     def build_toc(self):
         '''
-        The main method that compliles the Table of Contents of the pdf. It first
+        The main method that compliles the Table of Contents of the pdf. It
         modifies the list of PyPDF destiation dictionaries to inclue the page
-        range of each destiation. This is done with a simple nested page range
-        detection algorithm which is described in depth in the documenation.
+        range of each destiation. The page ranges are calculated in a single
+        pass over the destinations by the build_page_ranges() function which is
+        described in depth in the documenation.
 
         The method does not return an object, it modifies the existing dictionaries
         in the self.destination_lst instance list.
         '''
+        if self.echo is True:
+            # Print Statements are for diagnositics & comprehension during run:
+            print('-------------------------------------------------------------')
+            print('| PDF SECTION-PAGE-RANGE-DETECTION ALGORITHM RESULTS        |')
+            print('-------------------------------------------------------------')
 
-        # Declearing list to store counts for each destiation's nest level:
-        nest_lvl_lst = []
+        page_range_lst = build_page_ranges(self.destination_lst, self.getNumPages())
 
-        # Itterating over the destination_lst to build the count list:
-        for dict in self.destination_lst:
-            nest_lvl_lst.append(dict['Nested_level'])
+        # Replacing the Start_Page item of each dict w/ the page range tuple:
+        for dict, page_range in zip(self.destination_lst, page_range_lst):
 
-        # Creating set to extract a list containing the unique nest lvl values:
-        unique_nest_vals = list(set(nest_lvl_lst))
+            dict['Page_Range'] = page_range
+            del dict['Start_Page']
 
-        # Counting the nests for each nest level from the nest level list:
-        nest_lvl_count = Counter(nest_lvl_lst)
+            if self.echo is True:
+                print(dict)
+                print('-------------------------------------------------------------')
 
-        # Parsing the nest_lvl_lst to select the lowest int i.e. highest level in nest:
-        highest_nest_lvl = min(nest_lvl_lst)
+    def build_destination_text(self):
+        '''
+        Method iterates through the instance list destination_lst and uses the
+        extraction backend to extract all the text from each individual
+        destiation section and creates a dictionary where the keys is the title
+        of the destination from which the text data was extracted.
 
-        # Creating a list of all Destinations at the highest nest level:
-        highest_nest_lst = []
-        for dict in self.destination_lst:
+        Returns
+        -------
+        indexed_text_dict : dict
+            A dictionary storing all the text and table-extracted-text from the
+            pdf indexed by destiation titles.
+        '''
 
-            # Checking each destiation dict for its nest level:
-            if dict['Nested_level'] == highest_nest_lvl:
-                highest_nest_lst.append(dict)
 
-        #print(highest_nest_lst)
+        # Main dictionary:
+        indexed_text_dict = {}
 
-        #print(self.getNumPages())
+        # Extracting all pages across a process pool before assembling sections:
+        if self.workers is not None and self.workers > 1:
 
-        #print(reversed(unique_nest_vals))
+            # Building the list of every page referenced by a destination:
+            page_ref_lst = [page_num for dict in self.destination_lst
+                for page_num in self.destination_page_nums(dict)]
 
+            page_nums = sorted(set(page_ref_lst))
 
-        if self.echo is True:
-            '# Itterating through Destinations to determine their page ranges: '
-            # Print Statements are for diagnositics & comprehension during run:
-            print('-------------------------------------------------------------')
-            print('| PDF SECTION-PAGE-RANGE-DETECTION ALGORITHM RESULTS        |')
-            print('-------------------------------------------------------------')
+            # Only extracting the pages that are not in the parse cache:
+            page_text_dict = {}
+            if self.cache is not None:
+                page_text_dict = self.cache.get_pages(self.file_hash, self.cache_key, page_nums)
+
+            extracted_text_dict = self.extract_pages_parallel(
+                [page_num for page_num in page_nums if page_num not in page_text_dict])
+
+            if self.cache is not None and len(extracted_text_dict) > 0:
+                self.cache.put_pages(self.file_hash, self.cache_key, extracted_text_dict)
 
-        # Itterating through each nest level beinging with the deepest level:
-        for nest_lvl in reversed(unique_nest_vals):
+            page_text_dict.update(extracted_text_dict)
+
+            # Pages shared by nested sections are only extracted once:
+            self.extractions_saved += len(page_ref_lst) - len(page_text_dict)
 
-            # Itterating through each dictionary in the list copy:
             for dict in self.destination_lst:
 
-                # Defining the main dict's position in the list:
-                dict_index = self.destination_lst.index(dict)
+                indexed_text_dict[dict['Title']] = [
+                    page_text_dict[page_num] for page_num in self.destination_page_nums(dict)]
 
-                # Using the nearest destination dict that is at the same list lvl or higher:
-                if dict['Nested_level'] == nest_lvl:
+            return indexed_text_dict
 
-                    if self.echo is True:
-                        print('CURRENT DESTINATION:', dict['Title'], 'START PAGE:',
-                        dict['Start_Page'], 'NEST LEVEL:', dict['Nested_level'])
+        # Iterating through destination_lst extracting all relevant textual data:
+        for dict in self.destination_lst:
 
+            indexed_text_dict[dict['Title']] = self.extract_destination_text(dict)
 
-                    # Itterating through each destiation dict AFTER the main dict in the list:
-                    for next_dict in self.destination_lst[dict_index+1:]:
+        return indexed_text_dict
 
-                        # Conditional only performs prange algo if there is another
-                        # destiation on the same or higher nest level. If not it formats manually:
-                        if self.destination_lst.index(next_dict) == self.destination_lst.index(self.destination_lst[-1]):
+    def destination_page_nums(self, dest_dict):
+        '''
+        Method converts the 'Page_Range' tuple of a destination dict into a
+        range of page indexes, clamped to the pdf the same way a list slice
+        of the pdfplumber pages would be.
 
-                            # This means that this destination occurs for rest of pdf:
-                            dict['Page_Range'] = (dict['Start_Page'], self.getNumPages())
+        Parameters
+        ----------
+        dest_dict : dict
+            A destination dict from the self.destination_lst instance list.
 
-                            if self.echo is True:
-                                print('ADJACENT DESTINATION:', dict['Title'],
-                                'START PAGE', dict['Start_Page'], 'NEST LEVEL:',
-                                dict['Nested_level'])
+        Returns
+        -------
+        page_nums : range
+            The range of page indexes covered by the destination section.
+        '''
+        # Unpacking variables from dict page range tuple:
+        (start_page, end_page) = dest_dict['Page_Range']
 
-                        else:
+        return range(*slice(start_page, end_page).indices(len(self.pdf_plumb.pages)))
 
-                            # Only Assigns 'End_Page' variable if next_dict is on an equal or higher nest lvl:
-                            if next_dict['Nested_level'] <= nest_lvl:
+    def extract_destination_text(self, dest_dict):
+        '''
+        Method uses the pdf_plumb library to extract the text from every page
+        in the page range of a single destination dict.
 
-                                # Replacing Start_Page & End_Page dict items w/ page range tuple:
-                                dict['Page_Range'] = (dict['Start_Page'], next_dict['Start_Page'])
+        Parameters
+        ----------
+        dest_dict : dict
+            A destination dict from the self.destination_lst instance list
+            containing the 'Page_Range' tuple of the section.
 
-                                if self.echo is True:
-                                    print('ADJACENT DESTINATION:', next_dict['Title'],
-                                    'START PAGE', next_dict['Start_Page'], 'NEST LEVEL:',
-                                    next_dict['Nested_level'])
+        Returns
+        -------
+        text_page_lst : list
+            A list of strings with each string being the text of a single page
+            of the destination section.
+        '''
+        # Building the list of all page strings from the page text cache:
+        text_page_lst = [
+            self.page_text(page_num) for page_num in self.destination_page_nums(dest_dict)]
 
-                                break
+        self.flush_cache()
 
-                            else:
-                                continue
+        return text_page_lst
 
-                    if self.echo is True:
-                        print(dict)
-                        print('-------------------------------------------------------------')
+    def iter_sections(self):
+        '''
+        A generator that extracts and yields the text of one destination
+        section at a time without building the self.indexed_text_dict. The
+        pdfplumber page objects are released as soon as their text has been
+        extracted, and every page is evicted from the page text cache once the
+        last section containing it has been read. Only the pages still needed
+        by later sections and the section currently being yielded are held in
+        memory, so memory is bounded by the largest section rather than by the
+        size of the pdf.
+
+        Yields
+        ------
+        section : tuple
+            A (title, page_range, text_page_lst) tuple where text_page_lst is a
+            list of strings with each string being the text of a single page.
+        '''
+        # Mapping the index of each section to the pages it is the last to contain:
+        last_page_dict = {}
+        for index, dest_dict in enumerate(self.destination_lst):
 
-        # Brute Force Conditional to catch Destination the shitty Conditional algo missed:
-        for dict in self.destination_lst:
+            for page_num in self.destination_page_nums(dest_dict):
+                last_page_dict[page_num] = index
 
-            if 'Page_Range' in dict:
-                del dict['Start_Page']
-                pass
+        evict_page_dict = {}
+        for page_num, index in last_page_dict.items():
+            evict_page_dict.setdefault(index, []).append(page_num)
 
-            else:
+        for index, dest_dict in enumerate(self.destination_lst):
 
-                dict['Page_Range'] = (dict['Start_Page'], self.getNumPages())
-                del dict['Start_Page']
+            text_page_lst = [
+                self.page_text(page_num, release=True)
+                for page_num in self.destination_page_nums(dest_dict)]
 
-                runtime_warn_msg = f'''The "{dict['Title']}" section was not caught by the
-                page-range-detection-algorithm. It was manually modified as such:
+            # Evicting the pages that no later section needs:
+            for page_num in evict_page_dict.get(index, []):
+                self.page_cache.pop(page_num, None)
 
-                ----------------------------------------------------------------
-                {dict}
-                ----------------------------------------------------------------
+            self.flush_cache()
 
-                The page range of this section may be incorrect.
-                '''
+            yield (dest_dict['Title'], dest_dict['Page_Range'], text_page_lst)
 
-                warnings.warn(runtime_warn_msg, category=RuntimeWarning)
+    def page_text(self, page_num, release=False):
+        '''
+        Method returns the text of a single page. Each page is only extracted
+        once, after which its text is read from the self.page_cache instance
+        OrderedDict. Nested sections that overlap their parent sections
+        therefore never extract the same page twice.
 
-    def build_destination_text(self):
+        If self.page_cache_size is set the least recently used page is evicted
+        once the cache holds more than page_cache_size pages. If a parse cache
+        is used pages missing from the self.page_cache are read from the parse
+        cache before they are extracted, and extracted pages are held in
+        self.cache_pending until they are written to it by .flush_cache().
+
+        Parameters
+        ----------
+        page_num : int
+            The index of the page in the pdf.
+
+        release : bool
+            If True the cached layout objects of the pdfplumber page are released
+            after the page is extracted. By default release=False
+
+        Returns
+        -------
+        text : str
+            The text extracted from the page by the extraction backend.
         '''
-        Method iterates through the instance list destination_lst and uses the
-        pdf_plumb library to extract all the text and tables from each individual
-        destiation section and creates a dictionary where the keys is the title
-        of the destination from which the text data was extracted.
+        # Returning the cached page text and marking it as recently used:
+        if page_num in self.page_cache:
+
+            self.page_cache.move_to_end(page_num)
+            self.extractions_saved += 1
+
+            return self.page_cache[page_num]
+
+        # Reading the page text from the parse cache before extracting it:
+        cached_text_dict = {}
+        if page_num in self.cache_pending:
+            cached_text_dict = {page_num: self.cache_pending[page_num]}
+
+        elif self.cache is not None:
+            cached_text_dict = self.cache.get_pages(self.file_hash, self.cache_key, [page_num])
+
+        if page_num in cached_text_dict:
+            text = cached_text_dict[page_num]
+
+        else:
+            text = self.extract_page(page_num, release=release)
+
+            # Buffering the page until the section or pdf is complete:
+            if self.cache is not None:
+                self.cache_pending[page_num] = text
+
+        # Writing the page text to the cache and evicting the oldest page if full:
+        self.page_cache[page_num] = text
+
+        if self.page_cache_size is not None:
+
+            while len(self.page_cache) > self.page_cache_size:
+                self.page_cache.popitem(last=False)
+
+        return text
+
+    def pages_text(self, start_page, end_page):
+        '''
+        Method returns the text of every page from start_page up to but not
+        including end_page via the page text cache, in the same way the text of
+        a section with the page range (start_page, end_page) is extracted. The
+        range is clamped to the pdf like a list slice. Only the pages in the
+        range are extracted.
+
+        Parameters
+        ----------
+        start_page : int
+            The index of the first page.
+
+        end_page : int
+            The index of the page after the last page. If None the range runs
+            until the end of the pdf.
 
         Returns
         -------
-        indexed_text_dict : dict
-            A dictionary storing all the text and table-extracted-text from the
-            pdf indexed by destiation titles.
+        text_page_lst : list
+            A list of strings with each string being the text of a single page.
         '''
+        text_page_lst = [
+            self.page_text(page_num) for page_num
+            in range(*slice(start_page, end_page).indices(len(self.pdf_plumb.pages)))]
 
+        self.flush_cache()
 
-        # Main dictionary:
-        indexed_text_dict = {}
+        return text_page_lst
 
-        # Iterating through destination_lst extracting all relevant textual data:
-        for dict in self.destination_lst:
+    def extract_page(self, page_num, release=False):
+        '''
+        Method extracts the text of a single page with the extraction backend
+        of the object without making use of the page text cache.
 
-            # list of all page strings:
-            text_page_lst = []
+        Parameters
+        ----------
+        page_num : int
+            The index of the page in the pdf.
 
-            # Unpacking variables from dict page range tuple:
-            (start_page, end_page) = dict['Page_Range']
+        release : bool
+            If True the cached layout objects of the page are released after the
+            text is extracted, see release_page(). By default release=False
 
-            # Initalzing the list of pdfplumber page objects given the page range:
-            pdf_pages = self.pdf_plumb.pages[start_page:end_page]
+        Returns
+        -------
+        text : str
+            The text extracted from the page by the extraction backend.
+        '''
+        text = self.backend.extract_page(
+            self.backend.document(self), page_num,
+            release=(release is True or self.flush_pages is True))
 
-            # Iterating through list of pdf pages and extracting text strings:
-            for page in pdf_pages:
+        # Updating the peak memory measured for the pdf:
+        self.sample_rss()
 
-                # Building text_page_lst:
-                text = page.extract_text()
+        return text
 
-                text_page_lst.append(text)
+    def extract_pages_parallel(self, page_nums):
+        '''
+        Method splits a list of page indexes into contiguous chunks and extracts
+        the text of each chunk in a separate worker process via the
+        extract_page_chunk() function. The number of processes is set by the
+        self.workers instance variable.
 
-            indexed_text_dict[dict['Title']] = text_page_lst
+        Parameters
+        ----------
+        page_nums : list
+            A sorted list of the page indexes to be extracted.
 
-        return indexed_text_dict
+        Returns
+        -------
+        page_text_dict : dict
+            A dictionary of the extracted page strings keyed by page index.
+        '''
+        page_text_dict = {}
+
+        if len(page_nums) == 0:
+            return page_text_dict
+
+        # Using several chunks per worker so uneven pages are balanced across the pool:
+        chunk_size = max(1, -(-len(page_nums) // (self.workers * 4)))
+        chunk_lst = [page_nums[i:i+chunk_size] for i in range(0, len(page_nums), chunk_size)]
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+
+            text_chunk_lst = executor.map(
+                extract_page_chunk, [self.file_path] * len(chunk_lst), chunk_lst,
+                [self.password] * len(chunk_lst), [self.backend] * len(chunk_lst))
+
+            # Results are returned in the same order as the chunks were submitted:
+            for chunk, text_chunk in zip(chunk_lst, text_chunk_lst):
+                page_text_dict.update(zip(chunk, text_chunk))
+
+        return page_text_dict
 
     def get_sections(self, *keywords):
         '''
@@ -326,3 +758,423 @@ class pdf(p2.PdfFileReader):
                     continue
 
         return search_results
+
+
+def build_page_ranges(destination_lst, num_pages):
+    '''
+    Function that calculates the page range of every destination dict in a
+    flattened outline list in a single pass using a stack.
+
+    A destination section ends at the start page of the next destination in the
+    list that is on the same or a higher nest level (a lower or equal
+    'Nested_level' value). As destinations are read in order every destination
+    still waiting for its end page is kept on a stack whose nest levels strictly
+    increase from bottom to top, so a new destination only ever closes the
+    destinations at the top of the stack. Destinations that are never closed
+    run until the end of the pdf.
+
+    As with the original page-range-detection algorithm the final destination in
+    the list never closes the destinations before it. The original algorithm
+    never assigned the final destination a page range either, which was then
+    set to run until the end of the pdf with a RuntimeWarning for every pdf.
+    Every destination is assigned a page range here, the final one running
+    until the end of the pdf, so there is no uncaught section to warn about.
+
+    Parameters
+    ----------
+    destination_lst : list
+        The list of destination dicts built by pdf.pop_destination_lst(), each
+        containing a 'Nested_level' and 'Start_Page' item.
+
+    num_pages : int
+        The number of pages in the pdf.
+
+    Returns
+    -------
+    page_range_lst : list
+        A list of (start_page, end_page) tuples in the same order as destination_lst.
+    '''
+    page_range_lst = [None] * len(destination_lst)
+
+    # Stack of the indexes of destinations that have not been assigned an end page:
+    open_dest_stack = []
+
+    for index, dest_dict in enumerate(destination_lst):
+
+        nest_lvl = dest_dict['Nested_level']
+
+        # Closing every open destination on the same or a deeper nest level:
+        if index != len(destination_lst) - 1:
+
+            while open_dest_stack and destination_lst[open_dest_stack[-1]]['Nested_level'] >= nest_lvl:
+
+                open_index = open_dest_stack.pop()
+                page_range_lst[open_index] = (
+                    destination_lst[open_index]['Start_Page'], dest_dict['Start_Page'])
+
+        open_dest_stack.append(index)
+
+    # All destinations left on the stack occur for the rest of pdf:
+    for open_index in open_dest_stack:
+        page_range_lst[open_index] = (destination_lst[open_index]['Start_Page'], num_pages)
+
+    return page_range_lst
+
+
+def release_page(page):
+    '''
+    Function that releases the char and layout objects that pdfplumber caches
+    on a page object once the page has been parsed. The page can still be
+    used afterwards, it would simply be parsed again.
+
+    Parameters
+    ----------
+    page : pdfplumber.page.Page
+        The pdfplumber page object to be released.
+    '''
+    # Older versions of pdfplumber only provide the flush_cache() method:
+    if hasattr(page, 'close'):
+        page.close()
+
+    else:
+        page.flush_cache()
+
+
+class extraction_backend(object):
+    """
+    extraction_backend() is the interface shared by the engines pdf() objects
+    extract page text with. A backend opens a pdf by its file path, extracts
+    the text of a page of the opened document and closes it. The document of
+    a pdf() object that has already been opened is returned by document(), so
+    the pdf is not opened twice within the same process.
+
+    New backends are subclasses implementing every method, added to
+    EXTRACTION_BACKENDS under their name or passed to pdf() directly. They
+    must be picklable to be used by worker processes.
+
+    Attributes
+    -----------
+    name : str
+        The name of the backend, part of the key of the parse cache.
+    """
+    name = None
+
+    def open(self, file_path, password=None):
+        '''
+        Method opens a pdf by its file path.
+
+        Parameters
+        ----------
+        file_path : str
+            The string representing the file path to the pdf.
+
+        password : str
+            The decryption password of the pdf. By default password=None.
+
+        Returns
+        -------
+        document : object
+            The opened document.
+        '''
+        raise NotImplementedError
+
+    def document(self, pdf_obj):
+        '''
+        Method returns the document of the backend already opened by a pdf()
+        object.
+
+        Parameters
+        ----------
+        pdf_obj : pdf
+            The pdf() object.
+
+        Returns
+        -------
+        document : object
+            The opened document.
+        '''
+        raise NotImplementedError
+
+    def extract_page(self, document, page_num, release=False):
+        '''
+        Method extracts the text of a single page of an opened document.
+
+        Parameters
+        ----------
+        document : object
+            The document returned by open() or document().
+
+        page_num : int
+            The index of the page in the pdf.
+
+        release : bool
+            If True any objects cached on the page while extracting it are
+            released. By default release=False
+
+        Returns
+        -------
+        text : str
+            The text extracted from the page.
+        '''
+        raise NotImplementedError
+
+    def close(self, document):
+        '''
+        Method closes a document returned by open().
+
+        Parameters
+        ----------
+        document : object
+            The opened document.
+        '''
+        raise NotImplementedError
+
+
+class plumber_backend(extraction_backend):
+    """
+    The extraction backend using the layout analysis of pdfplumber's
+    extract_text(), which reproduces the line breaks and word spacing of the
+    page but parses every character on it.
+    """
+    name = 'plumber'
+
+    def open(self, file_path, password=None):
+
+        # Only passing the password to pdfplumber if the pdf is encrypted:
+        if password is None:
+            return pdfplumber.open(file_path)
+
+        return pdfplumber.open(file_path, password=password)
+
+    def document(self, pdf_obj):
+        return pdf_obj.pdf_plumb
+
+    def extract_page(self, document, page_num, release=False):
+
+        page = document.pages[page_num]
+
+        text = page.extract_text()
+
+        if release is True:
+            release_page(page)
+
+        return text
+
+    def close(self, document):
+        document.close()
+
+
+class pypdf_backend(extraction_backend):
+    """
+    The extraction backend using PyPDF2's text extraction, which reads the text
+    operators of the page content stream in order without any layout analysis.
+    It is several times faster than pdfplumber but words may be run together
+    or split and line breaks are not preserved, which matters little to the
+    bag-of-words similarity metrics.
+    """
+    name = 'pypdf'
+
+    def open(self, file_path, password=None):
+
+        reader = p2.PdfFileReader(file_path)
+
+        if reader.isEncrypted:
+            reader.decrypt(password)
+
+        return reader
+
+    def document(self, pdf_obj):
+
+        # The pdf() object is itself a PyPDF2 PdfFileReader:
+        return pdf_obj
+
+    def extract_page(self, document, page_num, release=False):
+
+        page = document.getPage(page_num)
+
+        # Older versions of PyPDF2 only provide the extractText() method:
+        if hasattr(page, 'extract_text'):
+            return page.extract_text()
+
+        return page.extractText()
+
+    def close(self, document):
+        document.stream.close()
+
+
+# The extraction backends available by name to the backend parameter of pdf():
+EXTRACTION_BACKENDS = {'plumber': plumber_backend(), 'pypdf': pypdf_backend()}
+
+
+def get_backend(backend):
+    '''
+    Function that returns the extraction backend object of a backend name,
+    raising an error if the name is unknown. extraction_backend() objects are
+    returned unchanged.
+
+    Parameters
+    ----------
+    backend : str or extraction_backend
+        The name of a backend in EXTRACTION_BACKENDS or a backend object.
+
+    Returns
+    -------
+    backend : extraction_backend
+        The extraction backend object.
+    '''
+    if isinstance(backend, extraction_backend):
+        return backend
+
+    if backend not in EXTRACTION_BACKENDS:
+        raise ValueError(f'Invalid extraction backend: {backend}')
+
+    return EXTRACTION_BACKENDS[backend]
+
+
+def extract_page_chunk(file_path, page_nums, password=None, backend=None):
+    '''
+    Function used by the worker processes of pdf.extract_pages_parallel() that
+    opens the pdf by its file path with the extraction backend and extracts
+    the text of a chunk of pages.
+
+    Parameters
+    ----------
+    file_path : str
+        The string representing the file path to the pdf.
+
+    page_nums : list
+        The list of page indexes to be extracted.
+
+    password : str
+        The decryption password of the pdf. By default password=None.
+
+    backend : extraction_backend
+        The extraction backend object. By default backend=None, pdfplumber.
+
+    Returns
+    -------
+    text_page_lst : list
+        A list of the extracted page strings in the same order as page_nums.
+    '''
+    backend = get_backend('plumber' if backend is None else backend)
+
+    document = backend.open(file_path, password=password)
+
+    try:
+        # Releasing each page so the worker's memory does not grow with the chunk:
+        text_page_lst = [
+            backend.extract_page(document, page_num, release=True) for page_num in page_nums]
+
+    finally:
+        backend.close(document)
+
+    return text_page_lst
+
+
+def get_current_rss():
+    '''
+    Function that returns the current resident set size of the process in
+    bytes, read from /proc/self/statm or with psutil on platforms without /proc.
+    Unlike the peak RSS reported by the resource module the current RSS falls
+    again when memory is released, so it can be sampled to measure the memory
+    used by a single pdf in a long running process.
+
+    Returns
+    -------
+    rss : int
+        The current resident set size in bytes, or None if neither /proc nor
+        psutil is available on the platform.
+    '''
+    # The second field of statm is the number of resident pages:
+    try:
+        with open('/proc/self/statm') as statm_file:
+            resident_pages = int(statm_file.read().split()[1])
+
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    if psutil is None:
+        return None
+
+    return psutil.Process().memory_info().rss
+
+
+def hash_file(file_path, chunk_size=1048576):
+    '''
+    Function that calculates the SHA-256 hash of a file by streaming it in
+    chunks, so the hash of a large pdf is calculated without reading the
+    whole file into memory or parsing any of it.
+
+    Parameters
+    ----------
+    file_path : str
+        The string representing the file path to the pdf.
+
+    chunk_size : int
+        The number of bytes read from the file at a time. By default 1 MiB.
+
+    Returns
+    -------
+    file_hash : str
+        The hexadecimal SHA-256 hash of the file.
+    '''
+    file_hash = hashlib.sha256()
+
+    with open(file_path, 'rb') as pdf_file:
+
+        for chunk in iter(lambda: pdf_file.read(chunk_size), b''):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
+
+
+class lazy_text_dict(Mapping):
+    """
+    lazy_text_dict() is a read-only mapping that contains the same keys as the
+    indexed_text_dict built by pdf.build_destination_text() but only extracts
+    the text of a pdf section the first time that section is accessed. The
+    extracted list of page strings is then stored so each section is only
+    extracted once.
+
+    Parameters
+    -----------
+    pdf_obj : pdf
+        The pdf() object whose destination_lst is used to determine the page
+        range of each section and whose pdf_plumb object is used to extract text.
+    """
+
+    def __init__(self, pdf_obj):
+
+        self.pdf_obj = pdf_obj
+
+        # Mapping each title to its destination dict, later duplicate titles
+        # overwrite earlier ones as they would in build_destination_text():
+        self.destination_map = {
+            dest_dict['Title']: dest_dict for dest_dict in pdf_obj.destination_lst}
+
+        # Dict storing the text of every section that has already been extracted:
+        self.extracted_text = {}
+
+    def __getitem__(self, key):
+
+        # Only extracting text for the section if it has not been accessed before:
+        if key not in self.extracted_text:
+
+            dest_dict = self.destination_map[key]
+
+            self.extracted_text[key] = self.pdf_obj.extract_destination_text(dest_dict)
+
+        return self.extracted_text[key]
+
+    def __contains__(self, key):
+
+        # Checking membership without triggering text extraction:
+        return key in self.destination_map
+
+    def __iter__(self):
+        return iter(self.destination_map)
+
+    def __len__(self):
+        return len(self.destination_map)
@@ -1,10 +1,18 @@
 # Importing data management packages:
 from datetime import datetime
+import os
+import time
+import hashlib
+import random
+import warnings
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Importing textual data cleaning packages:
 import string
 import re
+from functools import lru_cache
 
 # Importing natural language packages:
 import nltk
@@ -12,17 +20,113 @@ from nltk.stem import WordNetLemmatizer
 from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import textdistance
-from difflib import Differ, SequenceMatcher
 # nltk.download('wordnet')
 # nltk.download('stopwords')
 
 # Importing the pdf api:
 from . import pdf_parser as pparser # For Production
 # import pdf_parser as pparser # For Development
+from . import edit_distance
+from . import text_compression
+from . import minhash
 
 # Importing database libraries:
 import sqlite3
 
+# Bytes removed by pdf_db.clean_text(): everything outside of the printable ascii
+# range as well as all punctuation and digits, leaving only letters and spaces:
+CLEAN_TEXT_DELETE_BYTES = bytes(
+    byte for byte in range(256) if not (31 < byte < 126)
+    or chr(byte) in string.punctuation or chr(byte) in string.digits)
+
+# The warning messages of the pdf_db.get_file_status() statuses that skip a pdf:
+FILE_STATUS_MESSAGES = {
+    'duplicate': 'a byte-identical pdf is already in the database',
+    'changed': 'it has been modified since it was written to the database'}
+
+# The columns of the {ticker}_tables rows built from the normalized storage tables:
+NORMALIZED_TICKER_COLUMNS = """d.Name AS Table_name, d.Pdf_type, d.Date, m.Cosine_Similarity,
+    m.Jaccard_Similarity, m.Minimum_Edit_Distance, m.Simple_Similarity, m.Tfidf_Similarity"""
+
+# The rules pdf_db.build_pair_index() can pair each pdf with an earlier pdf by:
+PAIRING_RULES = ('previous_year', 'previous_quarter', 'nearest_prior')
+
+# The text_tokenizer shared by all pdf_db methods, created on first use:
+shared_tokenizer = None
+
+
+# Function that returns the tokenizer shared by all methods in the process:
+def get_text_tokenizer():
+    '''
+    Function that returns the text_tokenizer object shared by every pdf_db
+    method within the current process, initalizing it the first time it is
+    called so the nltk corpus is only loaded once per process.
+
+    Returns
+    -------
+    shared_tokenizer : text_tokenizer
+        The shared text_tokenizer object.
+    '''
+    global shared_tokenizer
+
+    if shared_tokenizer is None:
+        shared_tokenizer = text_tokenizer()
+
+    return shared_tokenizer
+
+
+# Class that tokenizes and lemmatizes text with a loaded corpus and lemma cache:
+class text_tokenizer(object):
+    """
+    An object that performs the tokenizing and lemmatizing of pdf_db.tokenize_text()
+    while loading the nltk stopwords and the WordNetLemmatizer only once. The
+    stopwords are stored as a frozenset for constant time lookups and the
+    lemma of each word is memoized in a bounded lru cache, as the vocabulary of
+    financial filings is highly repetitive.
+
+    Parameters
+    ----------
+    lemma_cache_size : int
+        The maximum number of word lemmas stored in the lru cache. By default
+        lemma_cache_size=100000.
+    """
+    def __init__(self, lemma_cache_size=100000):
+
+        # Loading the english stopwords corpus a single time:
+        self.stopwords = frozenset(nltk.corpus.stopwords.words('english'))
+
+        # Declaring Lemmatizer object with a memoized lemmatize method:
+        self.lemmatizer = WordNetLemmatizer()
+        self.lemmatize = lru_cache(maxsize=lemma_cache_size)(self.lemmatizer.lemmatize)
+
+        # Precompiling the regex used to split text into words:
+        self.split_regex = re.compile(r'\W+')
+
+    def tokenize(self, text):
+        '''
+        Method converts a string into a single string of tokenized and
+        lemmatized words with the stopwords removed. See pdf_db.tokenize_text().
+
+        Parameters
+        ----------
+        text : str
+            A string representing the pre-processed textual data.
+
+        Returns
+        -------
+        processed_txt : str
+            A string built from the list of processed words via the .join method.
+        '''
+        # Removing stopwords and lemmatizing the word list in a single pass:
+        processed_txt_lst = [
+            self.lemmatize(word) for word in self.split_regex.split(text)
+            if word not in self.stopwords]
+
+        # Re-converting list of strings into single string for ease of db storage:
+        processed_txt = ' '.join(processed_txt_lst)
+
+        return processed_txt
+
 # Class that represents the sqlite3 pdf db and its api:
 class pdf_db(object):
     """
@@ -37,8 +141,71 @@ class pdf_db(object):
         This is a string that represents the path to the database. This string is
         either used to establish a connection with the database or to specify the
         location where the database will be created.
+
+    build_vectors : bool
+        build_vectors determines if the token id, term frequency and token set
+        representation of every section is built and written to the
+        Section_Vectors table when a pdf is written to the database. These are
+        used by perform_sim_calculation(vectorized=True). By default
+        build_vectors=False and the representations are only built the first
+        time they are needed.
+
+    storage : str
+        Determines how the sections of each pdf are stored. With "tables" every
+        pdf is written to its own table and every ticker has a {ticker}_tables
+        table. With "normalized" all pdfs are written to the indexed documents,
+        sections and metrics tables (see create_normalized_tables()). By default
+        storage=None which uses "normalized" if the database contains a documents
+        table and "tables" otherwise. A database in the "tables" layout is
+        converted with the migrate_to_normalized() method.
+
+    compression : str
+        The codec the Section_Text of every section is compressed with when it
+        is written, either "zlib" or "zstd" (which requires the zstandard
+        package). The text is compressed with the latest dictionary trained by
+        train_compression_dict() for the codec, if any. Compressed text is
+        always decompressed transparently when it is read, whatever the value of
+        compression. By default compression=None and the text is not compressed.
+
+    compression_level : int
+        The compression level of the codec. By default the codec's default level.
+
+    search_index : bool
+        search_index determines if the sections of every pdf are added to the
+        Section_Search FTS5 full text index when the pdf is written, which is
+        queried by the search() method. The index is contentless, it only
+        stores the tokens of each section and not a second copy of its text.
+        If the sqlite library does not support FTS5 a warning is raised and
+        the index is disabled. By default search_index=None which enables the
+        index if the database already contains the Section_Search table, so it
+        is kept up to date by every later connection. With search_index=False
+        the pdfs written by the connection are left out of an existing index
+        until it is rebuilt by build_search_index().
+
+    build_minhash : bool
+        build_minhash determines if the MinHash signature of every section is
+        built and added to the LSH index used by find_similar_sections() when a
+        pdf is written to the database. By default build_minhash=False and the
+        index is built with the build_minhash_index() method.
+
+    parse_cache_path : str
+        The path of the sqlite database of a parse_cache.parse_cache() used by
+        every pdf that is parsed, including by worker processes. Reprocessing a
+        pdf that has already been parsed, eg into a new database after the text
+        cleaning has changed, then reads its outline and page text from the
+        cache instead of parsing the pdf. By default parse_cache_path=None and
+        nothing is cached.
+
+    extraction_backend : str or pdf_parser.extraction_backend
+        The backend every pdf that is parsed extracts its page text with, see
+        the backend parameter of pdf_parser.pdf(). "pypdf" is several times
+        faster than the default "plumber" at the cost of layout fidelity, which
+        matters little to the similarity metrics. By default
+        extraction_backend='plumber'.
     """
-    def __init__(self, db_path):
+    def __init__(self, db_path, build_vectors=False, storage=None, compression=None,
+        compression_level=None, search_index=None, build_minhash=False, parse_cache_path=None,
+        extraction_backend='plumber'):
         # Creating the database or Creating a connection to the database:
 
         self.con = sqlite3.connect(db_path)
@@ -62,362 +229,3010 @@ class pdf_db(object):
                     Pdf_type TEXT,
                     Date TEXT NOT NULL,
                     Path TEXT NOT NULL UNIQUE,
-                    Date_added TEXT NOT NULL)"""
+                    Date_added TEXT NOT NULL,
+                    File_hash TEXT,
+                    File_mtime REAL)"""
+                    )
+
+        # Adding the file hash columns to Summary tables created by earlier versions:
+        self.add_missing_columns('Summary', [('File_hash', 'TEXT'), ('File_mtime', 'REAL')])
+
+        # Indexing the file hashes so byte-identical pdfs are found without a scan:
+        self.c.execute("CREATE INDEX IF NOT EXISTS Summary_File_hash ON Summary (File_hash)")
+
+        # Creating the table mapping every section token to an integer id:
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS Vocabulary (
+                    Token_id INTEGER Primary Key,
+                    Token TEXT NOT NULL UNIQUE)"""
+                    )
+
+        # Creating the table storing the vector representation of each section:
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS Section_Vectors (
+                    Table_name TEXT NOT NULL,
+                    Section TEXT NOT NULL,
+                    Token_ids BLOB,
+                    Term_ids BLOB,
+                    Term_counts BLOB,
+                    PRIMARY KEY (Table_name, Section))"""
+                    )
+
+        # Creating the table storing the content hash of every pdf table:
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS Table_Hashes (
+                    Table_name TEXT Primary Key,
+                    Content_hash TEXT NOT NULL)"""
+                    )
+
+        # Creating the table recording the input hash of every computed similarity pair:
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS Sim_Pairs (
+                    Table_name TEXT Primary Key,
+                    Prev_table_name TEXT NOT NULL,
+                    Pair_hash TEXT NOT NULL,
+                    Date_computed TEXT NOT NULL)"""
+                    )
+
+        # Creating the table storing the MinHash signature of each section:
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS Section_MinHash (
+                    Table_name TEXT NOT NULL,
+                    Section TEXT NOT NULL,
+                    Signature BLOB NOT NULL,
+                    PRIMARY KEY (Table_name, Section))"""
+                    )
+
+        # Creating the LSH index of the band hashes of every signature:
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS MinHash_Bands (
+                    Band INTEGER NOT NULL,
+                    Band_hash INTEGER NOT NULL,
+                    Table_name TEXT NOT NULL,
+                    Section TEXT NOT NULL,
+                    PRIMARY KEY (Band, Band_hash, Table_name, Section)) WITHOUT ROWID"""
+                    )
+
+        self.c.execute("CREATE INDEX IF NOT EXISTS MinHash_Bands_table ON MinHash_Bands (Table_name)")
+
+        # Creating the table storing the TF-IDF cosine similarity of every pair of pdfs of a ticker:
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS Tfidf_Pairs (
+                    Ticker TEXT NOT NULL,
+                    Section TEXT,
+                    Table_name TEXT NOT NULL,
+                    Prev_table_name TEXT NOT NULL,
+                    Tfidf_Similarity REAL)"""
+                    )
+
+        self.c.execute("CREATE INDEX IF NOT EXISTS Tfidf_Pairs_ticker ON Tfidf_Pairs (Ticker, Section)")
+
+        # Creating the table storing the dictionaries used to compress Section_Text:
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS Compression_Dicts (
+                    Dict_id INTEGER Primary Key,
+                    Codec TEXT NOT NULL,
+                    Dict_data BLOB NOT NULL,
+                    Date_created TEXT NOT NULL)"""
+                    )
+
+        # Determining if the full text search index is used from the tables of an existing database:
+        if search_index is None:
+
+            search_index = self.c.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Section_Search'").fetchone() is not None
+
+        # Creating the full text search index of the sections:
+        if search_index is True:
+
+            try:
+                self.create_search_tables()
+
+            except sqlite3.OperationalError as e:
+                warnings.warn(f"The full text search index is disabled, FTS5 is not available: {e}")
+                search_index = False
+
+        self.search_index = search_index
+
+        # Determining the storage layout from the tables of an existing database:
+        if storage is None:
+
+            if self.c.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'documents'").fetchone() is None:
+                storage = 'tables'
+
+            else:
+                storage = 'normalized'
+
+        if storage not in ('tables', 'normalized'):
+            raise ValueError(f'Invalid storage: {storage}')
+
+        self.storage = storage
+
+        if self.storage == 'normalized':
+            self.create_normalized_tables()
+
+        # Commiting cursor command to database:
+        self.con.commit()
+
+        self.build_vectors = build_vectors
+        self.build_minhash = build_minhash
+        self.parse_cache_path = parse_cache_path
+
+        # Raising an error for an unknown backend before any pdf is parsed:
+        self.extraction_backend = pparser.get_backend(extraction_backend)
+
+        # Dict of the Vocabulary table, loaded the first time it is needed:
+        self.vocab_dict = None
+
+        if compression is not None:
+            text_compression.check_codec(compression)
+
+        self.compression = compression
+        self.compression_level = compression_level
+
+        # Dict of the compression dictionaries that have been loaded, keyed by Dict_id:
+        self.compression_dict_cache = {}
+
+    # Method that creates the tables of the full text search index:
+    def create_search_tables(self):
+        '''
+        Method creates the Section_Search FTS5 virtual table, which indexes the
+        title and text of every section with the porter stemming tokenizer, and
+        the Search_Sections table storing the pdf, ticker, pdf type, date and
+        page range of each indexed section under the same rowid. Keeping these
+        in an ordinary table allows them to be indexed for filtering and for
+        removing a pdf from the search index.
+
+        Section_Search is a contentless table, so the (possibly compressed)
+        Section_Text is not stored a second time. An index created by earlier
+        versions with a content table is dropped with a warning and has to be
+        rebuilt with build_search_index().
+        '''
+        # Dropping an index that stores a copy of the text of every section:
+        if self.c.execute(
+            """SELECT 1 FROM sqlite_master WHERE type = 'table'
+            AND name = 'Section_Search_content'""").fetchone() is not None:
+
+            warnings.warn(
+                "Dropping the Section_Search index storing a copy of the section text, "
+                "rebuild it with build_search_index()")
+
+            self.c.execute("DROP TABLE Section_Search")
+            self.c.execute("DROP TABLE IF EXISTS Search_Sections")
+
+        self.c.execute(
+            """CREATE VIRTUAL TABLE IF NOT EXISTS Section_Search USING fts5(
+                    Section,
+                    Section_Text,
+                    content = '',
+                    tokenize = 'porter unicode61')"""
                     )
 
-        # Commiting cursor command to database:
-        self.con.commit()
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS Search_Sections (
+                    Search_id INTEGER Primary Key,
+                    Table_name TEXT NOT NULL,
+                    Ticker TEXT,
+                    Pdf_type TEXT,
+                    Date TEXT,
+                    Section TEXT NOT NULL,
+                    Start_Page INTEGER,
+                    End_Page INTEGER)"""
+                    )
+
+        self.c.execute(
+            "CREATE INDEX IF NOT EXISTS Search_Sections_table ON Search_Sections (Table_name)")
+
+        self.c.execute(
+            "CREATE INDEX IF NOT EXISTS Search_Sections_ticker_type ON Search_Sections (Ticker, Pdf_type)")
+
+    # Method that creates the tables of the normalized storage layout:
+    def create_normalized_tables(self):
+        '''
+        Method creates the tables of the normalized storage layout if they do
+        not exist. Instead of a table per pdf and per ticker, every pdf is a row
+        of the documents table, every section a row of the sections table and
+        every similarity result a row of the metrics table. A metrics row with a
+        NULL Section holds the metrics of the full pdf. Queries across pdfs and
+        tickers are then indexed joins instead of dynamic sql over thousands of
+        tables.
+        '''
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS documents (
+                    Document_id INTEGER Primary Key,
+                    Name TEXT NOT NULL UNIQUE,
+                    Ticker TEXT,
+                    Pdf_type TEXT,
+                    Date TEXT NOT NULL,
+                    FOREIGN KEY (Name) REFERENCES Summary (Name))"""
+                    )
+
+        self.c.execute(
+            """CREATE INDEX IF NOT EXISTS documents_ticker_type_date
+            ON documents (Ticker, Pdf_type, Date)""")
+
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS sections (
+                    Section_id INTEGER Primary Key,
+                    Document_id INTEGER NOT NULL,
+                    Section TEXT NOT NULL,
+                    Start_Page INTEGER,
+                    End_Page INTEGER,
+                    Section_Text TEXT,
+                    FOREIGN KEY (Document_id) REFERENCES documents (Document_id))"""
+                    )
+
+        self.c.execute(
+            """CREATE UNIQUE INDEX IF NOT EXISTS sections_document_section
+            ON sections (Document_id, Section)""")
+
+        self.c.execute(
+            """CREATE TABLE IF NOT EXISTS metrics (
+                    Document_id INTEGER NOT NULL,
+                    Section TEXT,
+                    Cosine_Similarity REAL,
+                    Jaccard_Similarity REAL,
+                    Minimum_Edit_Distance REAL,
+                    Simple_Similarity REAL,
+                    Tfidf_Similarity REAL,
+                    FOREIGN KEY (Document_id) REFERENCES documents (Document_id))"""
+                    )
+
+        self.add_missing_columns('metrics', [('Tfidf_Similarity', 'REAL')])
+
+        # One metrics row per section and a single full pdf (NULL Section) row per document:
+        self.c.execute(
+            """CREATE UNIQUE INDEX IF NOT EXISTS metrics_document_section
+            ON metrics (Document_id, Section)""")
+
+        self.c.execute(
+            """CREATE UNIQUE INDEX IF NOT EXISTS metrics_document
+            ON metrics (Document_id) WHERE Section IS NULL""")
+
+    # Method that adds the columns missing from a table created by an earlier version:
+    def add_missing_columns(self, table_name, column_lst):
+        '''
+        Method adds every column of column_lst that a table does not have with
+        ALTER TABLE, so tables created by earlier versions of the package gain
+        the columns of the current schema.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the table.
+
+        column_lst : list
+            A list of (column_name, column_type) tuples.
+        '''
+        table_columns = [column[1] for column in self.c.execute(f"PRAGMA table_info({table_name})")]
+
+        for column_name, column_type in column_lst:
+
+            if column_name not in table_columns:
+                self.c.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
+
+    # Method that converts a database from the table per pdf layout to the normalized layout:
+    def migrate_to_normalized(self, drop_tables=False):
+        '''
+        Method copies every pdf table listed in the Summary table, and the metrics
+        of the {ticker}_tables tables, into the documents, sections and metrics
+        tables of the normalized storage layout inside a single transaction. The
+        pdf_db object uses the normalized layout afterwards, as does any pdf_db
+        opened on the database with storage=None. Pdfs already in the documents
+        table are not copied again, so an interrupted migration can be rerun.
+
+        Parameters
+        ----------
+        drop_tables : bool
+            If True the pdf tables and {ticker}_tables tables are dropped once
+            they have been copied. By default drop_tables=False.
+
+        Returns
+        -------
+        migrate_stats : dict
+            A dictionary containing the number of documents and sections copied.
+        '''
+        migrate_stats = {'documents': 0, 'sections': 0}
+
+        table_set = {
+            row[0] for row in self.c.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+        if self.con.in_transaction:
+            self.con.commit()
+
+        self.c.execute("BEGIN")
+
+        try:
+            self.create_normalized_tables()
+
+            summary_rows = self.c.execute(
+                """SELECT Name, Ticker, Pdf_type, Date FROM Summary
+                WHERE Name NOT IN (SELECT Name FROM documents) ORDER BY rowid""").fetchall()
+
+            for (table_name, ticker, pdf_type, pdf_date) in summary_rows:
+
+                # Pdfs whose table was never written are not copied:
+                if table_name not in table_set:
+                    continue
+
+                self.c.execute(
+                    "INSERT INTO documents (Name, Ticker, Pdf_type, Date) VALUES (?, ?, ?, ?)",
+                    (table_name, ticker, pdf_type, pdf_date))
+
+                document_id = self.c.lastrowid
+
+                self.c.execute(
+                    f"""INSERT INTO sections (Document_id, Section, Start_Page, End_Page, Section_Text)
+                    SELECT ?, Section, Start_Page, End_Page, Section_Text FROM {table_name}
+                    ORDER BY rowid""", (document_id,))
+
+                migrate_stats['sections'] += self.c.rowcount
+
+                self.c.execute(
+                    f"""INSERT INTO metrics (Document_id, Section, Cosine_Similarity,
+                    Jaccard_Similarity, Minimum_Edit_Distance, Simple_Similarity)
+                    SELECT ?, Section, Cosine_Similarity,
+                    Jaccard_Similarity, Minimum_Edit_Distance, Simple_Similarity
+                    FROM {table_name} WHERE Cosine_Similarity IS NOT NULL
+                    OR Jaccard_Similarity IS NOT NULL OR Minimum_Edit_Distance IS NOT NULL
+                    OR Simple_Similarity IS NOT NULL""", (document_id,))
+
+                # Copying the full pdf metrics from the ticker table:
+                ticker_table = f'{ticker}_tables'
+
+                if ticker_table in table_set:
+
+                    # Ticker tables built by earlier versions have no Tfidf_Similarity column:
+                    self.add_missing_columns(ticker_table, [('Tfidf_Similarity', 'REAL')])
+
+                    self.c.execute(
+                        f"""INSERT INTO metrics (Document_id, Section, Cosine_Similarity,
+                        Jaccard_Similarity, Minimum_Edit_Distance, Simple_Similarity, Tfidf_Similarity)
+                        SELECT ?, NULL, Cosine_Similarity,
+                        Jaccard_Similarity, Minimum_Edit_Distance, Simple_Similarity, Tfidf_Similarity
+                        FROM {ticker_table} WHERE Table_name = ? AND (Cosine_Similarity IS NOT NULL
+                        OR Jaccard_Similarity IS NOT NULL OR Minimum_Edit_Distance IS NOT NULL
+                        OR Simple_Similarity IS NOT NULL OR Tfidf_Similarity IS NOT NULL)""",
+                        (document_id, table_name))
+
+                migrate_stats['documents'] += 1
+
+            if drop_tables is True:
+
+                for (table_name, ticker) in self.c.execute(
+                    "SELECT Name, Ticker FROM documents").fetchall():
+
+                    # The ticker tables reference the pdf tables so they are dropped first:
+                    if f'{ticker}_tables' in table_set:
+                        self.c.execute(f"DROP TABLE {ticker}_tables")
+                        table_set.discard(f'{ticker}_tables')
+
+                    if table_name in table_set:
+                        self.c.execute(f"DROP TABLE {table_name}")
+                        table_set.discard(table_name)
+
+            self.con.commit()
+
+        except:
+            self.rollback()
+            raise
+
+        self.storage = 'normalized'
+
+        return migrate_stats
+
+# <-----------------------------Database Writing Methods------------------------>
+    # Method that writes a single pdf to the database:
+    def pdf_to_db(self, pdf_path, table_name, pdf_type, pdf_date, ticker):
+        '''
+        The method makes use of the pdf_parser api to write the generated key-value
+        dict to the sqlite dictionary with the extracted strings cleaned for nlp
+        processing by the .clean_text() and .tokenize_text() methods.
+
+        Parameters
+        ----------
+        pdf_path : str
+            A string representing the path to the pdf file that will be initalized.
+
+        table_name : str
+            A string that represents the title of the sqlite database that the data
+            will be read into.
+
+        pdf_type : str
+            A string representing the category that the pdf is a part of. Eg: "10_K".
+
+        pdf_date : str
+            A string that indicates the date relevant to the pdf being uploaded
+            to the database. This MUST be a full date in the form of dd/mm/yyyy.
+
+        ticker : str
+            A string that represents the ticker symbol associated with the pdf being
+            read to the database. This ticker will be written to the Summary table.
+
+        Returns
+        -------
+        pdf_written : bool
+            True if the pdf was written to the database, False if it was skipped
+            because it has already been ingested (see get_file_status()).
+        '''
+        # Checking if the pdf has already been ingested before parsing any of it:
+        (file_status, file_hash, file_mtime) = self.get_file_status(pdf_path)
+
+        if file_status != 'new':
+
+            if file_status != 'ingested':
+                warnings.warn(f"Skipping {pdf_path}, {FILE_STATUS_MESSAGES[file_status]}")
+
+            self.con.commit()
+            return False
+
+        # Initalzing the pdf parsing object without extracting any text:
+        with pparser.pdf(pdf_path, lazy=True, cache=self.parse_cache_path,
+            backend=self.extraction_backend) as pdf_parser:
+
+            # Streaming the cleaned section rows to the table one section at a time:
+            section_rows = pdf_db.iter_section_rows(pdf_parser)
+
+            # Writing the section rows and the Summary row to the database:
+            try:
+                self.write_pdf_rows(pdf_path, table_name, pdf_type, pdf_date, ticker, section_rows,
+                    file_hash=file_hash, file_mtime=file_mtime)
+
+            # Undoing a partially written pdf so it is not seen as ingested:
+            except:
+                self.rollback()
+                raise
+
+        # Commiting all changes to database:
+        self.con.commit()
+
+        return True
+
+    # Method that writes many pdfs to the database in batched transactions:
+    def pdfs_to_db(self, pdf_specs, batch_size=50, journal_mode=None, synchronous=None,
+        workers=None):
+        '''
+        The bulk version of the pdf_to_db() method. Each pdf is parsed and cleaned
+        in the same way, but the section rows of a whole batch of pdfs are written
+        with executemany() inside a single explicit transaction, removing the
+        per-row and per-file commit overhead when loading large numbers of pdfs.
+
+        Pdfs that have already been ingested, either from the same path or as a
+        byte-identical file, are skipped before they are parsed (see
+        get_file_status()). Pdfs that cannot be parsed or that cannot be written
+        are skipped with a warning instead of aborting the batch.
+
+        Parameters
+        ----------
+        pdf_specs : iterable
+            An iterable of pdf specifications. Each specification is either a
+            dict with the keys {pdf_path, table_name, pdf_type, pdf_date, ticker}
+            or a tuple of these values in the same order as the parameters of
+            the pdf_to_db() method.
+
+        batch_size : int
+            The number of pdfs written to the database in each transaction.
+            By default batch_size=50.
+
+        journal_mode : str
+            The sqlite journal_mode pragma set while writing, eg "WAL". If None
+            the pragma is not modified. By default journal_mode=None.
+
+        synchronous : str
+            The sqlite synchronous pragma set while writing. "NORMAL" is only
+            safe from corruption on power loss with journal_mode="WAL". If None
+            the pragma is not modified. By default synchronous=None.
+
+        Both pragmas are restored to their previous values once the pdfs have
+        been written.
+
+        workers : int
+            The number of processes used to parse and clean the pdfs. The parsed
+            section rows are sent back to this process which is the only one
+            writing to the database. By default workers=None and all pdfs are
+            parsed in the current process.
+
+        Returns
+        -------
+        ingest_stats : dict
+            A dictionary containing the number of pdfs and rows written, the
+            list of skipped pdf paths, the lists of already ingested and duplicate
+            pdf paths, the runtime in seconds and the rows/sec.
+        '''
+        # Recording the pragmas of the connection so they are restored afterwards:
+        previous_pragmas = self.set_pragmas(journal_mode=journal_mode, synchronous=synchronous)
+
+        try:
+            ingest_stats = {'pdfs': 0, 'rows': 0, 'skipped': [], 'already_ingested': [],
+                'duplicates': [], 'seconds': 0.0, 'rows_per_sec': 0.0}
+            start_time = time.perf_counter()
+
+            # Converting tuple specifications into the dict format:
+            pdf_specs = (
+                pdf_spec if isinstance(pdf_spec, dict) else dict(zip(
+                    ('pdf_path', 'table_name', 'pdf_type', 'pdf_date', 'ticker'), pdf_spec))
+                for pdf_spec in pdf_specs)
+
+            # Removing the pdfs that have already been ingested before they are parsed:
+            pdf_specs = self.filter_new_pdf_specs(pdf_specs, ingest_stats)
+
+            # List of parsed pdfs in the current batch:
+            batch_lst = []
+
+            # Parsing the pdfs outside of the transaction so the write lock is held briefly:
+            for pdf_spec, section_rows in pdf_db.parse_pdf_specs(
+                pdf_specs, workers, self.parse_cache_path, self.extraction_backend):
+
+                # The pdf could not be parsed, section_rows is the raised exception:
+                if isinstance(section_rows, Exception):
+                    warnings.warn(f"Skipping {pdf_spec['pdf_path']}, it could not be parsed: {section_rows}")
+                    ingest_stats['skipped'].append(pdf_spec['pdf_path'])
+                    continue
+
+                batch_lst.append((pdf_spec, section_rows))
+
+                if len(batch_lst) >= batch_size:
+                    self.write_pdf_batch(batch_lst, ingest_stats)
+                    batch_lst = []
+
+            # Writing the final partial batch:
+            if len(batch_lst) > 0:
+                self.write_pdf_batch(batch_lst, ingest_stats)
+
+            # Calculating the ingestion throughput:
+            ingest_stats['seconds'] = time.perf_counter() - start_time
+
+            if ingest_stats['seconds'] > 0:
+                ingest_stats['rows_per_sec'] = ingest_stats['rows'] / ingest_stats['seconds']
+
+        finally:
+            self.set_pragmas(**previous_pragmas)
+
+        return ingest_stats
+
+    # Method that writes every pdf in a directory to the database:
+    def ingest_directory(self, dir_path, build_spec, workers=None, **kwargs):
+        '''
+        Method writes every pdf file in a directory to the database using the
+        pdfs_to_db() method. Parsing the pdfs and cleaning their text takes up
+        nearly all of the runtime and is independent for each file, so it is
+        spread across a pool of worker processes while the finished section rows
+        are streamed back to the single sqlite connection of this object.
+
+        Parameters
+        ----------
+        dir_path : str
+            The path to the directory containing the pdf files.
+
+        build_spec : function
+            A function that takes the path to a pdf file and returns a dict with
+            the keys {table_name, pdf_type, pdf_date, ticker} for said pdf. If
+            it returns None the pdf is not ingested.
+
+        workers : int
+            The number of processes used to parse and clean the pdfs. By default
+            workers=None which uses the number of cpus of the machine.
+
+        **kwargs
+            Additional keyword arguments passed to pdfs_to_db(), eg batch_size.
+
+        Returns
+        -------
+        ingest_stats : dict
+            The dictionary of ingestion statistics returned by pdfs_to_db().
+        '''
+        if workers is None:
+            workers = os.cpu_count()
+
+        # Building the sorted list of all pdf files in the directory:
+        pdf_path_lst = sorted(
+            os.path.join(dir_path, file_name) for file_name in os.listdir(dir_path)
+            if file_name.lower().endswith('.pdf'))
+
+        pdf_specs = []
+        for pdf_path in pdf_path_lst:
+
+            pdf_spec = build_spec(pdf_path)
+
+            if pdf_spec is not None:
+                pdf_specs.append(dict(pdf_spec, pdf_path=pdf_path))
+
+        return self.pdfs_to_db(pdf_specs, workers=workers, **kwargs)
+
+    # Method that checks if a pdf file has already been written to the database:
+    def get_file_status(self, pdf_path):
+        '''
+        Method determines if a pdf file has already been ingested without parsing
+        it. If the Summary table contains the path with the same modification
+        time the pdf is considered ingested without reading the file. Otherwise
+        the SHA-256 hash of the file is streamed and compared to the File_hash
+        column of the Summary table, which detects byte-identical pdfs stored
+        under any path. A path whose stored modification time is outdated but
+        whose content is unchanged has its modification time updated, so the
+        next check is again free.
+
+        The method does not commit, this is left to the calling method.
+
+        Parameters
+        ----------
+        pdf_path : str
+            A string representing the path to the pdf file.
+
+        Returns
+        -------
+        file_status : tuple
+            A (status, file_hash, file_mtime) tuple. status is one of 'new',
+            'ingested' (the path has already been written), 'duplicate' (a
+            byte-identical pdf has been written under another path) or 'changed'
+            (the path has been written but the file has since been modified).
+            file_hash is None if the file did not need to be hashed.
+        '''
+        file_mtime = os.path.getmtime(pdf_path)
+
+        summary_row = self.c.execute(
+            "SELECT File_hash, File_mtime FROM Summary WHERE Path = ?", (pdf_path,)).fetchone()
+
+        # The path has been written and the file has not been modified since:
+        if summary_row is not None and summary_row[1] == file_mtime:
+            return ('ingested', summary_row[0], file_mtime)
+
+        file_hash = pparser.hash_file(pdf_path)
+
+        if summary_row is not None:
+
+            # Rows written by earlier versions have no hash, the path is trusted:
+            if summary_row[0] is None or summary_row[0] == file_hash:
+                self.c.execute(
+                    "UPDATE Summary SET File_hash = ?, File_mtime = ? WHERE Path = ?",
+                    (file_hash, file_mtime, pdf_path))
+
+                return ('ingested', file_hash, file_mtime)
+
+            return ('changed', file_hash, file_mtime)
+
+        # Searching for a byte-identical pdf written under another path:
+        if self.c.execute(
+            "SELECT 1 FROM Summary WHERE File_hash = ? LIMIT 1", (file_hash,)).fetchone() is not None:
+            return ('duplicate', file_hash, file_mtime)
+
+        return ('new', file_hash, file_mtime)
+
+    # Method that removes already ingested pdfs from an iterable of pdf specifications:
+    def filter_new_pdf_specs(self, pdf_specs, ingest_stats):
+        '''
+        Generator used by pdfs_to_db() that checks every pdf specification with
+        get_file_status() and only yields the pdfs that have not been ingested.
+        Repeated paths within the pdf_specs themselves are also only yielded
+        once. Byte-identical copies within the pdf_specs are all yielded, as the
+        first copy may still fail to be parsed or written, and are skipped by
+        write_pdf_batch() once one of them has been written. The file hash and
+        modification time are added to each yielded specification so they are
+        not calculated again.
+
+        Parameters
+        ----------
+        pdf_specs : iterable
+            An iterable of dict pdf specifications.
+
+        ingest_stats : dict
+            The dictionary of ingestion statistics that is updated in place.
+
+        Yields
+        ------
+        pdf_spec : dict
+            The specification of a pdf that has not been ingested.
+        '''
+        # The paths of the pdfs already yielded by this generator:
+        yielded_paths = set()
+
+        for pdf_spec in pdf_specs:
+
+            pdf_path = pdf_spec['pdf_path']
+
+            try:
+                (file_status, file_hash, file_mtime) = self.get_file_status(pdf_path)
+
+            except OSError as e:
+                warnings.warn(f"Skipping {pdf_path}, it could not be read: {e}")
+                ingest_stats['skipped'].append(pdf_path)
+                continue
+
+            if file_status == 'new' and pdf_path in yielded_paths:
+                file_status = 'ingested'
+
+            if file_status == 'ingested':
+                ingest_stats['already_ingested'].append(pdf_path)
+                continue
+
+            if file_status == 'duplicate':
+                ingest_stats['duplicates'].append(pdf_path)
+                continue
+
+            if file_status == 'changed':
+                warnings.warn(f"Skipping {pdf_path}, {FILE_STATUS_MESSAGES[file_status]}")
+                ingest_stats['skipped'].append(pdf_path)
+                continue
+
+            yielded_paths.add(pdf_path)
+
+            yield dict(pdf_spec, file_hash=file_hash, file_mtime=file_mtime)
+
+    # Method that writes a batch of parsed pdfs inside a single transaction:
+    def write_pdf_batch(self, batch_lst, ingest_stats):
+        '''
+        Method writes a list of parsed pdfs to the database inside one explicit
+        transaction and updates the ingest_stats dict of the pdfs_to_db() method.
+        Each pdf is written inside a savepoint, so a pdf that raises an
+        sqlite3.IntegrityError is rolled back on its own and skipped, and the
+        rest of the batch is still committed. A pdf that is byte-identical to a
+        pdf written earlier, including earlier in the same batch, is skipped as
+        a duplicate.
+
+        Parameters
+        ----------
+        batch_lst : list
+            A list of (pdf_spec, section_rows) tuples where pdf_spec is the dict
+            specification of the pdf and section_rows is the list of rows built
+            by the build_section_rows() method.
+
+        ingest_stats : dict
+            The dictionary of ingestion statistics that is updated in place.
+        '''
+        # Ending any implicitly opened transaction before beginning the batch:
+        if self.con.in_transaction:
+            self.con.commit()
+
+        self.c.execute("BEGIN")
+
+        try:
+            for pdf_spec, section_rows in batch_lst:
+
+                # Skipping a copy of a pdf that has been written since it was yielded by filter_new_pdf_specs():
+                if self.c.execute("SELECT 1 FROM Summary WHERE File_hash = ? LIMIT 1",
+                    (pdf_spec['file_hash'],)).fetchone() is not None:
+
+                    ingest_stats['duplicates'].append(pdf_spec['pdf_path'])
+                    continue
+
+                self.c.execute("SAVEPOINT write_pdf")
+
+                try:
+                    self.write_pdf_rows(section_rows=section_rows, **pdf_spec)
+
+                # Undoing everything the pdf had written so it is not seen as ingested:
+                except sqlite3.IntegrityError as e:
+
+                    self.c.execute("ROLLBACK TO write_pdf")
+                    self.c.execute("RELEASE write_pdf")
+
+                    # The Vocabulary may hold tokens that were rolled back:
+                    self.vocab_dict = None
+
+                    warnings.warn(f"Skipping {pdf_spec['pdf_path']}, it could not be written: {e}")
+                    ingest_stats['skipped'].append(pdf_spec['pdf_path'])
+                    continue
+
+                self.c.execute("RELEASE write_pdf")
+
+                ingest_stats['pdfs'] += 1
+                ingest_stats['rows'] += len(section_rows)
+
+            self.con.commit()
+
+        except:
+            self.rollback()
+            raise
+
+    # Method that writes the section rows and Summary row of a single pdf:
+    def write_pdf_rows(self, pdf_path, table_name, pdf_type, pdf_date, ticker, section_rows,
+        file_hash=None, file_mtime=None):
+        '''
+        Method creates the table of a pdf if it does not exist and writes the
+        section rows built by build_section_rows() to it using executemany(). It
+        then writes the logging/meta-data of the pdf to the Summary table. The
+        Summary row is written first so that a pdf already in the database raises
+        an sqlite3.IntegrityError before any section rows are written.
+
+        The method does not commit, this is left to the calling method.
+
+        Parameters
+        ----------
+        pdf_path : str
+            A string representing the path to the pdf file.
+
+        table_name : str
+            A string that represents the title of the sqlite database table that
+            the data will be read into.
+
+        pdf_type : str
+            A string representing the category that the pdf is a part of. Eg: "10_K".
+
+        pdf_date : str
+            A string in the form of dd/mm/yyyy that indicates the date of the pdf.
+
+        ticker : str
+            A string that represents the ticker symbol associated with the pdf.
+
+        section_rows : iterable
+            An iterable of (section, start_page, end_page, section_text) tuples.
+            If it is a generator the rows are written as they are generated.
+
+        file_hash : str
+            The SHA-256 hash of the pdf file. If None it is calculated.
+
+        file_mtime : float
+            The modification time of the pdf file. If None it is read from the file.
+        '''
+        # Building variables to be written to the Summary logging table:
+        date_written = datetime.date(datetime.now())
+
+        if file_hash is None:
+            file_hash = pparser.hash_file(pdf_path)
+
+        if file_mtime is None:
+            file_mtime = os.path.getmtime(pdf_path)
+
+        # Writing the logging/summary data to the summary database table:
+        self.c.execute(
+            """INSERT INTO Summary (Name, Ticker, Pdf_type, Date, Path, Date_added, File_hash, File_mtime)
+            VALUES (:name, :ticker, :pdf_type, :date, :path, :date_written, :file_hash, :file_mtime)""",
+                {'name': table_name, 'ticker': ticker, 'pdf_type':pdf_type,
+                 'date': pdf_date, 'path': pdf_path, 'date_written': date_written,
+                 'file_hash': file_hash, 'file_mtime': file_mtime}
+                )
+
+        # Hashing the sections as they are written so the pdf is not read back, the
+        # text of each section is only kept if a derived representation is built:
+        section_state = {'table_hash': hashlib.sha256(), 'section_names': set(),
+            'duplicates': False, 'section_dict': None}
+
+        if self.build_vectors is True or self.search_index is True or self.build_minhash is True:
+            section_state['section_dict'] = {}
+
+        section_rows = pdf_db.track_section_rows(section_rows, section_state)
+
+        # Compressing the Section_Text of each row as it is written:
+        if self.compression is not None:
+            section_rows = self.compress_section_rows(section_rows)
+
+        # Writing the sections to the shared normalized tables:
+        if self.storage == 'normalized':
+
+            self.c.execute(
+                "INSERT INTO documents (Name, Ticker, Pdf_type, Date) VALUES (?, ?, ?, ?)",
+                (table_name, ticker, pdf_type, pdf_date))
+
+            document_id = self.c.lastrowid
+
+            # Inserting every section, the last section of any duplicate section titles is kept:
+            self.c.executemany(
+                """INSERT OR REPLACE INTO sections (Document_id, Section, Start_Page, End_Page, Section_Text)
+                VALUES (?, ?, ?, ?, ?)""",
+                ((document_id,) + tuple(section_row) for section_row in section_rows))
+
+        else:
+            self.write_table_rows(table_name, section_rows)
+
+        # Recording the content hash of the table so changed pdfs can be detected. A
+        # duplicate section title replaces the earlier row, changing the order the
+        # sections are hashed in, so the rows that were kept are read back instead:
+        if section_state['duplicates'] is True:
+            self.update_table_hash(table_name)
+
+        else:
+            self.update_table_hash(table_name, section_state['table_hash'].hexdigest())
+
+        section_dict = section_state['section_dict']
+
+        # Building the vector representation of each section that was written:
+        if self.build_vectors is True:
+            self.build_section_vectors(table_name, {
+                section_name: section_text
+                for section_name, (start_page, end_page, section_text) in section_dict.items()})
+
+        # Adding the sections to the full text search index:
+        if self.search_index is True:
+            self.index_sections(table_name, ticker, pdf_type, pdf_date, [
+                (section_name, start_page, end_page, section_text)
+                for section_name, (start_page, end_page, section_text) in section_dict.items()])
+
+        # Adding the MinHash signature of each section to the LSH index:
+        if self.build_minhash is True:
+            self.build_section_minhashes(table_name, {
+                section_name: section_text
+                for section_name, (start_page, end_page, section_text) in section_dict.items()})
+
+    # Method that builds the MinHash signatures of a pdf table's sections:
+    def build_section_minhashes(self, table_name, section_dict=None):
+        '''
+        Method builds the MinHash signature of the word shingles of every section
+        of a pdf with text (see the minhash module), writes it to the
+        Section_MinHash table and adds its band hashes to the MinHash_Bands LSH
+        index, replacing any signatures of the pdf that were already written.
+        The method does not commit, this is left to the calling method.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the pdf table whose sections are hashed.
+
+        section_dict : dict
+            The Section_Text of each section keyed by the Section title, as it
+            is written by write_pdf_rows(). By default section_dict=None and the
+            sections are read from the database.
+        '''
+        if section_dict is None:
+            section_dict = self.get_section_texts(table_name)
+
+        self.c.execute("DELETE FROM Section_MinHash WHERE Table_name = ?", (table_name,))
+        self.c.execute("DELETE FROM MinHash_Bands WHERE Table_name = ?", (table_name,))
+
+        signature_rows = []
+        band_rows = []
+        for section_name, section_text in section_dict.items():
+
+            shingle_hashes = minhash.build_shingle_hashes(section_text or '')
+
+            # Sections without any words have no signature:
+            if len(shingle_hashes) == 0:
+                continue
+
+            signature = minhash.build_signature(shingle_hashes)
+
+            signature_rows.append((table_name, section_name, signature.tobytes()))
+            band_rows.extend(
+                (band, band_hash, table_name, section_name)
+                for band, band_hash in enumerate(minhash.build_band_hashes(signature)))
+
+        self.c.executemany("INSERT INTO Section_MinHash VALUES (?, ?, ?)", signature_rows)
+        self.c.executemany("INSERT INTO MinHash_Bands VALUES (?, ?, ?, ?)", band_rows)
+
+    # Method that builds the MinHash signatures of every pdf in the database:
+    def build_minhash_index(self, table_names=None):
+        '''
+        Method builds the MinHash signatures and LSH index of the sections of
+        every pdf that does not have them yet, inside a single transaction. It is
+        only needed for pdfs written with build_minhash=False.
+
+        Parameters
+        ----------
+        table_names : list
+            The names of the pdfs to build the signatures of. By default every
+            pdf without signatures.
+
+        Returns
+        -------
+        num_signatures : int
+            The number of signatures in the Section_MinHash table.
+        '''
+        if table_names is None:
+
+            hashed_set = {
+                row[0] for row in self.c.execute("SELECT DISTINCT Table_name FROM Section_MinHash")}
+
+            table_names = [
+                table_name for table_name in self.get_table_names() if table_name not in hashed_set]
+
+        if self.con.in_transaction:
+            self.con.commit()
+
+        self.c.execute("BEGIN")
+
+        try:
+            for table_name in table_names:
+                self.build_section_minhashes(table_name)
+
+            self.con.commit()
+
+        except:
+            self.rollback()
+            raise
+
+        num_signatures = self.c.execute("SELECT COUNT(*) FROM Section_MinHash").fetchone()[0]
+
+        return num_signatures
+
+    # Method that adds the sections of a pdf to the full text search index:
+    def index_sections(self, table_name, ticker, pdf_type, pdf_date, section_rows=None):
+        '''
+        Method writes every section of a pdf with text to the Section_Search full
+        text index, replacing any sections of the pdf that were already indexed.
+        The method does not commit, this is left to the calling method.
+
+        As the index is contentless the tokens of replaced sections cannot be
+        removed from it. Their Search_Sections rows are deleted so they are no
+        longer returned by search(), and they are removed from the index the
+        next time it is rebuilt by build_search_index().
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the pdf table.
+
+        ticker : str
+            The ticker symbol of the pdf.
+
+        pdf_type : str
+            The category of the pdf. Eg: "10_K".
+
+        pdf_date : str
+            The date of the pdf in the form of dd/mm/yyyy.
+
+        section_rows : list
+            The (section, start_page, end_page, section_text) rows of the pdf
+            with their text uncompressed, as they are written by
+            write_pdf_rows(). By default section_rows=None and the rows are read
+            from the database.
+        '''
+        # Removing the previously indexed sections of the pdf from the search results:
+        self.c.execute("DELETE FROM Search_Sections WHERE Table_name = ?", (table_name,))
+
+        if section_rows is None:
+            section_rows = [
+                (section_name, start_page, end_page, self.decompress_section_text(section_text))
+                for (section_name, start_page, end_page, section_text) in self.get_section_rows(
+                    table_name, 'Section, Start_Page, End_Page, Section_Text')]
+
+        section_rows = [section_row for section_row in section_rows if section_row[3] is not None]
+
+        # The ids of the new sections follow both tables, so the tokens of a
+        # removed section are never attached to a new one:
+        last_search_id = max(
+            self.c.execute("SELECT COALESCE(MAX(Search_id), 0) FROM Search_Sections").fetchone()[0],
+            (self.c.execute(
+                "SELECT rowid FROM Section_Search ORDER BY rowid DESC LIMIT 1").fetchone() or (0,))[0])
+
+        search_ids = range(last_search_id + 1, last_search_id + 1 + len(section_rows))
+
+        self.c.executemany(
+            """INSERT INTO Search_Sections
+            (Search_id, Table_name, Ticker, Pdf_type, Date, Section, Start_Page, End_Page)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            ((search_id, table_name, ticker, pdf_type, pdf_date, section_name, start_page, end_page)
+            for search_id, (section_name, start_page, end_page, section_text)
+            in zip(search_ids, section_rows)))
+
+        self.c.executemany(
+            "INSERT INTO Section_Search (rowid, Section, Section_Text) VALUES (?, ?, ?)",
+            ((search_id, section_name, section_text)
+            for search_id, (section_name, start_page, end_page, section_text)
+            in zip(search_ids, section_rows)))
+
+    # Method that adds every pdf in the database to the full text search index:
+    def build_search_index(self):
+        '''
+        Method rebuilds the full text search index from every pdf in the
+        database inside a single transaction. It is needed for pdfs written
+        before the index existed or with search_index=False, and removes the
+        tokens of sections that have been replaced from the index.
+
+        Returns
+        -------
+        num_sections : int
+            The number of sections in the search index.
+        '''
+        if self.search_index is not True:
+            raise sqlite3.OperationalError('The full text search index is disabled')
+
+        table_set = set(self.get_table_names())
+
+        if self.con.in_transaction:
+            self.con.commit()
+
+        self.c.execute("BEGIN")
+
+        try:
+            # Emptying the index, the only way to remove rows from a contentless table:
+            self.c.execute("INSERT INTO Section_Search (Section_Search) VALUES ('delete-all')")
+            self.c.execute("DELETE FROM Search_Sections")
+
+            for (table_name, ticker, pdf_type, pdf_date) in self.c.execute(
+                "SELECT Name, Ticker, Pdf_type, Date FROM Summary ORDER BY rowid").fetchall():
+
+                if table_name in table_set:
+                    self.index_sections(table_name, ticker, pdf_type, pdf_date)
+
+            self.con.commit()
+
+        except:
+            self.rollback()
+            raise
+
+        num_sections = self.c.execute("SELECT COUNT(*) FROM Search_Sections").fetchone()[0]
+
+        return num_sections
+
+    # Method that writes the section rows of a pdf to its own table:
+    def write_table_rows(self, table_name, section_rows):
+        '''
+        Method creates the table of a pdf if it does not exist and writes the
+        section rows to it using executemany(). This is how the sections are
+        stored when storage="tables". The method does not commit, this is left
+        to the calling method.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the pdf table.
+
+        section_rows : iterable
+            An iterable of (section, start_page, end_page, section_text) tuples.
+        '''
+        # Creating the table:
+        self.c.execute(
+            f"""CREATE TABLE IF NOT EXISTS {table_name} (
+                Section TEXT Primary Key,
+                Start_Page INTEGER,
+                End_Page INTEGER,
+                Section_Text TEXT,
+                Cosine_Similarity REAL,
+                Jaccard_Similarity REAL,
+                Minimum_Edit_Distance REAL,
+                Simple_Similarity REAL
+                )"""
+                    )
+
+        # Inserting every section of the indexed pdf content to table, the last
+        # section of any duplicate section titles is kept:
+        self.c.executemany(
+            f"""
+            INSERT OR REPLACE INTO {table_name} (Section, Start_Page, End_Page, Section_Text)
+            VALUES (?, ?, ?, ?)""", section_rows)
+
+    # Method that calculates and stores the content hash of a pdf table:
+    def update_table_hash(self, table_name, content_hash=None):
+        '''
+        Method calculates the SHA-256 hash of the Section and Section_Text
+        columns of a pdf table and writes it to the Table_Hashes table. If the
+        hash has changed, the now outdated vector representations and MinHash
+        signatures of the table are removed. The method does not commit,
+        this is left to the calling method.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the pdf table being hashed.
+
+        content_hash : str
+            The hash of the table content if it has already been calculated
+            from the rows as they were written, see track_section_rows(). By
+            default content_hash=None and the table is read and hashed.
+
+        Returns
+        -------
+        content_hash : str
+            The hexadecimal SHA-256 hash of the table content.
+        '''
+        if content_hash is None:
+
+            table_hash = hashlib.sha256()
+
+            for section_name, section_text in self.get_section_texts(table_name).items():
+                pdf_db.hash_section(table_hash, section_name, section_text)
+
+            content_hash = table_hash.hexdigest()
+
+        # Removing the vector representations of a table whose content has changed:
+        stored_hash = self.c.execute(
+            "SELECT Content_hash FROM Table_Hashes WHERE Table_name = ?", (table_name,)).fetchone()
+
+        if stored_hash is not None and stored_hash[0] != content_hash:
+            self.c.execute("DELETE FROM Section_Vectors WHERE Table_name = ?", (table_name,))
+            self.c.execute("DELETE FROM Section_MinHash WHERE Table_name = ?", (table_name,))
+            self.c.execute("DELETE FROM MinHash_Bands WHERE Table_name = ?", (table_name,))
+
+        self.c.execute(
+            "INSERT OR REPLACE INTO Table_Hashes VALUES (?, ?)", (table_name, content_hash))
+
+        return content_hash
+
+    # Method that returns the content hash of a pdf table:
+    def get_table_hash(self, table_name):
+        '''
+        Method returns the content hash of a pdf table from the Table_Hashes
+        table, calculating it with update_table_hash() if it has not been stored.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the pdf table.
+
+        Returns
+        -------
+        content_hash : str
+            The hexadecimal SHA-256 hash of the table content.
+        '''
+        hash_row = self.c.execute(
+            "SELECT Content_hash FROM Table_Hashes WHERE Table_name = ?", (table_name,)).fetchone()
+
+        if hash_row is None:
+            return self.update_table_hash(table_name)
+
+        return hash_row[0]
+
+    # Method that builds and writes the vector representation of a pdf table's sections:
+    def build_section_vectors(self, table_name, section_dict=None):
+        '''
+        Method builds the vector representation of every section of a pdf table
+        and writes it to the Section_Vectors table. The representation consists
+        of the array of integer ids of every (lowercased) token of the Section_Text,
+        and the sorted array of distinct token ids (the token set) with the number
+        of times each occurs (the term frequency sparse vector). The arrays are
+        stored as int32 BLOBs. Token ids are shared by the whole database through
+        the Vocabulary table.
+
+        The method does not commit, this is left to the calling method.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the pdf table whose sections are converted.
+
+        section_dict : dict
+            The Section_Text of each section keyed by the Section title, as it
+            is written by write_pdf_rows(). By default section_dict=None and the
+            sections are read from the database.
+        '''
+        if section_dict is None:
+            section_dict = self.get_section_texts(table_name)
+
+        vector_rows = []
+        for section_name, section_text in section_dict.items():
+
+            # Sections without text do not have a vector representation:
+            if section_text is None:
+                continue
+
+            token_ids = np.array(
+                self.get_token_ids(section_text.lower().split()), dtype=np.int32)
+
+            (token_ids, term_ids, term_counts) = pdf_db.build_term_vector(token_ids)
+
+            vector_rows.append((table_name, section_name, token_ids.tobytes(),
+                term_ids.tobytes(), term_counts.tobytes()))
+
+        self.c.executemany(
+            """INSERT OR REPLACE INTO Section_Vectors VALUES (?, ?, ?, ?, ?)""", vector_rows)
+
+    # Method that converts a list of tokens to their Vocabulary ids:
+    def get_token_ids(self, token_lst):
+        '''
+        Method converts a list of tokens to their integer ids from the Vocabulary
+        table, adding any token that is not yet in the table. The Vocabulary is
+        kept in memory after it is first loaded, and discarded by rollback() as
+        it may then hold tokens that are no longer in the table.
+
+        Parameters
+        ----------
+        token_lst : list
+            A list of string tokens.
+
+        Returns
+        -------
+        token_id_lst : list
+            A list of the integer id of each token.
+        '''
+        # Loading the Vocabulary table into memory the first time it is needed:
+        if self.vocab_dict is None:
+            self.vocab_dict = dict(self.c.execute("SELECT Token, Token_id FROM Vocabulary").fetchall())
+
+        # The distinct tokens that are not yet in the Vocabulary, in order:
+        new_token_lst = list(dict.fromkeys(
+            token for token in token_lst if token not in self.vocab_dict))
+
+        # Letting sqlite assign the ids of new tokens so they never collide with
+        # the ids in the table, even if tokens were added by another connection:
+        self.c.executemany(
+            "INSERT OR IGNORE INTO Vocabulary (Token) VALUES (?)", ((token,) for token in new_token_lst))
+
+        # Reading the assigned ids back in chunks below the sqlite variable limit:
+        for i in range(0, len(new_token_lst), 500):
+
+            token_chunk = new_token_lst[i:i+500]
+
+            self.vocab_dict.update(self.c.execute(
+                f"""SELECT Token, Token_id FROM Vocabulary
+                WHERE Token IN ({', '.join('?' * len(token_chunk))})""", token_chunk))
+
+        token_id_lst = [self.vocab_dict[token] for token in token_lst]
+
+        return token_id_lst
+
+    # Method that compresses the Section_Text of section rows as they are written:
+    def compress_section_rows(self, section_rows):
+        '''
+        Method compresses the Section_Text of every (section, start_page,
+        end_page, section_text) row with the compression codec of the object and
+        the latest dictionary trained for it. The dictionary is loaded before the
+        rows are consumed so the returned generator can be passed straight to
+        executemany().
+
+        Parameters
+        ----------
+        section_rows : iterable
+            An iterable of (section, start_page, end_page, section_text) tuples.
+
+        Returns
+        -------
+        compressed_rows : generator
+            A generator of the rows with their section_text compressed into a BLOB.
+        '''
+        (dict_id, dict_data) = self.get_active_compression_dict(self.compression)
+
+        compressed_rows = (
+            (section_name, start_page, end_page, section_text if section_text is None
+            else text_compression.compress_text(
+                section_text, self.compression, dict_id, dict_data, self.compression_level))
+            for (section_name, start_page, end_page, section_text) in section_rows)
+
+        return compressed_rows
+
+    # Method that decompresses a Section_Text value read from the database:
+    def decompress_section_text(self, section_text):
+        '''
+        Method decompresses a Section_Text value compressed by
+        compress_section_rows(). Uncompressed text is returned unchanged.
+
+        Parameters
+        ----------
+        section_text : str or bytes
+            The value of the Section_Text column.
+
+        Returns
+        -------
+        section_text : str
+            The uncompressed text.
+        '''
+        return text_compression.decompress_text(section_text, self.get_compression_dict)
+
+    # Method that returns a compression dictionary by its id:
+    def get_compression_dict(self, dict_id):
+        '''
+        Method returns the bytes of a dictionary from the Compression_Dicts table,
+        keeping every dictionary in memory after it is first loaded.
+
+        Parameters
+        ----------
+        dict_id : int
+            The Dict_id of the dictionary.
+
+        Returns
+        -------
+        dict_data : bytes
+            The dictionary bytes.
+        '''
+        if dict_id not in self.compression_dict_cache:
+
+            self.compression_dict_cache[dict_id] = self.c.execute(
+                "SELECT Dict_data FROM Compression_Dicts WHERE Dict_id = ?", (dict_id,)).fetchone()[0]
+
+        return self.compression_dict_cache[dict_id]
+
+    # Method that returns the latest compression dictionary of a codec:
+    def get_active_compression_dict(self, codec):
+        '''
+        Method returns the latest dictionary trained for a codec by
+        train_compression_dict(), which is used to compress new text.
+
+        Parameters
+        ----------
+        codec : str
+            The name of the codec, either "zlib" or "zstd".
+
+        Returns
+        -------
+        compression_dict : tuple
+            A (dict_id, dict_data) tuple, (0, None) if no dictionary has been
+            trained for the codec.
+        '''
+        dict_row = self.c.execute(
+            "SELECT MAX(Dict_id) FROM Compression_Dicts WHERE Codec = ?", (codec,)).fetchone()
+
+        if dict_row[0] is None:
+            return (0, None)
+
+        return (dict_row[0], self.get_compression_dict(dict_row[0]))
+
+    # Method that trains a shared compression dictionary from the sections in the database:
+    def train_compression_dict(self, codec=None, sample_size=2000, dict_size=None):
+        '''
+        Method trains a compression dictionary from a random sample of the
+        sections in the database and writes it to the Compression_Dicts table.
+        Text written afterwards is compressed with it. Sections of financial
+        pdfs share a lot of boilerplate, so a shared dictionary greatly
+        improves the compression of each (small) section compressed on its own.
+        Existing sections keep their dictionary until recompress_sections() is
+        called.
+
+        With zlib the dictionary is built from the most frequent word n-grams of
+        the sample (see text_compression.build_zlib_dict()), with zstd it is
+        trained by the zstandard package.
+
+        Parameters
+        ----------
+        codec : str
+            The name of the codec, either "zlib" or "zstd". By default the
+            compression codec of the object.
+
+        sample_size : int
+            The maximum number of sections sampled. By default sample_size=2000.
+
+        dict_size : int
+            The size of the dictionary in bytes. By default 32 KiB for zlib (its
+            maximum) and 110 KiB for zstd.
+
+        Returns
+        -------
+        dict_id : int
+            The Dict_id of the new dictionary.
+        '''
+        if codec is None:
+            codec = self.compression
+
+        text_compression.check_codec(codec)
+
+        # Sampling sections across randomly ordered pdfs:
+        table_name_lst = self.get_table_names()
+        random.shuffle(table_name_lst)
+
+        sample_lst = []
+        for table_name in table_name_lst:
+
+            sample_lst.extend(
+                section_text for section_text in self.get_section_texts(table_name).values()
+                if section_text)
+
+            if len(sample_lst) >= sample_size:
+                break
+
+        sample_lst = sample_lst[:sample_size]
+
+        if codec == 'zlib':
+            dict_data = text_compression.build_zlib_dict(
+                sample_lst, dict_size or text_compression.ZLIB_MAX_DICT_SIZE)
+
+        else:
+            dict_data = text_compression.train_zstd_dict(sample_lst, dict_size or 112640)
+
+        self.c.execute(
+            "INSERT INTO Compression_Dicts (Codec, Dict_data, Date_created) VALUES (?, ?, ?)",
+            (codec, dict_data, str(datetime.date(datetime.now()))))
+
+        dict_id = self.c.lastrowid
+
+        self.con.commit()
+
+        return dict_id
+
+    # Method that rewrites the Section_Text of existing sections with the current compression:
+    def recompress_sections(self, table_names=None):
+        '''
+        Method rewrites the Section_Text of every section with the compression
+        codec of the object and the latest dictionary trained for it, or
+        uncompressed if the object's compression is None. Each pdf is rewritten in
+        its own transaction. The content hashes of the pdfs are unchanged so no
+        similarity metric needs to be recalculated. Running VACUUM afterwards
+        returns the freed pages to the file system.
+
+        Parameters
+        ----------
+        table_names : list
+            The names of the pdfs to rewrite. By default every pdf.
+
+        Returns
+        -------
+        compression_report : dict
+            The report of compression_report() after the sections are rewritten.
+        '''
+        if table_names is None:
+            table_names = self.get_table_names()
+
+        if self.con.in_transaction:
+            self.con.commit()
+
+        for table_name in table_names:
+
+            section_rows = [
+                (section_name, None, None, section_text) for section_name, section_text
+                in self.get_section_texts(table_name).items()]
+
+            if self.compression is not None:
+                section_rows = self.compress_section_rows(section_rows)
+
+            text_rows = [(section_text, section_name) for (section_name, x, y, section_text) in section_rows]
+
+            self.c.execute("BEGIN")
+
+            try:
+                if self.storage == 'normalized':
+
+                    self.c.executemany(
+                        """UPDATE sections SET Section_Text = ? WHERE Section = ? AND Document_id =
+                        (SELECT Document_id FROM documents WHERE Name = ?)""",
+                        (text_row + (table_name,) for text_row in text_rows))
+
+                else:
+                    self.c.executemany(
+                        f"UPDATE {table_name} SET Section_Text = ? WHERE Section = ?", text_rows)
+
+                self.con.commit()
+
+            except:
+                self.rollback()
+                raise
+
+        return self.compression_report()
+
+    # Method that reports the compression ratio of the Section_Text of the database:
+    def compression_report(self, table_names=None):
+        '''
+        Method reports how much space the Section_Text of the sections takes up
+        in the database compared to its uncompressed size. Only the header of the
+        compressed text is read, which stores the uncompressed size.
+
+        Parameters
+        ----------
+        table_names : list
+            The names of the pdfs to report on. By default every pdf.
+
+        Returns
+        -------
+        compression_report : dict
+            A dictionary containing the number of sections, the number of them
+            that are compressed by each codec, the uncompressed and stored bytes
+            of their text, the compression ratio (uncompressed / stored), the
+            number of dictionaries and the size of the database file in bytes.
+        '''
+        if table_names is None:
+            table_names = self.get_table_names()
+
+        compression_report = {'sections': 0, 'compressed_sections': {}, 'raw_bytes': 0,
+            'stored_bytes': 0, 'ratio': 1.0, 'dictionaries': 0, 'file_bytes': 0}
+
+        for table_name in table_names:
+
+            for (text_type, stored_size, header) in self.get_section_rows(table_name,
+                f"""typeof(Section_Text), length(CAST(Section_Text AS BLOB)),
+                CASE WHEN typeof(Section_Text) = 'blob'
+                THEN substr(Section_Text, 1, {text_compression.HEADER_SIZE}) END"""):
+
+                compression_report['sections'] += 1
+
+                if text_type == 'null':
+                    continue
+
+                compression_report['stored_bytes'] += stored_size
+
+                if header is None:
+                    compression_report['raw_bytes'] += stored_size
+                    continue
+
+                (codec_id, dict_id, raw_size) = text_compression.read_header(header)
+                codec = text_compression.CODEC_NAMES[codec_id]
+
+                compression_report['raw_bytes'] += raw_size
+                compression_report['compressed_sections'][codec] = (
+                    compression_report['compressed_sections'].get(codec, 0) + 1)
+
+        if compression_report['stored_bytes'] > 0:
+            compression_report['ratio'] = compression_report['raw_bytes'] / compression_report['stored_bytes']
+
+        compression_report['dictionaries'] = self.c.execute(
+            "SELECT COUNT(*) FROM Compression_Dicts").fetchone()[0]
+
+        compression_report['file_bytes'] = (
+            self.c.execute("PRAGMA page_count").fetchone()[0] *
+            self.c.execute("PRAGMA page_size").fetchone()[0])
+
+        return compression_report
+
+    # Method that returns the name of every pdf in the database:
+    def get_table_names(self):
+        '''
+        Method returns the name of every pdf whose sections have been written
+        to the database, in either storage layout.
+
+        Returns
+        -------
+        table_name_lst : list
+            The list of pdf table names, in the order they were written.
+        '''
+        if self.storage == 'normalized':
+            return [row[0] for row in self.c.execute("SELECT Name FROM documents ORDER BY Document_id")]
+
+        table_set = {
+            row[0] for row in self.c.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+
+        return [
+            row[0] for row in self.c.execute("SELECT Name FROM Summary ORDER BY rowid")
+            if row[0] in table_set]
+
+    # Method that rolls back the current transaction:
+    def rollback(self):
+        '''
+        Method rolls back the current transaction of the connection and discards
+        the in-memory Vocabulary, which may hold tokens that were only written
+        by the rolled back transaction. It is reloaded the next time it is needed.
+        '''
+        self.con.rollback()
+
+        self.vocab_dict = None
+
+    # Method that sets the journal_mode and synchronous pragmas of the connection:
+    def set_pragmas(self, journal_mode=None, synchronous=None):
+        '''
+        Method sets the sqlite journal_mode and synchronous pragmas of the
+        database connection. Using journal_mode="WAL" with synchronous="NORMAL"
+        greatly reduces the cost of each commit during bulk writes.
+
+        Parameters
+        ----------
+        journal_mode : str
+            One of DELETE, TRUNCATE, PERSIST, MEMORY, WAL or OFF. If None the
+            pragma is not modified.
+
+        synchronous : str
+            One of OFF, NORMAL, FULL or EXTRA. If None the pragma is not modified.
+
+        Returns
+        -------
+        previous_pragmas : dict
+            The previous values of the modified pragmas keyed by parameter
+            name, which restore them when passed back to set_pragmas().
+        '''
+        # Validating both pragmas before either is modified:
+        if journal_mode is not None and journal_mode.upper() not in (
+            'DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'):
+            raise ValueError(f'Invalid journal_mode: {journal_mode}')
+
+        if synchronous is not None and synchronous.upper() not in ('OFF', 'NORMAL', 'FULL', 'EXTRA'):
+            raise ValueError(f'Invalid synchronous: {synchronous}')
+
+        previous_pragmas = {}
+
+        if journal_mode is not None:
+
+            previous_pragmas['journal_mode'] = self.c.execute("PRAGMA journal_mode").fetchone()[0]
+            self.c.execute(f"PRAGMA journal_mode = {journal_mode.upper()}")
+
+        if synchronous is not None:
+
+            # The synchronous pragma is read as the index of its level:
+            previous_pragmas['synchronous'] = ('OFF', 'NORMAL', 'FULL', 'EXTRA')[
+                self.c.execute("PRAGMA synchronous").fetchone()[0]]
+            self.c.execute(f"PRAGMA synchronous = {synchronous.upper()}")
+
+        return previous_pragmas
+
+    # Method that creates a table containing all the summary data for a specific ticker:
+    def build_ticker_tbl(self, ticker):
+        '''
+        This method creates and populates a table in the database that contains
+        the table names and relevant information for a ticker symbol.
+
+        Parameters
+        ----------
+        ticker : str
+            A string representing the ticker symbol of the table that will be
+            created and populated.
+        '''
+        # The documents table already serves as the ticker table of the normalized storage:
+        if self.storage == 'normalized':
+            return
+
+        # Building custom table name:
+        table_name = f'{ticker}_tables'
+
+        # Creating a database table for the ticker where all data will be written to:
+        self.c.execute(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table_name} (
+                Table_name TEXT UNIQUE,
+                Pdf_type TEXT,
+                Date TEXT UNIQUE,
+                Cosine_Similarity REAL,
+                Jaccard_Similarity REAL,
+                Minimum_Edit_Distance REAL,
+                Simple_Similarity REAL,
+                Tfidf_Similarity REAL,
+                FOREIGN KEY (Table_name) REFERENCES Summary (Name)
+                )""")
+
+        # Ticker tables built by earlier versions have no Tfidf_Similarity column:
+        self.add_missing_columns(table_name, [('Tfidf_Similarity', 'REAL')])
+
+        self.con.commit()
+
+        # Executing a query to extract data from the Summary table for ticker data:
+        self.c.execute(
+            'SELECT Name, Pdf_type, Date FROM Summary WHERE Ticker=:ticker_symbol',
+            {'ticker_symbol':ticker})
+
+        # Iterating through the self.c.fetchall() and writing data to ticker table:
+        for tuple in self.c.fetchall():
+
+            # Unpacking tuple:
+            (tbl_name, pdf_type, pdf_date) = tuple
+
+            # Writing each row to the ticker database:
+            self.c.execute(
+                f"""
+                INSERT OR IGNORE INTO {table_name} (Table_name, Pdf_type, Date)
+                VALUES (:tbl_name, :pdf_type, :pdf_date)
+                """, {'tbl_name': tbl_name, 'pdf_type':pdf_type, 'pdf_date':pdf_date})
+
+        self.con.commit()
+
+    # Method that executes natural language processing on all elements of a single ticker:
+    def perform_sim_calculation(self, ticker, workers=None, vectorized=False, incremental=True,
+        pairing_rule='previous_year', legacy=False):
+        """
+        Method performs all elements of nlp similarity calculations between all
+        pdfs of a ceratin ticker symbol according to the lazy prices algorithm
+        described by the Documentation.
+
+        The sections of both pdfs in each pair are loaded with a single query per
+        table and joined in memory by the build_sim_jobs() method. Each common
+        section and the full text of the pdfs is then compared by the
+        calc_text_metrics() method, either in this process or across a pool of
+        worker processes. All of the resulting similarity values are written
+        with executemany() inside a single transaction.
+
+        Parameters
+        ----------
+        ticker : str
+            A string that represents the ticker of pdfs that the method performs
+            similarity calculations on.
+
+        workers : int
+            The number of processes the section and full pdf comparisons are
+            sent to. By default workers=None and all comparisons are calculated
+            in the current process.
+
+        vectorized : bool
+            If True the metrics are calculated from the vector representation
+            of each section stored in the Section_Vectors table (see
+            build_section_vectors()) by the calc_vector_metrics() method instead
+            of from the raw Section_Text strings. Representations that are
+            missing are built and stored the first time they are needed. Note
+            that in this mode the cosine similarity is the cosine of the term
+            frequency vectors of the (lowercased) words rather than the
+            character based textdistance.cosine(). By default vectorized=False
+
+        incremental : bool
+            If True only the pairs whose inputs have changed since their metrics
+            were last calculated are compared. The inputs of a pair are recorded
+            in the Sim_Pairs table as a hash of the content hash of both pdf tables
+            (see update_table_hash()), the previous year table and the
+            calculation mode, so new pdfs, re-ingested pdfs and a change of
+            vectorized are all recalculated. Pairs whose full pdf metrics are
+            missing from the {ticker}_tables table, eg after it was rebuilt by
+            build_ticker_tbl(), are recalculated as well. If False every pair
+            is recalculated.
+            By default incremental=True
+
+        pairing_rule : str or dict
+            The rule used to pair each pdf with the earlier pdf it is compared to,
+            either one of 'previous_year', 'previous_quarter' and 'nearest_prior'
+            or a dict of the rule of each pdf_type (see build_pair_index()). By
+            default pairing_rule='previous_year'.
+
+        legacy : bool
+            If True the Minimum_Edit_Distance is calculated by the difflib based
+            algorithm of earlier versions of the package (see calc_minedit_dist()),
+            so it can be compared with previously stored values. A change of
+            legacy is recalculated like a change of vectorized. By default
+            legacy=False
+
+        Returns
+        -------
+        sim_stats : dict
+            A dictionary containing the number of pairs that were calculated and
+            the number that were skipped because their inputs had not changed.
+        """
+        # Creating the main table name:
+        table_name = f'{ticker}_tables'
+
+        # Selecting the pdfs of the ticker symbol:
+        tuple_lst = self.get_ticker_rows(ticker)
+
+        # The pdfs whose full pdf metrics are stored in the {ticker}_tables rows:
+        stored_metric_tables = {row[0] for row in tuple_lst if row[3] is not None}
+
+        # Selecting how the sections are loaded and compared:
+        if vectorized is True:
+            (get_sections, build_jobs, calc_metrics) = (
+                self.get_section_vectors, pdf_db.build_vector_jobs, pdf_db.calc_vector_metrics)
+
+        else:
+            (get_sections, build_jobs, calc_metrics) = (
+                self.get_section_texts, pdf_db.build_sim_jobs, pdf_db.calc_text_metrics)
+
+        # List of (pdf_table_name, section_name, metrics) for every comparison:
+        sim_result_lst = []
+
+        # List of the Sim_Pairs rows of every pair that is calculated:
+        sim_pair_lst = []
+        sim_stats = {'pairs_calculated': 0, 'pairs_skipped': 0}
+
+        date_computed = str(datetime.date(datetime.now()))
+
+        # Dict of the section similarity rows to be written to each pdf table:
+        section_update_dict = {}
+
+        # List of the full pdf similarity rows to be written to the {ticker}_tables table:
+        pdf_update_lst = []
+
+        # Declaring the process pool the comparisons are sent to:
+        if workers is not None and workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+
+        else:
+            executor = None
+
+        # Shutting the process pool down if any comparison or query fails:
+        try:
+            # Iterating through the pair of every pdf and performing sim operations on the respective tables:
+            for prev_yr_tbl in pdf_db.build_pair_index(tuple_lst, pairing_rule):
+
+                # If there is no previous pdf the pdf is skipped:
+                if prev_yr_tbl[1] is None:
+                    continue
+
+                # Building the hash of every input of the pair's metrics:
+                pair_hash = hashlib.sha256('\x00'.join([
+                    ('vector' if vectorized is True else 'text') + (':legacy' if legacy is True else ''),
+                    prev_yr_tbl[1],
+                    self.get_table_hash(prev_yr_tbl[0]), self.get_table_hash(prev_yr_tbl[1])
+                    ]).encode('utf-8')).hexdigest()
+
+                # Skipping the pair if its metrics were calculated from the same inputs:
+                if incremental is True:
+
+                    stored_hash = self.c.execute(
+                        "SELECT Pair_hash FROM Sim_Pairs WHERE Table_name = ?",
+                        (prev_yr_tbl[0],)).fetchone()
+
+                    # The metrics are missing if the {ticker}_tables table was rebuilt after they were written:
+                    if (stored_hash is not None and stored_hash[0] == pair_hash
+                        and prev_yr_tbl[0] in stored_metric_tables):
+                        sim_stats['pairs_skipped'] += 1
+                        continue
+
+                sim_pair_lst.append((prev_yr_tbl[0], prev_yr_tbl[1], pair_hash, date_computed))
+                sim_stats['pairs_calculated'] += 1
+
+                # Loading every section of both pdfs with a single query each:
+                init_section_dict = get_sections(prev_yr_tbl[0])
+                second_section_dict = get_sections(prev_yr_tbl[1])
+
+                # Joining the sections of both pdfs in memory and calculating the metrics:
+                for section_name, init_text, second_text in build_jobs(
+                    init_section_dict, second_section_dict):
+
+                    if executor is None:
+                        metrics = calc_metrics(init_text, second_text, legacy)
+
+                    else:
+                        metrics = executor.submit(calc_metrics, init_text, second_text, legacy)
+
+                    sim_result_lst.append((prev_yr_tbl[0], section_name, metrics))
+
+            # Collecting the results of every comparison:
+            for pdf_table_name, section_name, metrics in sim_result_lst:
+
+                if executor is not None:
+                    metrics = metrics.result()
+
+                # The metrics could not be calculated for the texts:
+                if metrics is None:
+                    continue
+
+                (cosine_sim, jaccard_sim, min_edit_dist) = metrics
+
+                # A section_name of None indicates the comparison of the full pdfs:
+                if section_name is None:
+                    pdf_update_lst.append((round(cosine_sim, 3), round(jaccard_sim, 3),
+                        round(min_edit_dist, 3), pdf_table_name))
+
+                else:
+                    section_update_dict.setdefault(pdf_table_name, []).append((
+                        round(cosine_sim, 3), round(jaccard_sim, 3), min_edit_dist, section_name))
+
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        # Writing all similarity values inside a single transaction:
+        if self.con.in_transaction:
+            self.con.commit()
+
+        self.c.execute("BEGIN")
+
+        try:
+            # Writing the section and full pdf similarity values to the metrics table:
+            if self.storage == 'normalized':
+
+                # Creating missing metrics rows without replacing the other metrics of existing rows:
+                for pdf_table_name, section_metric_lst in section_update_dict.items():
+
+                    self.c.executemany(
+                        """INSERT OR IGNORE INTO metrics (Document_id, Section)
+                        SELECT Document_id, ? FROM documents WHERE Name = ?""",
+                        ((section_name, pdf_table_name) for (*_, section_name) in section_metric_lst))
+
+                    self.c.executemany(
+                        """UPDATE metrics SET Cosine_Similarity = ?, Jaccard_Similarity = ?,
+                        Minimum_Edit_Distance = ? WHERE Section = ?
+                        AND Document_id = (SELECT Document_id FROM documents WHERE Name = ?)""",
+                        (section_metric + (pdf_table_name,) for section_metric in section_metric_lst))
+
+                self.c.executemany(
+                    """INSERT OR IGNORE INTO metrics (Document_id, Section)
+                    SELECT Document_id, NULL FROM documents WHERE Name = ?""",
+                    ((pdf_table_name,) for (*_, pdf_table_name) in pdf_update_lst))
+
+                self.c.executemany(
+                    """UPDATE metrics SET Cosine_Similarity = ?, Jaccard_Similarity = ?,
+                    Minimum_Edit_Distance = ? WHERE Section IS NULL
+                    AND Document_id = (SELECT Document_id FROM documents WHERE Name = ?)""",
+                    pdf_update_lst)
+
+            else:
+                # Writing similarity values to each inital pdf table:
+                for pdf_table_name, section_metric_lst in section_update_dict.items():
+
+                    self.c.executemany(
+                        f"""UPDATE {pdf_table_name}
+                        SET Cosine_Similarity = ?, Jaccard_Similarity = ?,
+                        Minimum_Edit_Distance = ?
+                        WHERE Section = ?""", section_metric_lst)
+
+                # Writing full pdf similarity metrics to the {ticker}_tables data tables:
+                self.c.executemany(
+                    f"""UPDATE {table_name} SET
+                    Cosine_Similarity = ?,
+                    Jaccard_Similarity = ?,
+                    Minimum_Edit_Distance = ?
+                    WHERE Table_name = ?""", pdf_update_lst)
+
+            # Recording the inputs of every pair that was calculated:
+            self.c.executemany(
+                "INSERT OR REPLACE INTO Sim_Pairs VALUES (?, ?, ?, ?)", sim_pair_lst)
+
+            self.con.commit()
+
+        except:
+            self.rollback()
+            raise
+
+        return sim_stats
+
+    # Method that calculates the TF-IDF cosine similarity of every pair of pdfs of a ticker:
+    def perform_tfidf_calculation(self, ticker, by_section=False, pairing_rule='previous_year',
+        **vectorizer_kwargs):
+        '''
+        Method calculates the cosine similarity of the TF-IDF vectors of every
+        pair of pdfs of a ticker symbol in a single batch. The texts are
+        converted into one sparse TF-IDF matrix by sklearn's TfidfVectorizer and
+        the whole pdf by pdf similarity matrix is calculated by cosine_similarity()
+        as a single sparse matrix product, instead of comparing one pair of
+        strings at a time.
+
+        Every pair is written to the Tfidf_Pairs table, replacing the pairs of
+        the ticker previously calculated in the same mode. In the full pdf mode
+        the similarity between each pdf and the pdf it is paired with by
+        build_pair_index() is also written to the Tfidf_Similarity column of the
+        {ticker}_tables table (the metrics table with the normalized storage).
+
+        Parameters
+        ----------
+        ticker : str
+            A string that represents the ticker of pdfs being compared.
+
+        by_section : bool
+            If True a matrix is built for every section title found in at least
+            two pdfs of the ticker, comparing the text of that section across the
+            years, instead of a single matrix of the full text of the pdfs. By
+            default by_section=False.
+
+        pairing_rule : str or dict
+            The rule of build_pair_index() used to select the pair written to the
+            {ticker}_tables table. By default pairing_rule='previous_year'.
+
+        **vectorizer_kwargs
+            Additional keyword arguments passed to TfidfVectorizer, eg max_df.
+
+        Returns
+        -------
+        tfidf_stats : dict
+            A dictionary containing the number of pdfs, the number of matrices
+            built and the number of pairs written.
+        '''
+        ticker_rows = self.get_ticker_rows(ticker)
+
+        # Ordering the pdfs by date so every pair is written as (later pdf, earlier pdf):
+        ticker_rows = sorted(
+            ticker_rows, key=lambda ticker_row: datetime.strptime(ticker_row[2], '%d/%m/%Y').date())
+
+        table_name_lst = [ticker_row[0] for ticker_row in ticker_rows]
+        section_dict_lst = [self.get_section_texts(table_name) for table_name in table_name_lst]
+
+        # Building the list of (section_name, [(pdf_index, text)]) of every matrix:
+        if by_section is True:
+
+            text_lst_dict = {}
+            for pdf_index, section_dict in enumerate(section_dict_lst):
+
+                for section_name, section_text in section_dict.items():
+
+                    if section_text:
+                        text_lst_dict.setdefault(section_name, []).append((pdf_index, section_text))
+
+            matrix_job_lst = list(text_lst_dict.items())
+
+        else:
+            matrix_job_lst = [(None, [
+                (pdf_index, ' '.join(text for text in section_dict.values() if text is not None))
+                for pdf_index, section_dict in enumerate(section_dict_lst)])]
+
+        tfidf_stats = {'pdfs': len(table_name_lst), 'matrices': 0, 'pairs': 0}
+
+        # List of the Tfidf_Pairs rows and dict of the similarity of every full pdf pair:
+        pair_row_lst = []
+        pdf_sim_dict = {}
+
+        for section_name, text_lst in matrix_job_lst:
+
+            if len(text_lst) < 2:
+                continue
+
+            try:
+                tfidf_matrix = TfidfVectorizer(**vectorizer_kwargs).fit_transform(
+                    [text for (pdf_index, text) in text_lst])
+
+            # None of the texts contain a word:
+            except ValueError:
+                continue
+
+            sim_matrix = cosine_similarity(tfidf_matrix)
+            tfidf_stats['matrices'] += 1
+
+            for i, (pdf_index, x) in enumerate(text_lst):
+
+                for j, (prev_pdf_index, y) in enumerate(text_lst[:i]):
+
+                    tfidf_sim = round(float(sim_matrix[i, j]), 3)
+
+                    pair_row_lst.append((ticker, section_name, table_name_lst[pdf_index],
+                        table_name_lst[prev_pdf_index], tfidf_sim))
+
+                    if section_name is None:
+                        pdf_sim_dict[(table_name_lst[pdf_index], table_name_lst[prev_pdf_index])] = tfidf_sim
+
+        tfidf_stats['pairs'] = len(pair_row_lst)
+
+        # The similarity of every pdf and the pdf it is paired with:
+        pdf_update_lst = [
+            (pdf_sim_dict[pair_tuple], pair_tuple[0]) for pair_tuple
+            in pdf_db.build_pair_index(ticker_rows, pairing_rule) if pair_tuple in pdf_sim_dict]
+
+        if self.con.in_transaction:
+            self.con.commit()
+
+        self.c.execute("BEGIN")
+
+        try:
+            self.c.execute(
+                f"""DELETE FROM Tfidf_Pairs WHERE Ticker = ?
+                AND Section IS {'NOT ' if by_section is True else ''}NULL""", (ticker,))
+
+            self.c.executemany("INSERT INTO Tfidf_Pairs VALUES (?, ?, ?, ?, ?)", pair_row_lst)
+
+            if by_section is not True and self.storage == 'normalized':
+
+                self.c.executemany(
+                    """INSERT OR IGNORE INTO metrics (Document_id, Section)
+                    SELECT Document_id, NULL FROM documents WHERE Name = ?""",
+                    ((table_name,) for (tfidf_sim, table_name) in pdf_update_lst))
+
+                self.c.executemany(
+                    """UPDATE metrics SET Tfidf_Similarity = ? WHERE Section IS NULL
+                    AND Document_id = (SELECT Document_id FROM documents WHERE Name = ?)""",
+                    pdf_update_lst)
+
+            elif by_section is not True:
+
+                self.c.executemany(
+                    f"UPDATE {ticker}_tables SET Tfidf_Similarity = ? WHERE Table_name = ?",
+                    pdf_update_lst)
+
+            self.con.commit()
+
+        except:
+            self.rollback()
+            raise
+
+        return tfidf_stats
+
+    # Method that loads columns of every section of a pdf from either storage layout:
+    def get_section_rows(self, table_name, columns):
+        '''
+        Method extracts columns of every section of a pdf with a single query,
+        from the pdf's own table or from the sections table depending on the
+        storage layout of the database. Every method reading sections goes
+        through this method so it does not depend on the layout.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the pdf table being queried.
+
+        columns : str
+            The comma separated sql column expressions to be selected. The
+            columns Section, Start_Page, End_Page and Section_Text are
+            available in both layouts.
+
+        Returns
+        -------
+        section_rows : list
+            The list of row tuples, in the order the sections are stored.
+        '''
+        if self.storage == 'normalized':
+
+            section_rows = self.c.execute(
+                f"""SELECT {columns} FROM sections WHERE Document_id =
+                (SELECT Document_id FROM documents WHERE Name = ?) ORDER BY Section_id""",
+                (table_name,)).fetchall()
+
+        else:
+            section_rows = self.c.execute(
+                f"SELECT {columns} FROM {table_name} ORDER BY rowid").fetchall()
+
+        return section_rows
+
+    # Method that loads the (Table_name, Pdf_type, Date, metrics) rows of a ticker's pdfs:
+    def get_ticker_rows(self, ticker):
+        '''
+        Method extracts a row for every pdf of a ticker symbol in the format of
+        the {ticker}_tables table built by build_ticker_tbl(): (Table_name,
+        Pdf_type, Date, Cosine_Similarity, Jaccard_Similarity,
+        Minimum_Edit_Distance, Simple_Similarity). With the normalized storage
+        the rows are built from the documents and metrics tables using the
+        (Ticker, Pdf_type, Date) index.
+
+        Parameters
+        ----------
+        ticker : str
+            A string representing the ticker symbol.
+
+        Returns
+        -------
+        ticker_rows : list
+            The list of row tuples of the ticker's pdfs.
+        '''
+        if self.storage == 'normalized':
+
+            ticker_rows = self.c.execute(
+                f"""SELECT {NORMALIZED_TICKER_COLUMNS} FROM documents d LEFT JOIN metrics m
+                ON m.Document_id = d.Document_id AND m.Section IS NULL
+                WHERE d.Ticker = ? ORDER BY d.Document_id""", (ticker,)).fetchall()
+
+        else:
+            ticker_rows = self.c.execute(f"SELECT * FROM {ticker}_tables").fetchall()
+
+        return ticker_rows
+
+    # Method that loads the text of every section of a pdf table:
+    def get_section_texts(self, table_name):
+        '''
+        Method extracts the Section and Section_Text columns of a pdf table with
+        a single query.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the pdf table being queried.
+
+        Returns
+        -------
+        section_dict : dict
+            A dictionary of the Section_Text of each section keyed by the
+            Section title, in the order the rows are stored in the table.
+        '''
+        section_dict = {
+            section_name: self.decompress_section_text(section_text) for section_name, section_text
+            in self.get_section_rows(table_name, 'Section, Section_Text')}
+
+        return section_dict
+
+    # Method that loads the vector representation of every section of a pdf table:
+    def get_section_vectors(self, table_name):
+        '''
+        Method extracts the vector representation of every section of a pdf
+        table from the Section_Vectors table. If any section with text does not
+        have a stored representation, the representations of the table are
+        built with build_section_vectors() first.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the pdf table being queried.
+
+        Returns
+        -------
+        vector_dict : dict
+            A dictionary of (token_ids, term_ids, term_counts) numpy array tuples
+            keyed by Section title, in the order the rows are stored in the table.
+            Sections without text are not included.
+        '''
+        vector_query = """SELECT Section, Token_ids, Term_ids, Term_counts
+            FROM Section_Vectors WHERE Table_name = ?"""
+
+        # The sections that have text, in the order they are stored:
+        section_lst = [
+            section_name for (section_name, has_text) in self.get_section_rows(
+                table_name, 'Section, Section_Text IS NOT NULL') if has_text]
+
+        blob_dict = {
+            section_name: blobs for (section_name, *blobs) in self.c.execute(
+                vector_query, (table_name,)).fetchall()}
+
+        # Building the missing representations of sections that have text:
+        if any(section_name not in blob_dict for section_name in section_lst):
+
+            self.build_section_vectors(table_name)
+
+            blob_dict = {
+                section_name: blobs for (section_name, *blobs) in self.c.execute(
+                    vector_query, (table_name,)).fetchall()}
+
+        vector_dict = {
+            section_name: tuple(np.frombuffer(blob, dtype=np.int32) for blob in blob_dict[section_name])
+            for section_name in section_lst}
+
+        return vector_dict
+
+# <------------------------------Query Methods---------------------------------->
+    # Method that builds the TF-IDF similarity matrix of a ticker's pdfs:
+    def get_tfidf_matrix(self, ticker, section=None):
+        '''
+        Method builds the symmetric pdf by pdf TF-IDF cosine similarity matrix
+        of a ticker from the pairs written by perform_tfidf_calculation().
+
+        Parameters
+        ----------
+        ticker : str
+            A string representing the ticker symbol.
+
+        section : str
+            The section title of the matrix, calculated with by_section=True. By
+            default section=None, the matrix of the full pdfs.
+
+        Returns
+        -------
+        sim_df :
+            A dataframe with a row and a column for every pdf of the matrix.
+        '''
+        pair_rows = self.c.execute(
+            """SELECT Table_name, Prev_table_name, Tfidf_Similarity FROM Tfidf_Pairs
+            WHERE Ticker = ? AND Section IS ? ORDER BY rowid""", (ticker, section)).fetchall()
+
+        # Listing the pdfs from the earliest, which is never the later pdf of a pair:
+        table_name_lst = []
+        for (table_name, prev_table_name, tfidf_sim) in pair_rows:
+
+            for name in (prev_table_name, table_name):
+
+                if name not in table_name_lst:
+                    table_name_lst.append(name)
+
+        sim_df = pd.DataFrame(np.eye(len(table_name_lst)), index=table_name_lst, columns=table_name_lst)
+
+        for (table_name, prev_table_name, tfidf_sim) in pair_rows:
+            sim_df.loc[table_name, prev_table_name] = tfidf_sim
+            sim_df.loc[prev_table_name, table_name] = tfidf_sim
+
+        return sim_df
+
+    # Method that finds the sections of any pdf that are near-duplicates of a section:
+    def find_similar_sections(self, table_name, section, threshold=0.5, limit=None):
+        '''
+        Method finds the sections of every pdf in the database whose word
+        shingles are similar to those of a section, using the MinHash_Bands
+        locality sensitive hashing index. Only the sections sharing a band hash
+        with the section are candidates, so the query does not depend on the
+        size of the database. The jaccard similarity of each candidate is then
+        estimated from the MinHash signatures and those below the threshold are
+        removed.
+
+        With 32 bands of 4 rows a section with a jaccard similarity of 0.5 is
+        found with a probability of 0.87 and one of 0.6 with a probability of
+        0.98, so thresholds much below 0.5 miss most similar sections.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of the pdf table of the section.
+
+        section : str
+            The title of the section.
+
+        threshold : float
+            The minimum estimated jaccard similarity of the returned sections.
+            By default threshold=0.5.
+
+        limit : int
+            The maximum number of sections returned. By default every section
+            above the threshold is returned.
+
+        Returns
+        -------
+        similar_df :
+            A dataframe of the similar sections, excluding the section itself,
+            from the most similar with the columns {Table_name, Ticker,
+            Pdf_type, Date, Section, Similarity}.
+        '''
+        signature_row = self.c.execute(
+            "SELECT Signature FROM Section_MinHash WHERE Table_name = ? AND Section = ?",
+            (table_name, section)).fetchone()
+
+        # Building the signature of a section that is not in the index:
+        if signature_row is None:
+
+            section_text = self.get_section_texts(table_name).get(section)
+
+            if section_text is None:
+                raise KeyError(f'{section} of {table_name} has no text')
+
+            signature = minhash.build_signature(minhash.build_shingle_hashes(section_text))
+
+        else:
+            signature = np.frombuffer(signature_row[0], dtype=np.uint32)
+
+        # Collecting every section that shares at least one band hash:
+        candidate_set = set()
+        for band, band_hash in enumerate(minhash.build_band_hashes(signature)):
+
+            candidate_set.update(self.c.execute(
+                "SELECT Table_name, Section FROM MinHash_Bands WHERE Band = ? AND Band_hash = ?",
+                (band, band_hash)).fetchall())
+
+        candidate_set.discard((table_name, section))
+
+        similar_lst = []
+        for (candidate_table, candidate_section) in candidate_set:
+
+            candidate_signature = np.frombuffer(self.c.execute(
+                "SELECT Signature FROM Section_MinHash WHERE Table_name = ? AND Section = ?",
+                (candidate_table, candidate_section)).fetchone()[0], dtype=np.uint32)
+
+            similarity = minhash.estimate_jaccard(signature, candidate_signature)
+
+            if similarity >= threshold:
+
+                summary_row = self.c.execute(
+                    "SELECT Ticker, Pdf_type, Date FROM Summary WHERE Name = ?",
+                    (candidate_table,)).fetchone() or (None, None, None)
+
+                similar_lst.append((candidate_table, *summary_row, candidate_section, similarity))
+
+        similar_lst.sort(key=lambda similar_row: (-similar_row[-1], similar_row[0], similar_row[4]))
+
+        similar_df = pd.DataFrame(similar_lst[:limit], columns=[
+            'Table_name', 'Ticker', 'Pdf_type', 'Date', 'Section', 'Similarity'])
+
+        return similar_df
+
+    # Method that searches the text of every section in the database:
+    def search(self, query, ticker=None, pdf_type=None, limit=20):
+        '''
+        Method performs a full text search of the title and text of every section
+        in the database using the Section_Search FTS5 index, ranking the matching
+        sections with the bm25 algorithm (matches in the section title are
+        weighted 5 times as much as matches in the text). As the index does not
+        store the section text, the text of a match is read with
+        get_table_data(table_name, section_title).
+
+        The query uses the FTS5 query syntax, eg: 'impairment', 'goodwill AND
+        impairment', '"asset retirement"' or 'NEAR(climate risk, 10)'. Words are
+        stemmed with the porter stemmer, so "impairments" matches "impairment".
+        Note that the Section_Text is stored after clean_text() and
+        tokenize_text(), so stopwords never match.
+
+        Parameters
+        ----------
+        query : str
+            The FTS5 query string.
+
+        ticker : str
+            If given only the sections of pdfs of this ticker symbol are returned.
+
+        pdf_type : str
+            If given only the sections of pdfs of this category are returned.
+
+        limit : int
+            The maximum number of sections returned. By default limit=20.
+
+        Returns
+        -------
+        search_df :
+            A dataframe of the matching sections ordered from the best match,
+            with the columns {Table_name, Ticker, Pdf_type, Date, Section,
+            Start_Page, End_Page, Score}. A higher Score is a better match.
+        '''
+        if self.search_index is not True:
+            raise sqlite3.OperationalError('The full text search index is disabled')
+
+        search_df = pd.read_sql_query(
+            """SELECT m.Table_name, m.Ticker, m.Pdf_type, m.Date, m.Section, m.Start_Page,
+            m.End_Page, -bm25(Section_Search, 5.0, 1.0) AS Score
+            FROM Section_Search JOIN Search_Sections m ON m.Search_id = Section_Search.rowid
+            WHERE Section_Search MATCH :query
+            AND (:ticker IS NULL OR m.Ticker = :ticker)
+            AND (:pdf_type IS NULL OR m.Pdf_type = :pdf_type)
+            ORDER BY bm25(Section_Search, 5.0, 1.0) LIMIT :limit""",
+            self.con, params={'query': query, 'ticker': ticker, 'pdf_type': pdf_type, 'limit': limit})
+
+        return search_df
+
+    # Method that extracts an entire table of data:
+    def get_table_data(self, table_name, section_title=None):
+        '''
+        A Method that uses the SELECT FROM table sql query to extract all the
+        data from table in the database and representing it as a dataframe. It
+        also allows the database query to be for a specific section title. If that
+        is the case it only returns a dict containing this information.
+
+        Parameters
+        ----------
+        table_name : str
+            A string that will use to represent the name of the sql table that
+            the data is being queried from. This string must match the name of
+            the table being queried.
+
+        section_title : str
+            A string that represents the title of a pdf section to be extracted.
+            By default this variable is None and if not specified then the bulk
+            dataframe query is executed.
+
+        Returns
+        -------
+        pdf_df :
+            A dataframe that represents the table being extracted from the database.
+            The pandas dataframe is built using the pd.read_sql_query() method
+            to dynamically build a dataframe.
+
+        OR
+
+        pdf_dict : dict
+            A dictionary containing the key value pairs of data that are returned
+            for a specfic query using the input parameter section_title. The key
+            values of the dict are {Title, Start_Page, End_Page, Text}
+        '''
+        # Building the same columns from the normalized tables:
+        if self.storage == 'normalized':
+            return self.get_normalized_data(table_name, section_title)
+
+        # Conditional determining if a bulk query or a specific query runs:
+        if section_title is None:
+
+            # Creating df from sql table:
+            pdf_df = pd.read_sql_query(f"SELECT * FROM {table_name}", self.con)
+
+            pdf_df.set_index(pdf_df.columns[0], inplace=True)
+
+            # Decompressing the text of pdf tables, {ticker}_tables tables have no text:
+            if 'Section_Text' in pdf_df.columns:
+                pdf_df['Section_Text'] = pdf_df['Section_Text'].map(self.decompress_section_text)
+
+            return pdf_df
+
+        else:
+
+            # Custom query string:
+            self.c.execute(
+                f"SELECT * FROM {table_name} WHERE Section = :section_title",
+                {"section_title": section_title}
+                )
+
+            # Building and returning dict of the tuple being extracted from fetchall:
+            data = self.c.fetchall()[0]
+
+            pdf_dict = {'Title': data[0], 'Start_Page': data[1],
+            'End_Page': data[2], 'Section_Text': self.decompress_section_text(data[3])}
+
+            return pdf_dict
+
+    # Method that extracts the data of a pdf or ticker from the normalized tables:
+    def get_normalized_data(self, table_name, section_title=None):
+        '''
+        The version of get_table_data() used with the normalized storage. The
+        sections and metrics of a pdf are joined into the columns of a pdf table,
+        and a table_name of the form {ticker}_tables returns the rows that
+        build_ticker_tbl() would have written for the ticker.
+
+        Parameters
+        ----------
+        table_name : str
+            The name of a pdf, or {ticker}_tables.
+
+        section_title : str
+            A string that represents the title of a pdf section to be extracted.
+
+        Returns
+        -------
+        pdf_df :
+            A dataframe of the pdf or ticker data.
+
+        OR
+
+        pdf_dict : dict
+            A dictionary of the {Title, Start_Page, End_Page, Section_Text} of
+            the section_title section.
+        '''
+        document_row = self.c.execute(
+            "SELECT Document_id FROM documents WHERE Name = ?", (table_name,)).fetchone()
+
+        # The table name refers to the {ticker}_tables view of a ticker's pdfs:
+        if document_row is None and table_name.endswith('_tables') and section_title is None:
+
+            pdf_df = pd.read_sql_query(
+                f"""SELECT {NORMALIZED_TICKER_COLUMNS} FROM documents d LEFT JOIN metrics m
+                ON m.Document_id = d.Document_id AND m.Section IS NULL
+                WHERE d.Ticker = ? ORDER BY d.Document_id""",
+                self.con, params=(table_name[:-len('_tables')],))
+
+            pdf_df.set_index(pdf_df.columns[0], inplace=True)
+
+            return pdf_df
+
+        if document_row is None:
+            raise KeyError(f'{table_name} is not in the documents table')
+
+        if section_title is None:
+
+            pdf_df = pd.read_sql_query(
+                """SELECT s.Section, s.Start_Page, s.End_Page, s.Section_Text,
+                m.Cosine_Similarity, m.Jaccard_Similarity, m.Minimum_Edit_Distance,
+                m.Simple_Similarity FROM sections s LEFT JOIN metrics m
+                ON m.Document_id = s.Document_id AND m.Section = s.Section
+                WHERE s.Document_id = ? ORDER BY s.Section_id""",
+                self.con, params=(document_row[0],))
+
+            pdf_df.set_index(pdf_df.columns[0], inplace=True)
+
+            pdf_df['Section_Text'] = pdf_df['Section_Text'].map(self.decompress_section_text)
+
+            return pdf_df
+
+        data = self.c.execute(
+            """SELECT Section, Start_Page, End_Page, Section_Text FROM sections
+            WHERE Document_id = ? AND Section = ?""", (document_row[0], section_title)).fetchall()[0]
+
+        pdf_dict = {'Title': data[0], 'Start_Page': data[1],
+        'End_Page': data[2], 'Section_Text': self.decompress_section_text(data[3])}
+
+        return pdf_dict
+
+
+# <---------------------------'Helper' Methods----------------------------------->
+    # Method that builds the list of text comparisons between two pdfs:
+    def build_sim_jobs(init_section_dict, second_section_dict):
+        '''
+        Method joins the sections of two pdfs on their section titles and
+        builds the list of text comparisons performed by perform_sim_calculation():
+        one for every common section and one for the full text of both pdfs.
+
+        Parameters
+        ----------
+        init_section_dict : dict
+            A dict of the Section_Text of each section of the inital pdf keyed
+            by section title, as returned by get_section_texts().
+
+        second_section_dict : dict
+            A dict of the Section_Text of each section of the second pdf.
+
+        Returns
+        -------
+        sim_job_lst : list
+            A list of (section_name, init_text, second_text) tuples. The
+            section_name of the full text comparison is None.
+        '''
+        # Creating a list of only common pdf sections in init and second dict:
+        sim_job_lst = [
+            (section_name, init_section_dict[section_name], second_section_dict[section_name])
+            for section_name in init_section_dict if section_name in second_section_dict]
+
+        # Building the full text of each pdf from the already loaded sections:
+        init_pdf_full_txt = ' '.join(
+            text for text in init_section_dict.values() if text is not None)
+
+        second_pdf_full_txt = ' '.join(
+            text for text in second_section_dict.values() if text is not None)
+
+        sim_job_lst.append((None, init_pdf_full_txt, second_pdf_full_txt))
+
+        return sim_job_lst
+
+    # Method that builds the list of vector comparisons between two pdfs:
+    def build_vector_jobs(init_vector_dict, second_vector_dict):
+        '''
+        The vector version of the build_sim_jobs() method. It builds one
+        comparison for every common section and one for the full pdfs, whose
+        representation is built from the token ids of all of their sections.
+
+        Parameters
+        ----------
+        init_vector_dict : dict
+            A dict of the vector representation of each section of the inital
+            pdf keyed by section title, as returned by get_section_vectors().
+
+        second_vector_dict : dict
+            A dict of the vector representation of each section of the second pdf.
+
+        Returns
+        -------
+        vector_job_lst : list
+            A list of (section_name, init_vector, second_vector) tuples. The
+            section_name of the full pdf comparison is None.
+        '''
+        # Creating a list of only common pdf sections in init and second dict:
+        vector_job_lst = [
+            (section_name, init_vector_dict[section_name], second_vector_dict[section_name])
+            for section_name in init_vector_dict if section_name in second_vector_dict]
+
+        # Building the full pdf representations from the token ids of every section:
+        full_vector_lst = [
+            pdf_db.build_term_vector(np.concatenate(
+                [np.empty(0, dtype=np.int32)] + [vector[0] for vector in vector_dict.values()]))
+            for vector_dict in (init_vector_dict, second_vector_dict)]
+
+        vector_job_lst.append((None, full_vector_lst[0], full_vector_lst[1]))
+
+        return vector_job_lst
 
-# <-----------------------------Database Writing Methods------------------------>
-    # Method that writes a single pdf to the database:
-    def pdf_to_db(self, pdf_path, table_name, pdf_type, pdf_date, ticker):
+    # Method that builds the term frequency vector of an array of token ids:
+    def build_term_vector(token_ids):
         '''
-        The method makes use of the pdf_parser api to write the generated key-value
-        dict to the sqlite dictionary with the extracted strings cleaned for nlp
-        processing by the .clean_text() and .tokenize_text() methods.
+        Method builds the sparse term frequency vector of an array of token ids.
 
         Parameters
         ----------
-        pdf_path : str
-            A string representing the path to the pdf file that will be initalized.
-
-        table_name : str
-            A string that represents the title of the sqlite database that the data
-            will be read into.
+        token_ids : numpy.ndarray
+            The int32 array of the token id of every word of a text.
 
-        pdf_type : str
-            A string representing the category that the pdf is a part of. Eg: "10_K".
+        Returns
+        -------
+        vector : tuple
+            A (token_ids, term_ids, term_counts) tuple where term_ids is the
+            sorted array of distinct token ids and term_counts the number of times
+            each occurs, all as int32 arrays.
+        '''
+        (term_ids, term_counts) = np.unique(token_ids, return_counts=True)
 
-        pdf_date : str
-            A string that indicates the date relevant to the pdf being uploaded
-            to the database. This MUST be a full date in the form of dd/mm/yyyy.
+        return (token_ids.astype(np.int32), term_ids.astype(np.int32), term_counts.astype(np.int32))
 
-        ticker : str
-            A string that represents the ticker symbol associated with the pdf being
-            read to the database. This ticker will be written to the Summary table.
+    # Method that calculates all similarity metrics between two vector representations:
+    def calc_vector_metrics(init_vector, second_vector, legacy=False):
         '''
-        # Creating the table:
-
-        self.c.execute(
-            f"""CREATE TABLE IF NOT EXISTS {table_name} (
-                Section TEXT Primary Key,
-                Start_Page INTEGER,
-                End_Page INTEGER,
-                Section_Text TEXT,
-                Cosine_Similarity REAL,
-                Jaccard_Similarity REAL,
-                Minimum_Edit_Distance REAL,
-                Simple_Similarity REAL
-                )"""
-                    )
+        Method calculates the cosine similarity, jaccard similarity and minimum
+        edit distance between the vector representations of two texts with numpy
+        array operations:
 
-        # Initalzing the pdf parsing object:
-        pdf_parser = pparser.pdf(pdf_path)
+        - The cosine similarity of the two term frequency vectors.
+        - The jaccard similarity of the two multisets of words, the sum of the
+          smaller count of each common word divided by the sum of the larger
+          count of every word, as textdistance.jaccard() calculates for lists.
+        - The minimum edit distance between the token id arrays.
 
-        # Iterating through the pdf_parser indexed_text_dict and writing to db:
-        for key in pdf_parser.indexed_text_dict:
+        Parameters
+        ----------
+        init_vector : tuple
+            The (token_ids, term_ids, term_counts) tuple of the inital text.
 
-            # Try Catch if the pdf parser cannot extract text for a section:
-            try:
-                # Converting the list of strings associated with each dict key to single str:
-                raw_txt = ' '.join(pdf_parser.indexed_text_dict[key])
+        second_vector : tuple
+            The (token_ids, term_ids, term_counts) tuple of the second text.
 
-                # Cleaning text into nlp friendly format:
-                section_txt = pdf_db.clean_text(raw_txt)
+        legacy : bool
+            If True the edit distance is calculated by the difflib based
+            edit_distance.sequence_matcher_distance() function. By default
+            legacy=False
 
-                # Converting the text into a Lemmatized format for further nlp processing:
-                section_txt = pdf_db.tokenize_text(section_txt)
-                #print(section_txt)
+        Returns
+        -------
+        metrics : tuple
+            A (cosine_sim, jaccard_sim, min_edit_dist) tuple, or None if either
+            of the texts is empty.
+        '''
+        (init_token_ids, init_term_ids, init_counts) = init_vector
+        (second_token_ids, second_term_ids, second_counts) = second_vector
 
-                # Iterating through the list of info_dicts of pdf sections for page range:
-                for info_dict in pdf_parser.destination_lst:
+        if len(init_token_ids) == 0 or len(second_token_ids) == 0:
+            return None
 
-                    # If the info dict is for the section indicated by key, unpacking page range:
-                    if info_dict['Title'] == key:
+        # Finding the position of every common term in both sorted term arrays:
+        (common_ids, init_index, second_index) = np.intersect1d(
+            init_term_ids, second_term_ids, assume_unique=True, return_indices=True)
 
-                        # Unpacking tuple of page range:
-                        (start_page, end_page) = info_dict['Page_Range']
+        init_counts = init_counts.astype(np.float64)
+        second_counts = second_counts.astype(np.float64)
 
-                # Inserting each element of the indexed pdf content to table:
-                self.c.execute(
-                    f"""
-                    INSERT INTO {table_name} VALUES (:section_name, :start_page,
-                    :end_page, :section_txt)""",
-                    {'section_name':key, 'section_txt': section_txt,
-                     'start_page': start_page, 'end_page': end_page}
-                        )
+        # Calculating the cosine of the term frequency vectors:
+        dot_product = np.dot(init_counts[init_index], second_counts[second_index])
+        cosine_sim = dot_product / (np.linalg.norm(init_counts) * np.linalg.norm(second_counts))
 
-            except:
-                pass
+        # Calculating the multiset jaccard similarity:
+        intersection = np.minimum(init_counts[init_index], second_counts[second_index]).sum()
+        union = init_counts.sum() + second_counts.sum() - intersection
+        jaccard_sim = intersection / union
 
-        # Building variables to be written to the Summary logging table:
-        date_written = datetime.date(datetime.now())
+        # Calculating the minimum edit distance between the token id sequences:
+        if legacy is True:
+            min_edit_dist = edit_distance.sequence_matcher_distance(
+                init_token_ids.tolist(), second_token_ids.tolist())
 
-        # Writing the logging/summary data to the summary database table:
-        self.c.execute(
-            """INSERT INTO Summary VALUES (:name, :ticker, :pdf_type, :date, :path, :date_written)""",
-                {'name': table_name, 'ticker': ticker, 'pdf_type':pdf_type,
-                 'date': pdf_date, 'path': pdf_path, 'date_written': date_written}
-                )
+        else:
+            min_edit_dist = edit_distance.levenshtein_distance(
+                init_token_ids.tolist(), second_token_ids.tolist())
 
-        # Commiting all changes to database:
-        self.con.commit()
+        return (float(cosine_sim), float(jaccard_sim), min_edit_dist)
 
-    # Method that creates a table containing all the summary data for a specific ticker:
-    def build_ticker_tbl(self, ticker):
+    # Method that calculates all similarity metrics between two texts:
+    def calc_text_metrics(init_text, second_text, legacy=False):
         '''
-        This method creates and populates a table in the database that contains
-        the table names and relevant information for a ticker symbol.
+        Method calculates the cosine similarity, jaccard similarity and minimum
+        edit distance between two Section_Text strings.
 
         Parameters
         ----------
-        ticker : str
-            A string representing the ticker symbol of the table that will be
-            created and populated.
-        '''
-        # Building custom table name:
-        table_name = f'{ticker}_tables'
+        init_text : str
+            The text of the inital pdf.
 
-        # Creating a database table for the ticker where all data will be written to:
-        self.c.execute(
-            f"""
-            CREATE TABLE IF NOT EXISTS {table_name} (
-                Table_name TEXT UNIQUE,
-                Pdf_type TEXT,
-                Date TEXT UNIQUE,
-                Cosine_Similarity REAL,
-                Jaccard_Similarity REAL,
-                Minimum_Edit_Distance REAL,
-                Simple_Similarity REAL
-                FOREIGN KEY (Table_name) REFERENCES Summary (Name)
-                )""")
+        second_text : str
+            The text of the second pdf.
 
+        legacy : bool
+            If True the edit distance is calculated as in earlier versions of the
+            package, see calc_minedit_dist(). By default legacy=False
 
-        self.con.commit()
+        Returns
+        -------
+        metrics : tuple
+            A (cosine_sim, jaccard_sim, min_edit_dist) tuple, or None if the
+            metrics cannot be calculated (eg because one of the texts is missing).
+        '''
+        try: # If there are two strings available for calculations:
 
-        # Executing a query to extract data from the Summary table for ticker data:
-        self.c.execute(
-            'SELECT * FROM Summary WHERE Ticker=:ticker_symbol',
-            {'ticker_symbol':ticker})
+            # Converting both text strings into word lists:
+            init_txt_lst = init_text.split()
+            second_txt_lst = second_text.split()
 
-        # Iterating through the self.c.fetchall() and writing data to ticker table:
-        for tuple in self.c.fetchall():
+            # Calculating cosine similarity:
+            cosine_sim = textdistance.cosine(init_text, second_text)
 
-            # Unpacking tuple:
-            (tbl_name, ticker_symbol, pdf_type, pdf_date, pdf_path, date_uploaded) = tuple
+            # Performing Jaccard Similarity calculation:
+            jaccard_sim = textdistance.jaccard(init_txt_lst, second_txt_lst)
 
-            # Writing each row to the ticker database:
-            self.c.execute(
-                f"""
-                INSERT OR IGNORE INTO {table_name} VALUES (:tbl_name, :pdf_type, :pdf_date)
-                """, {'tbl_name': tbl_name, 'pdf_type':pdf_type, 'pdf_date':pdf_date})
+            # Performing Minimum edit distance or levenshtein distance calculation:
+            min_edit_dist = pdf_db.calc_minedit_dist(init_txt_lst, second_txt_lst, legacy=legacy)
 
-        self.con.commit()
+        except:
+            return None
 
-    # Method that executes natural language processing on all elements of a single ticker:
-    def perform_sim_calculation(self, ticker):
-        """
-        Method performs all elements of nlp similarity calculations between all
-        pdfs of a ceratin ticker symbol according to the lazy prices algorithm
-        described by the Documentation.
+        return (cosine_sim, jaccard_sim, min_edit_dist)
+
+    # Method that parses an iterable of pdf specs in this process or a process pool:
+    def parse_pdf_specs(pdf_specs, workers=None, parse_cache_path=None, extraction_backend='plumber'):
+        '''
+        A generator that parses each pdf of an iterable of pdf spec dicts into
+        cleaned section rows via the parse_pdf_rows() function. If workers is
+        greater than one the pdfs are parsed by a pool of worker processes and
+        yielded as they are completed, with at most two pdfs per worker waiting
+        to be written so memory stays bounded.
 
         Parameters
         ----------
-        ticker : str
-            A string that represents the ticker of pdfs that the method performs
-            similarity calculations on.
-        """
-        # Creating the main table name:
-        table_name = f'{ticker}_tables'
-
-        # Selecting the table based on the ticker symbol:
-        self.c.execute(f"SELECT * FROM {table_name}")
-        tuple_lst = self.c.fetchall()
-
-        # Iterating through the list of row tuples and performing sim operations on the respective table:
-        for tuple in tuple_lst:
-
-            # Attempting to extract previous year table name from fetchall:
-            prev_yr_tbl = pdf_db.build_tbl_name_tuple(tuple, tuple_lst)
+        pdf_specs : iterable
+            An iterable of pdf spec dicts containing a 'pdf_path' key.
+
+        workers : int
+            The number of worker processes. By default workers=None and the
+            pdfs are parsed in the current process.
+
+        parse_cache_path : str
+            The path of the parse cache used by every pdf. By default
+            parse_cache_path=None and nothing is cached.
+
+        extraction_backend : str or pdf_parser.extraction_backend
+            The backend the page text is extracted with. By default
+            extraction_backend='plumber'.
+
+        Yields
+        ------
+        parsed_pdf : tuple
+            A (pdf_spec, section_rows) tuple. If the pdf could not be parsed
+            section_rows is the exception that was raised.
+        '''
+        # Parsing each pdf in order in the current process:
+        if workers is None or workers <= 1:
 
+            for pdf_spec in pdf_specs:
 
-            # If there is a previous year continue else pass:
-            if prev_yr_tbl[1] != None:
+                try:
+                    yield (pdf_spec, parse_pdf_rows(
+                        pdf_spec['pdf_path'], parse_cache_path, extraction_backend))
 
+                except Exception as e:
+                    yield (pdf_spec, e)
 
-                # Building a list of Sections from primary pdf using list comprehension:
-                init_pdf_sections = [
-                    section_name[0] for section_name in self.c.execute(
-                    f"SELECT Section from {prev_yr_tbl[0]}")
-                    ]
+            return
 
-                # Builing a list of Sections form second pdf using list comprehension:
-                second_pdf_sections = [
-                section_name[0] for section_name in self.c.execute(
-                f"SELECT Section from {prev_yr_tbl[1]}")
-                ]
+        pdf_spec_iter = iter(pdf_specs)
 
-                # Creating a list of only common pdf section names in init and second lst:
-                common_sections = list(set(init_pdf_sections).intersection(second_pdf_sections))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
 
-                # print(prev_yr_tbl[0], len(init_pdf_sections), init_pdf_sections)
-                # print(prev_yr_tbl[1], len(second_pdf_sections), second_pdf_sections)
-                # print(prev_yr_tbl[0], len(common_sections), common_sections)
-                # print("-----------------------------------------------------------")
+            # Dict of the pdf spec of each submitted future:
+            future_dict = {}
 
-                # Iterating through the common_sections, comparing corresponding text:
-                for section_name in common_sections:
+            while True:
 
-                    # Extracting all text data from the section of inital pdf:
-                    self.c.execute(
-                        f"""SELECT Section_Text FROM {prev_yr_tbl[0]}
-                        WHERE Section=:section_name""", {'section_name':section_name}
-                        )
+                # Keeping the pool supplied with at most two pdfs per worker:
+                for pdf_spec in pdf_spec_iter:
 
-                    # self.c.fetchall() returns [(section_text, )]
-                    init_pdf_section_text = self.c.fetchall()[0][0]
+                    future_dict[executor.submit(
+                        parse_pdf_rows, pdf_spec['pdf_path'], parse_cache_path, extraction_backend)] = pdf_spec
 
-                    # Extracting all text data from the section of the second pdf:
-                    self.c.execute(
-                        f"""SELECT Section_Text from {prev_yr_tbl[1]} WHERE
-                        Section = :section_name""", {'section_name':section_name}
-                    )
+                    if len(future_dict) >= workers * 2:
+                        break
 
-                    # Unpacking fetchall in same format as above:
-                    second_pdf_section_text = self.c.fetchall()[0][0]
+                if len(future_dict) == 0:
+                    break
 
-                    # Calculating the similarity between the init and second text:
-                    try: # If there are two strings available for calculations:
+                # Yielding the first finished pdf back to the writer:
+                future = next(as_completed(future_dict))
+                pdf_spec = future_dict.pop(future)
 
-                        # Converting both text strings into word lists:
-                        init_pdf_txt_lst = init_pdf_section_text.split()
-                        second_pdf_txt_lst = second_pdf_section_text.split()
+                try:
+                    yield (pdf_spec, future.result())
 
-                        # Calculating cosine similarity:
-                        cosine_sim = textdistance.cosine(init_pdf_section_text, second_pdf_section_text)
+                except Exception as e:
+                    yield (pdf_spec, e)
 
-                        # Performing Jaccard Similarity calculation:
-                        jaccard_sim = textdistance.jaccard(init_pdf_txt_lst, second_pdf_txt_lst)
+    # Method that builds the cleaned database rows of every section of a parsed pdf:
+    def build_section_rows(pdf_parser):
+        '''
+        The method builds the list of all rows generated by iter_section_rows()
+        for a pdf_parser object so they can be sent between processes.
 
-                        # Performing Minimum edit distance or levenshtein distance calculation:
-                        min_edit_dist = pdf_db.calc_minedit_dist(init_pdf_txt_lst, second_pdf_txt_lst)
+        Parameters
+        ----------
+        pdf_parser : pdf_parser.pdf
+            The initalized pdf parsing object.
 
-                        # Writing similarity valus to the inital pdf table:
-                        self.c.execute(
-                            f"""UPDATE {prev_yr_tbl[0]}
-                            SET Cosine_Similarity =:cosine_sim, Jaccard_Similarity =:jaccard_sim,
-                            Minimum_Edit_Distance =:min_edit_dist
-                            WHERE Section=:section_name""",
-                            {'cosine_sim':round(cosine_sim, 3),
-                            'jaccard_sim': round(jaccard_sim,3),
-                            'min_edit_dist': min_edit_dist,
-                            'section_name':section_name})
+        Returns
+        -------
+        section_rows : list
+            A list of (section, start_page, end_page, section_text) tuples.
+        '''
+        section_rows = list(pdf_db.iter_section_rows(pdf_parser))
 
-                    except:
-                        pass
+        return section_rows
 
-                # Executing Queries to extract list of ALL strings from each pdf:
-                init_pdf_full_txt = ' '.join([
-                    str_tuple[0] for str_tuple in self.c.execute(
-                        f"SELECT Section_Text from {prev_yr_tbl[0]}")])
+    # Method that generates the cleaned database row of each section of a parsed pdf:
+    def iter_section_rows(pdf_parser):
+        '''
+        A generator that converts the sections yielded by the pdf_parser
+        .iter_sections() method into rows ready to be written to a pdf table,
+        one section at a time. The raw text of each section is cleaned for nlp
+        processing by the .clean_text() and .tokenize_text() methods. Sections
+        whose text cannot be extracted are skipped.
 
-                second_pdf_full_txt = ' '.join([
-                    str_tuple[0] for str_tuple in self.c.execute(
-                        f"SELECT Section_Text from {prev_yr_tbl[1]}")])
+        Parameters
+        ----------
+        pdf_parser : pdf_parser.pdf
+            The initalized pdf parsing object.
 
-                # Calculating cosine similarity between init and second pdf:
-                pdf_cosine_sim = textdistance.cosine(init_pdf_full_txt, second_pdf_full_txt)
+        Yields
+        ------
+        section_row : tuple
+            A (section, start_page, end_page, section_text) tuple.
+        '''
+        # Using one tokenizer for every section of the pdf:
+        tokenizer = get_text_tokenizer()
 
-                # Converting full strings back into lists of strings:
-                init_pdf_full_txt = init_pdf_full_txt.split()
-                second_pdf_full_txt = second_pdf_full_txt.split()
+        # Iterating through the sections of the pdf one at a time:
+        for (key, (start_page, end_page), text_page_lst) in pdf_parser.iter_sections():
 
-                # Calculating the jaccard similarity between init and second pdf:
-                pdf_jaccard_sim = textdistance.jaccard(init_pdf_full_txt, second_pdf_full_txt)
+            # Try Catch if the pdf parser cannot extract text for a section:
+            try:
+                # Converting the list of strings associated with each section to single str:
+                raw_txt = ' '.join(text_page_lst)
 
-                # Calculating the Minimum Edit Distance between init and second pdf:
-                min_edit_dist = pdf_db.calc_minedit_dist(init_pdf_full_txt, second_pdf_full_txt)
+                # Cleaning text into nlp friendly format:
+                section_txt = pdf_db.clean_text(raw_txt)
 
-                # Writing full pdf similarity metrics to the {ticker}_tables data tables:
-                self.c.execute(
-                    f"""UPDATE {table_name} SET
-                    Cosine_Similarity=:pdf_cosine_sim,
-                    Jaccard_Similarity=:pdf_jaccard_sim,
-                    Minimum_Edit_Distance=:min_edit_dist
-                    WHERE Table_name=:pdf_table_name""",
-                    {'pdf_cosine_sim':round(pdf_cosine_sim, 3),
-                    'pdf_jaccard_sim':round(pdf_jaccard_sim, 3),
-                    'min_edit_dist':round(min_edit_dist, 3),
-                    'pdf_table_name':prev_yr_tbl[0]})
+                # Converting the text into a Lemmatized format for further nlp processing:
+                section_txt = tokenizer.tokenize(section_txt)
 
-                self.con.commit()
+            except:
+                continue
 
-            else:
-                pass
+            yield (key, start_page, end_page, section_txt)
 
-# <------------------------------Query Methods---------------------------------->
-    # Method that extracts an entire table of data:
-    def get_table_data(self, table_name, section_title=None):
+    # Method that hashes the section rows of a pdf as they are written:
+    def track_section_rows(section_rows, section_state):
         '''
-        A Method that uses the SELECT FROM table sql query to extract all the
-        data from table in the database and representing it as a dataframe. It
-        also allows the database query to be for a specific section title. If that
-        is the case it only returns a dict containing this information.
+        A generator used by write_pdf_rows() that yields the section rows of a
+        pdf unchanged while adding each section to the content hash of the pdf
+        (see update_table_hash()), so the hash is calculated without reading the
+        pdf back from the database.
+
+        The section_state dict is updated in place: 'table_hash' is the
+        hashlib.sha256 object, 'section_names' the set of titles written so far
+        and 'duplicates' is set to True if a title is written twice, in which
+        case the hash does not match the order of the stored rows. If
+        'section_dict' is a dict the (start_page, end_page, section_text) of
+        each section is stored in it in the order the sections are stored in
+        the database, with the last of any duplicate titles kept.
 
         Parameters
         ----------
-        table_name : str
-            A string that will use to represent the name of the sql table that
-            the data is being queried from. This string must match the name of
-            the table being queried.
+        section_rows : iterable
+            An iterable of (section, start_page, end_page, section_text) tuples.
 
-        section_title : str
-            A string that represents the title of a pdf section to be extracted.
-            By default this variable is None and if not specified then the bulk
-            dataframe query is executed.
+        section_state : dict
+            The dict of the hash and sections written so far.
 
-        Returns
-        -------
-        pdf_df :
-            A dataframe that represents the table being extracted from the database.
-            The pandas dataframe is built using the pd.read_sql_query() method
-            to dynamically build a dataframe.
+        Yields
+        ------
+        section_row : tuple
+            The unchanged (section, start_page, end_page, section_text) tuple.
+        '''
+        for section_row in section_rows:
 
-        OR
+            (section_name, start_page, end_page, section_text) = section_row
 
-        pdf_dict : dict
-            A dictionary containing the key value pairs of data that are returned
-            for a specfic query using the input parameter section_title. The key
-            values of the dict are {Title, Start_Page, End_Page, Text}
-        '''
-        # Conditional determining if a bulk query or a specific query runs:
-        if section_title is None:
+            if section_name in section_state['section_names']:
+                section_state['duplicates'] = True
 
-            # Creating df from sql table:
-            pdf_df = pd.read_sql_query(f"SELECT * FROM {table_name}", self.con)
+            section_state['section_names'].add(section_name)
 
-            pdf_df.set_index(pdf_df.columns[0], inplace=True)
+            pdf_db.hash_section(section_state['table_hash'], section_name, section_text)
 
-            return pdf_df
+            # A replaced row is stored after the other sections, as its new row is:
+            if section_state['section_dict'] is not None:
+                section_state['section_dict'].pop(section_name, None)
+                section_state['section_dict'][section_name] = (start_page, end_page, section_text)
 
-        else:
+            yield section_row
 
-            # Custom query string:
-            self.c.execute(
-                f"SELECT * FROM {table_name} WHERE Section = :section_title",
-                {"section_title": section_title}
-                )
+    # Method that adds a section to the content hash of a pdf:
+    def hash_section(table_hash, section_name, section_text):
+        '''
+        The method adds the title and text of a section to the content hash of a
+        pdf, separating each value so different splits never collide.
 
-            # Building and returning dict of the tuple being extracted from fetchall:
-            data = self.c.fetchall()[0]
+        Parameters
+        ----------
+        table_hash : hashlib.sha256
+            The hash object of the pdf.
 
-            pdf_dict = {'Title': data[0], 'Start_Page': data[1],
-            'End_Page': data[2], 'Section_Text': data[3]}
+        section_name : str
+            The title of the section.
 
-            return pdf_dict
+        section_text : str
+            The uncompressed Section_Text of the section, or None.
+        '''
+        table_hash.update(section_name.encode('utf-8') + b'\x00')
 
+        if section_text is None:
+            table_hash.update(b'\x01')
+
+        else:
+            table_hash.update(section_text.encode('utf-8') + b'\x00')
 
-# <---------------------------'Helper' Methods----------------------------------->
     # Method that cleans the raw text string generated by the pdf_parser object:
     def clean_text(text):
         '''
@@ -439,15 +3254,33 @@ class pdf_db(object):
         clean_text : str
             The input text string with the formatting described above applied.
         '''
-        # Removing all punctuation, nums and special chars from main text w/ list comprehension:
-        txt_lst = [words for words in text if words not in string.punctuation
-            and words not in string.digits and words if ord(words)<126 and ord(words)>31]
-
-        # Re-converting list back to single string:
-        clean_text = ''.join(txt_lst)
+        # Dropping all non-ascii chars, then deleting punctuation, nums and special
+        # chars in a single pass with the precompiled deletion table:
+        clean_text = text.encode('ascii', 'ignore').translate(
+            None, CLEAN_TEXT_DELETE_BYTES).decode('ascii')
 
         return clean_text
 
+    # Method that cleans a list of raw text strings:
+    def clean_texts(text_lst):
+        '''
+        The batch version of the clean_text() method that applies the same
+        formatting to every string in a list.
+
+        Parameters
+        ----------
+        text_lst : list
+            A list of strings of raw text generated from the pdf_parser method.
+
+        Returns
+        -------
+        clean_text_lst : list
+            A list of the input strings with clean_text() applied to each.
+        '''
+        clean_text_lst = [pdf_db.clean_text(text) for text in text_lst]
+
+        return clean_text_lst
+
     # Method that tokenizes and pre-processes string data when being extracted:
     def tokenize_text(text):
         '''
@@ -464,31 +3297,125 @@ class pdf_db(object):
             A string built from the list of now processed strings via the .join
             method. This string is simplty the processed_txt_lst concatinated.
         '''
-        # Splitting the text into a list of strings:
-        str_lst = re.split('\W+', text)
+        # Tokenizing with the shared tokenizer so the nltk corpus is only loaded once:
+        processed_txt = get_text_tokenizer().tokenize(text)
 
-        # Removing stopwords from str_lst:
-        stopwords = nltk.corpus.stopwords.words('english')
-        stp_wrds_rm = [word for word in str_lst if word not in stopwords]
+        return processed_txt
 
-        # Declaring Lemmatizer object and lemmatizing the word list:
-        lemmatizer = WordNetLemmatizer()
-        processed_txt_lst = [lemmatizer.lemmatize(word) for word in stp_wrds_rm]
+    # Method that pairs every pdf with the pdf it is compared to in O(n):
+    def build_pair_index(tuple_list, pairing_rule='previous_year'):
+        '''
+        Method that pairs every pdf of a list of ('table_title', 'pdf_type', 'date')
+        tuples with the earlier pdf of the same pdf_type it is compared to by
+        perform_sim_calculation(). Each date is parsed once and the pdfs are
+        bucketed by (pdf_type, period) so every pdf finds its pair with a single
+        dict lookup. If a period contains several pdfs the latest one is used.
 
-        # Re-converting list of strings into single string for ease of db storage:
-        processed_txt = ' '.join(processed_txt_lst)
+        The pairing rules are:
+            'previous_year' : the latest pdf dated in the previous calendar year.
+            'previous_quarter' : the latest pdf dated in the previous calendar quarter.
+            'nearest_prior' : the latest pdf dated before the pdf.
 
-        return processed_txt
+        Parameters
+        ----------
+        tuple_list : lst
+            A list of tuples whose first three elements are ('table_title',
+            'pdf_type', 'date'), eg the rows of a {ticker}_tables table. The date
+            is in the form of dd/mm/yyyy.
+
+        pairing_rule : str or dict
+            The pairing rule of every pdf, or a dict of the pairing rule of each
+            pdf_type, eg {'10_K': 'previous_year', '10_Q': 'previous_quarter'}.
+            pdf_types missing from the dict use 'previous_year'. By default
+            pairing_rule='previous_year'.
+
+        Returns
+        -------
+        pair_lst : list
+            A list of (table_title, previous_table_title) tuples in the order of
+            tuple_list. previous_table_title is None if the pdf has no pair.
+        '''
+        # Parsing every date once:
+        pdf_lst = [
+            (element[0], element[1], datetime.strptime(element[2], '%d/%m/%Y').date())
+            for element in tuple_list]
+
+        # Building the period of each pdf and the period it is paired with under its rule:
+        period_lst = []
+        for (table_title, pdf_type, pdf_date) in pdf_lst:
+
+            if isinstance(pairing_rule, dict):
+                rule = pairing_rule.get(pdf_type, 'previous_year')
+
+            else:
+                rule = pairing_rule
+
+            if rule not in PAIRING_RULES:
+                raise ValueError(f'Invalid pairing_rule: {rule}')
+
+            if rule == 'previous_year':
+                period_lst.append((rule, pdf_date.year, pdf_date.year - 1))
+
+            elif rule == 'previous_quarter':
+                quarter = pdf_date.year * 4 + (pdf_date.month - 1) // 3
+                period_lst.append((rule, quarter, quarter - 1))
+
+            # Each pdf is in its own period, paired with the latest earlier date:
+            else:
+                period_lst.append((rule, pdf_date, None))
+
+        # Dict of the latest (date, index) of every (rule, pdf_type, period) bucket:
+        bucket_dict = {}
+        for index, ((table_title, pdf_type, pdf_date), (rule, period, prev_period)) in enumerate(
+            zip(pdf_lst, period_lst)):
+
+            bucket_key = (rule, pdf_type, period)
+
+            if bucket_key not in bucket_dict or bucket_dict[bucket_key] <= (pdf_date, index):
+                bucket_dict[bucket_key] = (pdf_date, index)
+
+        # The distinct dates of each pdf_type paired with the nearest_prior rule:
+        date_set_dict = {}
+        for (rule, pdf_type, period) in bucket_dict:
+
+            if rule == 'nearest_prior':
+                date_set_dict.setdefault(pdf_type, set()).add(period)
+
+        # Dict of the date preceding every date of each nearest_prior pdf_type:
+        prior_date_dict = {}
+        for pdf_type, date_set in date_set_dict.items():
+
+            date_lst = sorted(date_set)
+            prior_date_dict.update(
+                ((pdf_type, pdf_date), prior_date) for prior_date, pdf_date in zip(date_lst, date_lst[1:]))
+
+        pair_lst = []
+        for (table_title, pdf_type, pdf_date), (rule, period, prev_period) in zip(pdf_lst, period_lst):
+
+            if rule == 'nearest_prior':
+                prev_period = prior_date_dict.get((pdf_type, pdf_date))
+
+            prev_bucket = bucket_dict.get((rule, pdf_type, prev_period))
+
+            if prev_bucket is None:
+                pair_lst.append((table_title, None))
+
+            else:
+                pair_lst.append((table_title, pdf_lst[prev_bucket[1]][0]))
+
+        return pair_lst
 
     # Method that returns a tuple of a pdf table name and the pdf table name from
     # the previous year given an input tuple and a list of tuples returned from ticker_tables:
     def build_tbl_name_tuple(init_tuple, tuple_list):
         '''
-        Method that iterates through a list of tuples of ('table_title', 'pdf_type', 'date')
-        given an inital tuple of the same format and determines the tuple that
-        corresponds to the previous year of the 'date' value of the init_tuple.
+        Method that determines the tuple of a list of tuples of ('table_title',
+        'pdf_type', 'date') that corresponds to the previous year of the 'date'
+        value of an inital tuple of the same format and pdf_type. If the previous
+        year contains several pdfs of the pdf_type the latest one is used.
 
-        See Docs for a more understandable explanation.
+        The method pairs a single pdf, to pair every pdf of a list use the
+        build_pair_index() method which does so in a single pass.
 
         Parameters
         ----------
@@ -507,45 +3434,23 @@ class pdf_db(object):
             by the method. It contains the intial tuple and the tuple from the list
             of tuples that is from the previous year and the same pdf category.
         '''
-        # Unpacking init tuples:
-        (table_title, pdf_type, pdf_date, cosine_sim, jaccard_sim,
-            min_edit_dist, simple_sim) = init_tuple
-
-        # Converting the pdf date to a datetime object:
-        pdf_date = datetime.strptime(pdf_date, '%d/%m/%Y').date()
+        # Pairing the inital tuple against the pdfs of its pdf_type:
+        same_type_lst = [element for element in tuple_list if element[1] == init_tuple[1]]
 
-        # Creating a list of tuples where the date values is the pervious year and same pdf_type
-        # via list comprehension: prev_tuple_lst SHOULD only contain one element.
-        prev_tuple_lst = [
+        pair_lst = pdf_db.build_pair_index([init_tuple] + same_type_lst, 'previous_year')
 
-            # Converting 3rd element of tuple to a formatted datetime object:
-            (element[0], element[1], datetime.strptime(element[2], '%d/%m/%Y').date())
-            for element in tuple_list
-
-            # Only extracting tuple list where 3rd element date is previous year of pdf_date:
-            if datetime.strptime(element[2], '%d/%m/%Y').date().year == pdf_date.year - 1
-
-            # And the pdf_type (2nd element) is equal to the pdf_type of the pdf_type variable:
-            and element[1] == pdf_type
-            ]
-
-        # Building name_tuple out of the table names of the two relevant tuples:
-        try:
-            name_tuple = (table_title, prev_tuple_lst[0][0])
-
-        except:
-            # If no tuple is extracted via list comprehension, name_tuple[1] == None:
-            name_tuple = (table_title, None)
+        name_tuple = pair_lst[0]
 
         return name_tuple
 
     # Method calculates and returns the Minimum_Edit_Distance between two string lists:
-    def calc_minedit_dist(string_1, string_2):
+    def calc_minedit_dist(string_1, string_2, max_distance=None, legacy=False):
         '''
-        Method that calculates the Minimum Edit Distance between two lists of strings
-        via the use of the difflib package by tracking the changes necessary to
-        transform string_1 list into string_2 list. It mainly makes use of the
-        SequenceMatcher() method.
+        Method that calculates the Minimum Edit Distance between two lists of strings,
+        the number of word insertions, deletions and substitutions necessary to
+        transform string_1 list into string_2 list. The words are lowercased and
+        mapped to integer ids and the distance is calculated by the bit-parallel
+        edit_distance.levenshtein_distance() function.
 
         Parameters
         ----------
@@ -555,6 +3460,17 @@ class pdf_db(object):
         string_2 : lst
             The second list of string to be compared.
 
+        max_distance : int
+            An optional cutoff. If the distance is greater than max_distance the
+            calculation stops early and max_distance + 1 is returned. By default
+            max_distance=None.
+
+        legacy : bool
+            If True the edit distance is instead calculated from the opcodes of
+            difflib's SequenceMatcher() as in earlier versions of the package,
+            which does not always find the minimum number of edits. max_distance
+            is ignored in this mode. By default legacy=False
+
         Returns
         -------
         num_edits : int
@@ -565,31 +3481,43 @@ class pdf_db(object):
         str_1_lower = [string.lower() for string in string_1]
         str_2_lower = [string.lower() for string in string_2]
 
-        # Initalizing the SequenceMatcher object w strings lists:
-        s = SequenceMatcher(None, str_1_lower, str_2_lower)
-
-        # Creating the variable representing the number of edits performed during transformation:
-        num_edits = 0
-
-        # Iterating through SequenceMatcher() transformation tuple list:
-        for tag, i_1, i_2, j_1, j_2 in s.get_opcodes():
-
-            # If a replace action is performed:
-            if tag == 'replace':
+        if legacy is True:
+            return edit_distance.sequence_matcher_distance(str_1_lower, str_2_lower)
 
-                # Increase by the highest value between (i_2 - i_1, j_2 - j_1):
-                num_edits += max(i_2-i_1, j_2-j_1)
+        # Mapping each word to an integer id shared by both lists:
+        (str_1_ids, str_2_ids) = edit_distance.build_token_ids(str_1_lower, str_2_lower)
 
-            # If a insert action is performed:
-            elif tag == 'insert':
+        num_edits = edit_distance.levenshtein_distance(
+            str_1_ids, str_2_ids, max_distance=max_distance)
 
-                # Increase by the difference between j_2 and j_1:
-                num_edits += (j_2 - j_1)
+        return num_edits
 
-            # If a delete action is performed:
-            elif tag == 'delete':
 
-                # Increase by the difference between i_2 and i_1:
-                num_edits += (i_2 - i_1)
+# Function used by worker processes to parse and clean a single pdf:
+def parse_pdf_rows(pdf_path, parse_cache_path=None, extraction_backend='plumber'):
+    '''
+    Function that initalizes the pdf parsing object of a pdf and converts it
+    into cleaned section rows with pdf_db.build_section_rows(). It is defined
+    at the module level so it can be sent to worker processes.
 
-        return num_edits
+    Parameters
+    ----------
+    pdf_path : str
+        A string representing the path to the pdf file.
+
+    parse_cache_path : str
+        The path of the parse cache the pdf is read from and written to. By
+        default parse_cache_path=None and nothing is cached.
+
+    extraction_backend : str or pdf_parser.extraction_backend
+        The backend the page text is extracted with. By default
+        extraction_backend='plumber'.
+
+    Returns
+    -------
+    section_rows : list
+        A list of (section, start_page, end_page, section_text) tuples.
+    '''
+    with pparser.pdf(pdf_path, lazy=True, cache=parse_cache_path,
+        backend=extraction_backend) as pdf_parser:
+        return pdf_db.build_section_rows(pdf_parser)
@@ -0,0 +1,302 @@
+# Importing native python packages:
+from collections import Counter
+import struct
+import zlib
+
+# The zstandard package is an optional dependency, zlib is used without it:
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# The header of every compressed text: the codec id, the dictionary id (0 if no
+# dictionary was used) and the length of the uncompressed utf-8 text:
+HEADER_FORMAT = '>BII'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+# The codec id written to the header of each codec:
+CODEC_IDS = {'zlib': 1, 'zstd': 2}
+CODEC_NAMES = {codec_id: codec for codec, codec_id in CODEC_IDS.items()}
+
+# zlib only uses the last 32 KiB of a preset dictionary:
+ZLIB_MAX_DICT_SIZE = 32768
+
+
+def check_codec(codec):
+    '''
+    Function that raises an error if a compression codec is unknown or if
+    its package is not installed.
+
+    Parameters
+    ----------
+    codec : str
+        The name of the codec, either "zlib" or "zstd".
+    '''
+    if codec not in CODEC_IDS:
+        raise ValueError(f'Invalid compression codec: {codec}')
+
+    if codec == 'zstd' and zstandard is None:
+        raise ImportError('The zstandard package is required for zstd compression')
+
+
+def compress_text(text, codec, dict_id=0, dict_data=None, level=None):
+    '''
+    Function that compresses a string into a BLOB made of a header, which
+    records how the text was compressed, followed by the compressed utf-8 text.
+
+    Parameters
+    ----------
+    text : str
+        The string to be compressed.
+
+    codec : str
+        The name of the codec, either "zlib" or "zstd".
+
+    dict_id : int
+        The id of the dictionary the text is compressed with, written to the
+        header so the text can be decompressed. By default dict_id=0, no dictionary.
+
+    dict_data : bytes
+        The dictionary the text is compressed with. By default dict_data=None.
+
+    level : int
+        The compression level. By default the default level of the codec.
+
+    Returns
+    -------
+    blob : bytes
+        The header and the compressed text.
+    '''
+    raw_bytes = text.encode('utf-8')
+
+    if codec == 'zlib':
+
+        if level is None:
+            level = zlib.Z_DEFAULT_COMPRESSION
+
+        # A compressobj is needed to pass the preset dictionary:
+        if dict_data is None:
+            compressor = zlib.compressobj(level)
+
+        else:
+            compressor = zlib.compressobj(level, zdict=dict_data)
+
+        compressed_bytes = compressor.compress(raw_bytes) + compressor.flush()
+
+    else:
+        compressed_bytes = get_zstd_compressor(dict_data, level).compress(raw_bytes)
+
+    blob = struct.pack(HEADER_FORMAT, CODEC_IDS[codec], dict_id, len(raw_bytes)) + compressed_bytes
+
+    return blob
+
+
+def decompress_text(blob, dict_lookup):
+    '''
+    Function that decompresses a BLOB built by compress_text() back into a
+    string. Values that are not BLOBs, ie uncompressed strings and None, are
+    returned unchanged so compressed and uncompressed rows can be mixed.
+
+    Parameters
+    ----------
+    blob : bytes
+        The BLOB built by compress_text().
+
+    dict_lookup : function
+        A function that returns the dictionary bytes of a dictionary id.
+
+    Returns
+    -------
+    text : str
+        The decompressed string.
+    '''
+    if not isinstance(blob, bytes):
+        return blob
+
+    (codec_id, dict_id, raw_size) = read_header(blob)
+
+    dict_data = dict_lookup(dict_id) if dict_id != 0 else None
+
+    if CODEC_NAMES[codec_id] == 'zlib':
+
+        if dict_data is None:
+            decompressor = zlib.decompressobj()
+
+        else:
+            decompressor = zlib.decompressobj(zdict=dict_data)
+
+        raw_bytes = decompressor.decompress(blob[HEADER_SIZE:]) + decompressor.flush()
+
+    else:
+        check_codec('zstd')
+        raw_bytes = get_zstd_decompressor(dict_data).decompress(
+            blob[HEADER_SIZE:], max_output_size=raw_size)
+
+    return raw_bytes.decode('utf-8')
+
+
+def read_header(blob):
+    '''
+    Function that reads the header of a BLOB built by compress_text().
+
+    Parameters
+    ----------
+    blob : bytes
+        The BLOB, or at least its first HEADER_SIZE bytes.
+
+    Returns
+    -------
+    header : tuple
+        A (codec_id, dict_id, raw_size) tuple where raw_size is the number of
+        bytes of the uncompressed utf-8 text.
+    '''
+    return struct.unpack(HEADER_FORMAT, blob[:HEADER_SIZE])
+
+
+def build_zlib_dict(text_lst, dict_size=ZLIB_MAX_DICT_SIZE, max_ngram=4):
+    '''
+    Function that builds a zlib preset dictionary from a sample of texts. The
+    word n-grams of the sample are scored by the number of bytes they occur in
+    (their length times the number of texts they occur in) and the highest
+    scoring n-grams are concatenated up to dict_size bytes. As zlib finds
+    matches closer to the end of the dictionary with shorter distances the
+    highest scoring n-grams are placed last.
+
+    Parameters
+    ----------
+    text_lst : list
+        The list of sample strings.
+
+    dict_size : int
+        The maximum size of the dictionary in bytes, at most 32 KiB for zlib.
+
+    max_ngram : int
+        The maximum number of words of the n-grams. By default max_ngram=4.
+
+    Returns
+    -------
+    dict_data : bytes
+        The dictionary bytes.
+    '''
+    dict_size = min(dict_size, ZLIB_MAX_DICT_SIZE)
+
+    # Counting the number of texts every n-gram occurs in:
+    ngram_counter = Counter()
+    for text in text_lst:
+
+        word_lst = text.split()
+        ngram_counter.update({
+            ' '.join(word_lst[i:i+n]) for n in range(1, max_ngram + 1)
+            for i in range(len(word_lst) - n + 1)})
+
+    # N-grams found in a single text are of no use to the other texts:
+    ngram_lst = sorted(
+        (ngram for ngram, count in ngram_counter.items() if count > 1),
+        key=lambda ngram: (len(ngram) + 1) * ngram_counter[ngram], reverse=True)
+
+    dict_ngram_lst = []
+    dict_len = 0
+    for ngram in ngram_lst:
+
+        ngram_bytes = (ngram + ' ').encode('utf-8')
+
+        if dict_len + len(ngram_bytes) > dict_size:
+            continue
+
+        dict_ngram_lst.append(ngram_bytes)
+        dict_len += len(ngram_bytes)
+
+    dict_data = b''.join(reversed(dict_ngram_lst))
+
+    return dict_data
+
+
+def train_zstd_dict(text_lst, dict_size=112640):
+    '''
+    Function that trains a zstd dictionary from a sample of texts with the
+    zstandard package.
+
+    Parameters
+    ----------
+    text_lst : list
+        The list of sample strings.
+
+    dict_size : int
+        The size of the dictionary in bytes. By default the 110 KiB zstd default.
+
+    Returns
+    -------
+    dict_data : bytes
+        The dictionary bytes.
+    '''
+    check_codec('zstd')
+
+    dict_data = zstandard.train_dictionary(
+        dict_size, [text.encode('utf-8') for text in text_lst]).as_bytes()
+
+    return dict_data
+
+
+# The zstd (de)compressors of each dictionary, which are expensive to create:
+zstd_compressor_dict = {}
+zstd_decompressor_dict = {}
+
+
+def get_zstd_compressor(dict_data, level=None):
+    '''
+    Function that returns the, cached, zstd compressor of a dictionary.
+
+    Parameters
+    ----------
+    dict_data : bytes
+        The dictionary bytes, or None.
+
+    level : int
+        The compression level. By default the zstd default of 3.
+
+    Returns
+    -------
+    compressor : zstandard.ZstdCompressor
+        The compressor.
+    '''
+    check_codec('zstd')
+
+    if level is None:
+        level = 3
+
+    if (dict_data, level) not in zstd_compressor_dict:
+
+        if dict_data is None:
+            zstd_compressor_dict[(dict_data, level)] = zstandard.ZstdCompressor(level=level)
+
+        else:
+            zstd_compressor_dict[(dict_data, level)] = zstandard.ZstdCompressor(
+                level=level, dict_data=zstandard.ZstdCompressionDict(dict_data))
+
+    return zstd_compressor_dict[(dict_data, level)]
+
+
+def get_zstd_decompressor(dict_data):
+    '''
+    Function that returns the, cached, zstd decompressor of a dictionary.
+
+    Parameters
+    ----------
+    dict_data : bytes
+        The dictionary bytes, or None.
+
+    Returns
+    -------
+    decompressor : zstandard.ZstdDecompressor
+        The decompressor.
+    '''
+    if dict_data not in zstd_decompressor_dict:
+
+        if dict_data is None:
+            zstd_decompressor_dict[dict_data] = zstandard.ZstdDecompressor()
+
+        else:
+            zstd_decompressor_dict[dict_data] = zstandard.ZstdDecompressor(
+                dict_data=zstandard.ZstdCompressionDict(dict_data))
+
+    return zstd_decompressor_dict[dict_data]
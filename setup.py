@@ -24,6 +24,7 @@ setuptools.setup(
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
     ],
-    install_requires=['PyPDF2', 'pdfplumber', 'pandas', 'nltk', 'textdistance', 'sklearn']
+    install_requires=['PyPDF2', 'pdfplumber', 'pandas', 'numpy', 'nltk', 'textdistance', 'sklearn'],
+    extras_require={'zstd': ['zstandard']}
 
 )